@@ -0,0 +1,239 @@
+"""헤드리스 리플레이/백테스트 러너
+
+PaperBotApp 을 SimulatedBroker + VirtualClock 위에 그대로 올리고, 기록된(또는 합성) 틱을
+같은 on_tick/on_bar/타이머 콜백 경로로 CPU 가 허용하는 속도로 흘려보낸다.
+Qt 없이 Linux 에서 동작하며 orders/fills/pnl/status JSONL 은 실거래와 같은 형식.
+
+    python app_replay.py --csv ticks.csv --out logs/replay
+    python app_replay.py --synthetic 80 --day 2026-10-16 --out logs/replay
+    python app_replay.py --ticks-day 20261016 --out logs/replay   # record_ticks 녹화본
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import logging
+import random
+import time
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app_trade_paper import PaperBotApp
+from broker.simulated import SimulatedBroker
+from core.clock import VirtualClock
+from core.settings import BotConfig, LOG_DIR, load_config
+from core.types import Side
+from data.tick_store import TICK_DIR, TickDay
+
+# (epoch_sec, code, price, volume)
+Tick = Tuple[float, str, float, int]
+
+
+# ------------------ tick sources ------------------
+def _parse_ts(s: str) -> float:
+    s = s.strip()
+    try:
+        return float(s)
+    except ValueError:
+        pass
+    fmt = "%Y-%m-%d %H:%M:%S.%f" if "." in s else "%Y-%m-%d %H:%M:%S"
+    return datetime.strptime(s, fmt).timestamp()
+
+
+def load_ticks_csv(path: str | Path) -> List[Tick]:
+    """ts,code,price,volume CSV (ts 는 epoch 초 또는 'YYYY-MM-DD HH:MM:SS[.fff]')"""
+    out: List[Tick] = []
+    with Path(path).open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            out.append((_parse_ts(row["ts"]), row["code"].strip(), float(row["price"]), int(float(row["volume"]))))
+    out.sort(key=lambda t: t[0])
+    return out
+
+
+def synthetic_ticks(
+    symbols: List[str],
+    day: str,
+    start: str = "09:00",
+    end: str = "15:30",
+    ticks_per_min: int = 6,
+    seed: int = 0,
+) -> Iterator[Tick]:
+    """종목별 랜덤워크 틱 (재현 가능: 같은 seed -> 같은 스트림)"""
+    rnd = random.Random(seed)
+    t0 = datetime.strptime(f"{day} {start}", "%Y-%m-%d %H:%M").timestamp()
+    t1 = datetime.strptime(f"{day} {end}", "%Y-%m-%d %H:%M").timestamp()
+    price = {s: float(rnd.randint(20, 500) * 100) for s in symbols}
+    step = 60.0 / max(1, int(ticks_per_min))
+    t = t0
+    while t < t1:
+        for i, s in enumerate(symbols):
+            p = price[s] * (1 + rnd.gauss(0.0, 0.002))
+            price[s] = max(10.0, round(p))
+            yield (t + step * i / len(symbols), s, price[s], rnd.randint(1, 500))
+        t += step
+
+
+# ------------------ virtual timers ------------------
+class VirtualTimers:
+    """QTimer 대체: 가상 시계 기준 주기 콜백을 마감 순으로 실행"""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self._heap: List[Tuple[float, int, float, Callable[[], None]]] = []
+        self._seq = 0
+
+    def add(self, interval_ms: int, cb: Callable[[], None]) -> None:
+        iv = max(1, int(interval_ms)) / 1000.0
+        self._seq += 1
+        heapq.heappush(self._heap, (self.clock.time() + iv, self._seq, iv, cb))
+
+    def run_until(self, t: float) -> None:
+        h = self._heap
+        while h and h[0][0] <= t:
+            due, seq, iv, cb = heapq.heappop(h)
+            self.clock.set(due)
+            cb()
+            heapq.heappush(h, (due + iv, seq, iv, cb))
+
+
+# ------------------ runner ------------------
+def _quiet_logger(name: str = "replay") -> logging.Logger:
+    lg = logging.getLogger(name)
+    lg.propagate = False
+    lg.setLevel(logging.WARNING)
+    if not lg.handlers:
+        lg.addHandler(logging.NullHandler())
+    return lg
+
+
+class ReplayRunner:
+    def __init__(
+        self,
+        cfg: BotConfig,
+        universe: List[str],
+        out_dir: str | Path = LOG_DIR / "replay",
+        slippage_bp: int = 0,
+        logger: Optional[logging.Logger] = None,
+        broker: Optional[SimulatedBroker] = None,
+    ) -> None:
+        # broker 주입 시 그 브로커의 가상 시계를 쓴다 (bench.load_test 의 OCX 디코딩 경로 등)
+        self.cfg = cfg
+        self.out_dir = Path(out_dir)
+        if broker is None:
+            self.clock = VirtualClock()
+            self.broker = SimulatedBroker(clock=self.clock, universe=universe, slippage_bp=slippage_bp)
+        else:
+            self.clock = broker.clock
+            self.broker = broker
+        self.app = PaperBotApp(
+            cfg,
+            broker=self.broker,
+            clock=self.clock,
+            logger=logger or _quiet_logger(),
+            log_dir=self.out_dir,
+            persist=False,
+        )
+        self.timers = VirtualTimers(self.clock)
+        self.n_ticks = 0
+        # 1초 간격 평가손익 포함 equity 로 최대낙폭 추적
+        self.peak_equity = 0.0
+        self.max_drawdown = 0.0
+
+    def run(self, ticks: Iterable[Tick]) -> Dict[str, float]:
+        started = False
+        rt: List[str] = []
+        rt_set: set = set()
+        last_t = 0.0
+        wall0 = time.perf_counter()
+        for t, code, price, volume in ticks:
+            if not started:
+                self.clock.set(t)
+                self.app.start()
+                for _, interval_ms, cb in self.app.timer_specs():
+                    self.timers.add(interval_ms, cb)
+                self.timers.add(1000, self._sample_equity)
+                started = True
+            self.timers.run_until(t)
+            self.clock.set(t)
+            if self.broker.realtime is not rt:
+                rt = self.broker.realtime
+                rt_set = set(rt)
+            # 실계좌처럼 실시간 등록된 종목만 틱 수신
+            if code in rt_set:
+                self.broker.feed_tick(code, price, volume)
+                self.n_ticks += 1
+            last_t = t
+        if started:
+            # 마지막 분봉 마감 + 상태 스냅샷
+            self.timers.run_until(last_t + 61)
+        return self.summary(time.perf_counter() - wall0)
+
+    def _sample_equity(self) -> None:
+        eq = self.broker.realized_pnl + self.broker.unrealized_pnl()
+        if eq > self.peak_equity:
+            self.peak_equity = eq
+        dd = self.peak_equity - eq
+        if dd > self.max_drawdown:
+            self.max_drawdown = dd
+
+    def summary(self, elapsed: float) -> Dict[str, float]:
+        self._sample_equity()
+        fills = self.broker.fills
+        trips = self.broker.round_trips
+        wins = sum(1 for x in trips if x > 0)
+        realized = self.broker.realized_pnl
+        unrealized = self.broker.unrealized_pnl()
+        return {
+            "ticks": self.n_ticks,
+            "fills": len(fills),
+            "buys": sum(1 for f in fills if f["side"] == Side.BUY.value),
+            "sells": sum(1 for f in fills if f["side"] == Side.SELL.value),
+            "open_positions": sum(1 for p in self.broker.get_positions().values() if p.qty > 0),
+            "trades": len(trips),
+            "hit_rate": round(wins / len(trips), 4) if trips else 0.0,
+            "realized_pnl": round(realized, 1),
+            "unrealized_pnl": round(unrealized, 1),
+            "pnl": round(realized + unrealized, 1),
+            "max_drawdown": round(self.max_drawdown, 1),
+            "elapsed_sec": round(elapsed, 3),
+        }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="headless replay of the paper bot")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--csv", help="ts,code,price,volume CSV")
+    src.add_argument("--synthetic", type=int, metavar="N", help="N synthetic symbols")
+    src.add_argument("--ticks-day", metavar="YYYYMMDD", help="binary tick recording (data/ticks)")
+    ap.add_argument("--ticks-root", default=str(TICK_DIR))
+    ap.add_argument("--day", default=datetime.now().strftime("%Y-%m-%d"))
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--config", default="config.json")
+    ap.add_argument("--out", default=str(LOG_DIR / "replay"))
+    ap.add_argument("--slippage-bp", type=int, default=0)
+    ap.add_argument("--strategy-mode", choices=("event", "poll"), help="override cfg.strategy_mode")
+    args = ap.parse_args()
+
+    cfg = load_config(args.config)
+    if args.strategy_mode:
+        cfg = replace(cfg, strategy_mode=args.strategy_mode)
+    if args.csv:
+        ticks: Iterable[Tick] = load_ticks_csv(args.csv)
+        universe = list(dict.fromkeys(t[1] for t in ticks))
+    elif args.ticks_day:
+        td = TickDay(args.ticks_day, Path(args.ticks_root))
+        ticks = td.iter_ticks()
+        universe = list(td.symbols)
+    else:
+        universe = [f"{100000 + i:06d}" for i in range(args.synthetic)]
+        ticks = synthetic_ticks(universe, args.day, seed=args.seed)
+
+    runner = ReplayRunner(cfg, universe, out_dir=args.out, slippage_bp=args.slippage_bp)
+    print(runner.run(ticks))
+
+
+if __name__ == "__main__":
+    main()
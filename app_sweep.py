@@ -0,0 +1,161 @@
+"""BotConfig 전략 파라미터 멀티프로세스 스윕
+
+그리드의 모든 조합을 ProcessPoolExecutor 로 나눠 같은 하루치 데이터를 리플레이하고
+설정별 PnL/거래수/최대낙폭/승률을 한 테이블(CSV)로 모은다.
+틱 데이터는 워커 프로세스마다 initializer 에서 한 번만 로드해 모든 설정에 재사용.
+
+    python app_sweep.py --csv ticks.csv --grid grid.json --workers 4
+    python app_sweep.py --synthetic 80 --day 2026-10-16 \\
+        --param score_entry_threshold=20,30,40 --param stop_loss_bp=50,80
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app_replay import ReplayRunner, Tick, load_ticks_csv, synthetic_ticks
+from core.settings import BotConfig, LOG_DIR, load_config
+from data.tick_store import TICK_DIR, TickDay
+
+SWEEP_KEYS = (
+    "score_entry_threshold",
+    "stop_loss_bp",
+    "take_profit_bp",
+    "max_positions",
+    "entry_krw",
+    "per_symbol_cooldown_sec",
+)
+
+# ------------------ worker side ------------------
+# 워커 프로세스별 1회 로드되는 시장 데이터
+_W_TICKS: List[Tick] = []
+_W_UNIVERSE: List[str] = []
+_W_BASE: Optional[BotConfig] = None
+
+
+def load_source(source: Dict[str, Any]) -> Tuple[List[Tick], List[str]]:
+    if source.get("csv"):
+        ticks = load_ticks_csv(source["csv"])
+        return ticks, list(dict.fromkeys(t[1] for t in ticks))
+    if source.get("ticks_day"):
+        td = TickDay(source["ticks_day"], Path(source.get("ticks_root") or TICK_DIR))
+        return list(td.iter_ticks()), list(td.symbols)
+    universe = [f"{100000 + i:06d}" for i in range(int(source["synthetic"]))]
+    ticks = list(synthetic_ticks(universe, source["day"], seed=int(source.get("seed", 0))))
+    return ticks, universe
+
+
+def _init_worker(source: Dict[str, Any], base_cfg: BotConfig) -> None:
+    global _W_TICKS, _W_UNIVERSE, _W_BASE
+    _W_TICKS, _W_UNIVERSE = load_source(source)
+    _W_BASE = base_cfg
+
+
+def _run_one(job: Tuple[int, Dict[str, Any], str, int]) -> Dict[str, Any]:
+    idx, params, out_root, slippage_bp = job
+    cfg = replace(_W_BASE, **params)
+    runner = ReplayRunner(cfg, _W_UNIVERSE, out_dir=Path(out_root) / f"cfg_{idx:04d}", slippage_bp=slippage_bp)
+    res = runner.run(_W_TICKS)
+    return {"cfg_id": idx, **params, **res, "worker_pid": os.getpid()}
+
+
+# ------------------ driver side ------------------
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    valid = {f.name for f in fields(BotConfig)}
+    for k in grid:
+        if k not in valid:
+            raise ValueError(f"unknown BotConfig field: {k}")
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+def run_sweep(
+    grid: Dict[str, List[Any]],
+    source: Dict[str, Any],
+    base_cfg: BotConfig,
+    out_root: str | Path,
+    workers: Optional[int] = None,
+    slippage_bp: int = 0,
+) -> List[Dict[str, Any]]:
+    combos = expand_grid(grid)
+    jobs = [(i, p, str(out_root), slippage_bp) for i, p in enumerate(combos)]
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source, base_cfg)) as ex:
+        rows = list(ex.map(_run_one, jobs, chunksize=1))
+    rows.sort(key=lambda r: r["pnl"], reverse=True)
+    return rows
+
+
+def write_table(rows: List[Dict[str, Any]], path: str | Path) -> None:
+    if not rows:
+        return
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    cols = list(rows[0].keys())
+    with p.open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=cols)
+        w.writeheader()
+        w.writerows(rows)
+
+
+def _parse_param(s: str) -> Tuple[str, List[Any]]:
+    k, _, vals = s.partition("=")
+    out: List[Any] = []
+    for v in vals.split(","):
+        v = v.strip()
+        try:
+            out.append(int(v))
+        except ValueError:
+            out.append(float(v))
+    return k.strip(), out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="parallel BotConfig parameter sweep over replayed market data")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--csv", help="ts,code,price,volume CSV")
+    src.add_argument("--synthetic", type=int, metavar="N", help="N synthetic symbols")
+    src.add_argument("--ticks-day", metavar="YYYYMMDD", help="binary tick recording (data/ticks)")
+    ap.add_argument("--ticks-root", default=str(TICK_DIR))
+    ap.add_argument("--day", default=datetime.now().strftime("%Y-%m-%d"))
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--grid", help=f"JSON file {{key: [values]}}, keys from {', '.join(SWEEP_KEYS)}")
+    ap.add_argument("--param", action="append", default=[], help="key=v1,v2,... (repeatable)")
+    ap.add_argument("--config", default="config.json")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--slippage-bp", type=int, default=0)
+    ap.add_argument("--out", default=str(LOG_DIR / "sweep"))
+    args = ap.parse_args()
+
+    grid: Dict[str, List[Any]] = {}
+    if args.grid:
+        grid.update(json.loads(Path(args.grid).read_text(encoding="utf-8")))
+    for s in args.param:
+        k, vals = _parse_param(s)
+        grid[k] = vals
+    if not grid:
+        ap.error("empty grid: use --grid or --param")
+
+    source = {"csv": args.csv, "synthetic": args.synthetic, "ticks_day": args.ticks_day,
+              "ticks_root": args.ticks_root, "day": args.day, "seed": args.seed}
+    # 스윕에선 dry_run 이면 아무 거래도 안 일어나므로 강제로 끈다
+    base = replace(load_config(args.config), dry_run=False)
+    rows = run_sweep(grid, source, base, args.out, workers=args.workers, slippage_bp=args.slippage_bp)
+    write_table(rows, Path(args.out) / "results.csv")
+
+    show = list(grid) + ["pnl", "trades", "hit_rate", "max_drawdown"]
+    print(" ".join(f"{c:>22}" for c in show))
+    for r in rows:
+        print(" ".join(f"{r[c]:>22}" for c in show))
+
+
+if __name__ == "__main__":
+    main()
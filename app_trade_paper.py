@@ -1,90 +1,208 @@
 from __future__ import annotations
 
 import json
-import time
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Tuple
 
-from PyQt5.QtCore import QTimer
-from PyQt5.QtWidgets import QApplication
-
-from broker.kiwoom import KiwoomBroker
+from core.clock import Clock, WALL_CLOCK, hm_minutes
+from core.compute_proc import ComputeProcess
 from core.execution_guard import ExecutionGuard, GuardConfig
-from core.risk_manager import RiskManager
+from core.risk_manager import RiskManager, RiskState
 from core.types import Side
-from core.settings import ensure_dirs, load_config, BotConfig
-from core.logger import setup_logger, log_jsonl
-from core.state_store import load_state, save_state
+from core.settings import ensure_dirs, load_config, BotConfig, DATA_DIR, LOG_DIR
+from core.metrics import METRICS
+from core.logger import setup_logger, log_jsonl, JsonlSink, install_jsonl_sink, get_jsonl_sink
+from core.state_store import StateJournal, load_state
 from core.universe import UniverseManager
 from core.scoring import ScoreBoard
 from core.strategy import SimpleScoreStrategy
+from core.strategy_host import StrategyHost
+from core.feature_cache import FeatureCache
+from core.symbol_registry import SymbolRegistry
+from core.warm_start import WarmStart
 from core.order_manager import OrderManager
+from core.order_book import OrderBook, OrderState
 from core.pnl_tracker import PnLTracker
+from broker.kiwoom_chejan import GUBUN_BALANCE, ChejanEvent
 from data.realtime_bar_builder import RealtimeBarBuilder, Bar
-
-
-def _hm() -> str:
-    return datetime.now().strftime("%H:%M")
-
-def _hms() -> str:
-    return datetime.now().strftime("%H:%M:%S")
-
-def _now_ts() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+from data.bar_spill import BarSpill
+from data.bar_store import BarStore
+from data.tick_store import TickRecorder
 
 
 class PaperBotApp:
-    def __init__(self, cfg: BotConfig):
+    def __init__(
+        self,
+        cfg: BotConfig,
+        broker=None,
+        clock: Optional[Clock] = None,
+        logger=None,
+        log_dir: Path = LOG_DIR,
+        persist: bool = True,
+    ):
         ensure_dirs()
         self.cfg = cfg
-        self.log = setup_logger("paper-bot")
-
-        self.broker = KiwoomBroker()
+        self.log = logger or setup_logger("paper-bot")
+        self.clock = clock or WALL_CLOCK
+        self.log_dir = Path(log_dir)
+        self.metrics = METRICS
+        self.metrics.enabled = bool(cfg.metrics_enabled)
+        # state.json restore/save (replay runs with persist=False)
+        self.persist = persist
+
+        if broker is None:
+            # Qt/COM import only for the live broker (replay runs headless)
+            from broker.kiwoom import KiwoomBroker
+            broker = KiwoomBroker()
+        self.broker = broker
 
         # trackers
-        self.pnl = PnLTracker(self.log)
-        self.sb = ScoreBoard()
+        self.pnl = PnLTracker(
+            self.log, clock=self.clock, log_dir=self.log_dir,
+            start_equity=float(cfg.start_equity_krw),
+            fee_rate=float(cfg.fee_rate),
+            sell_tax_rate=float(cfg.sell_tax_rate),
+        )
+        self.sb = ScoreBoard(batch_min=int(cfg.batch_score_min))
         self.strategy = SimpleScoreStrategy(self.log, cfg, self.sb, self.pnl)
+        # event: 보유 종목 시세마다 청산, 바 마감 점수 갱신 때 진입 / poll: 주기 타이머에서 전체 순회
+        self.event_mode = cfg.strategy_mode == "event"
+        self._last_px: Dict[str, float] = {}
+        self._entry_dirty = False
 
         # guards
         gcfg = GuardConfig(
             max_orders_per_minute=int(cfg.max_orders_per_minute),
             min_seconds_between_orders=int(cfg.min_seconds_between_orders),
+            max_orders_per_symbol_per_minute=int(cfg.max_orders_per_symbol_per_minute),
+            max_orders_per_side_per_minute=int(cfg.max_orders_per_side_per_minute),
+            kiwoom_orders_per_sec=int(cfg.kiwoom_orders_per_sec),
         )
-        self.guard = ExecutionGuard(gcfg)
-        self.order_mgr = OrderManager(self.log, self.broker, self.guard)
-        self.risk = RiskManager(kill=-0.01, defense=-0.005)
+        self.guard = ExecutionGuard(gcfg, clock=self.clock)
+        # 주문 상태 장부 (체잔/미체결 TR 병합, state.json 에 미체결만 저장)
+        self.orders = OrderBook(clock=self.clock, pending_grace_sec=2.0 * int(cfg.tr_sync_sec))
+        self.order_mgr = OrderManager(
+            self.log, self.broker, self.guard, clock=self.clock, log_dir=self.log_dir, metrics=self.metrics,
+            book=self.orders,
+        )
+        self.risk = RiskManager(kill=float(cfg.risk_kill_ratio), defense=float(cfg.risk_defense_ratio))
+        self.risk_state = RiskState()
+        # 손익률이 다음 임계값을 넘는 틱에서 바로 리스크 상태 갱신
+        self.pnl.on_breach = self._on_pnl_breach
+        self._arm_risk()
 
         # universe
         self.universe = UniverseManager(self.log, self.broker, cfg)
 
         # bars
-        self.bars_1m: Dict[str, List[dict]] = {}
-        self.last_tick_ts: Dict[str, float] = {}
-
-        self.bar_builder = RealtimeBarBuilder(self.on_bar)
-
-        # open orders snapshot
-        self.open_orders: Dict[str, dict] = {}
+        self.bars_1m = BarStore(capacity=200)
+        # symbols whose bar closed since the last scoring pass
+        self._closed_syms: Dict[str, None] = {}
+        # 종목별 마지막 체결 시각 (epoch ms)
+        self.last_tick_ts: Dict[str, int] = {}
+        # perf_counter_ns of the latest tick per symbol (tick -> order latency)
+        self._last_tick_ns: Dict[str, int] = {}
+
+        # 종목 수명주기: 실시간/보유 = active, 빠진 뒤 warm -> cold, cold 는 예산 초과 시 바 이력을 디스크로 내보냄
+        self.spill = BarSpill(DATA_DIR / "bars" if self.persist else self.log_dir / "bars_spill")
+        self.symbols = SymbolRegistry(
+            clock=self.clock,
+            max_resident=int(cfg.symbol_max_resident),
+            max_bytes=int(float(cfg.symbol_max_mb) * 1024 * 1024),
+            warm_sec=int(cfg.symbol_warm_min) * 60,
+            bytes_per_symbol=self.bars_1m.bytes_per_symbol,
+            on_evict=self._evict_symbol,
+        )
+        self.warm: Optional[WarmStart] = None
+        if cfg.warm_start:
+            self.warm = WarmStart(
+                self.log, self.broker, self.bars_1m, self.sb, spill=self.spill, clock=self.clock,
+                interval_sec=int(cfg.bar_interval_sec), max_gap_sec=int(cfg.warm_max_gap_min) * 60,
+                on_ready=self._on_warm_ready,
+            )
+
+        # 분리 모드: 이 프로세스는 틱을 링에 넣고 주문 의도만 받아 가드/리스크를 거쳐 전송
+        self.compute: Optional[ComputeProcess] = None
+        self._rt_pushed: Dict[str, None] = {}
+        self._gate_pushed: Optional[bool] = None
+        if cfg.compute_process and cfg.strategies:
+            self.log.warning("[COMPUTE] compute_process is single-strategy only (strategies run in-process)")
+        elif cfg.compute_process:
+            if not self.event_mode:
+                self.log.warning("[COMPUTE] compute_process runs event mode only (strategy_mode ignored)")
+                self.event_mode = True
+            self.compute = ComputeProcess(cfg, spill_root=self.spill.root, capacity=int(cfg.compute_ring_size))
+            self.log.info(f"[COMPUTE] started pid={self.compute.proc.pid}")
+
+        # 경계마다 닫힌 바를 한 번에 받아 바로 스코어링 (flush 는 경계가 지났을 때만 일함)
+        self.bar_builder = RealtimeBarBuilder(
+            self.on_bar, interval_sec=int(cfg.bar_interval_sec), on_batch=self._on_bar_batch,
+        )
 
-        # restore
-        self._restore_state()
+        # raw tick recording for replay (off by default)
+        self.recorder: Optional[TickRecorder] = TickRecorder() if cfg.record_ticks else None
+
+        # 시:분 설정은 한 번만 파싱해 자정 이후 분으로 비교
+        self._fc_start = hm_minutes(cfg.force_close_start)
+        self._fc_end = hm_minutes(cfg.force_close_end)
+        self._entry_cutoff = hm_minutes(cfg.entry_cutoff)
+
+        # rate limit 에 막힌 청산: symbol -> 재시도 시각 (clock.time())
+        self._exit_retry: Dict[str, float] = {}
+
+        # 다중 전략: 바/점수는 위에서 한 번만, 전략들은 피처 캐시와 공유 가드(전략별 한도)를 같이 씀
+        # self.pnl/self.risk 는 계좌 전체 (합산 손익, 계좌 kill switch) 로 그대로 남는다
+        self.features: Optional[FeatureCache] = None
+        self.host: Optional[StrategyHost] = None
+        if cfg.strategies:
+            self.features = FeatureCache(self.bars_1m, self.sb)
+            self.host = StrategyHost(
+                self.log, cfg, self.features, self._send_host_signal, self.guard,
+                clock=self.clock, log_dir=self.log_dir, metrics=self.metrics,
+            )
+            self.log.info(f"[HOST] strategies={[i.name for i in self.host.instances]}")
+
+        # restore (snapshot + 델타 journal, 상태 변경분만 status 주기마다 배치 fsync)
+        self.journal: Optional[StateJournal] = None
+        if self.persist:
+            self.journal = StateJournal()
+            self._restore_state()
 
         # wire callbacks
         self.broker.on_tick = self.on_tick
         self.broker.on_price = self.on_price
-        self.broker.on_fill = self.on_fill  # currently broker calls (code, filled_qty, filled_price) for 체결
+        self.broker.on_chejan = self.on_chejan
 
-        self._setup_timers()
+    # --------- clock helpers ---------
+    def _hms(self) -> str:
+        # 로그 출력용
+        return self.clock.now().strftime("%H:%M:%S")
 
     # --------- state ---------
+    def _load_journal(self) -> dict:
+        j = self.journal.load()
+        if not j:
+            # 예전 state.json 만 있으면 한 번 읽어서 다음 저장 때 journal 로 옮김
+            return load_state()
+        meta = j.get("meta", {})
+        return {
+            "universe_all": list(j.get("univ", {})),
+            "universe_rt": meta.get("rt") or [],
+            "positions": j.get("pos", {}),
+            "open_orders": list(j.get("order", {}).values()),
+            "day_pnl": meta.get("day_pnl"),
+            "strategy_positions": j.get("spos", {}),
+            "strategy_day_pnl": meta.get("sday"),
+        }
+
     def _restore_state(self):
-        st = load_state()
+        t0 = perf_counter_ns()
+        st = self._load_journal()
         if not st:
             return
         try:
-            self.universe.state.all_symbols = st.get("universe_all", []) or []
+            self.universe.state.all_symbols = dict.fromkeys(st.get("universe_all", []) or [])
             self.universe.state.realtime_symbols = st.get("universe_rt", []) or []
             positions = st.get("positions", {}) or {}
             for sym, p in positions.items():
@@ -97,88 +215,262 @@ class PaperBotApp:
                     )
                 except Exception:
                     continue
-            self.open_orders = st.get("open_orders", {}) or {}
-            self.log.info(f"[STATE] restored pos={len(positions)} rt={len(self.universe.state.realtime_symbols)}")
+            oo = st.get("open_orders") or []
+            if isinstance(oo, list):
+                self.orders.restore(oo)
+            day = st.get("day_pnl") or {}
+            if day.get("date") == self.clock.now().strftime("%Y%m%d"):
+                self.pnl.realized = float(day.get("realized", 0.0))
+                self.pnl.fees = float(day.get("fees", 0.0))
+            self.pnl.recompute()
+            if self.host is not None:
+                self.host.restore(
+                    st.get("strategy_positions") or {}, st.get("strategy_day_pnl") or {},
+                    self.clock.now().strftime("%Y%m%d"),
+                )
+            self.log.info(
+                f"[STATE] restored pos={len(positions)} rt={len(self.universe.state.realtime_symbols)} "
+                f"univ={len(self.universe.state.all_symbols)} in {(perf_counter_ns() - t0) / 1e6:.2f}ms"
+            )
         except Exception:
             return
 
-    def _snapshot_state(self):
-        positions = {
+    def _snapshot_state(self) -> int:
+        # 메모리에서 비교해 바뀐 항목만 journal 에 쓰고 한 번 fsync
+        j = self.journal
+        if j is None:
+            return 0
+        n = j.sync("pos", {
             s: {"qty": p.qty, "avg_price": p.avg_price, "last_price": p.last_price}
             for s, p in self.pnl.pos.items()
             if p.qty > 0
-        }
-        save_state({
-            "universe_all": self.universe.state.all_symbols,
-            "universe_rt": self.universe.state.realtime_symbols,
-            "positions": positions,
-            "open_orders": self.open_orders,
         })
+        n += j.sync("order", {o["order_no"]: o for o in self.orders.to_state()})
+        n += j.sync("univ", dict.fromkeys(self.universe.state.all_symbols, 1))
+        n += j.put("meta", "rt", list(self.universe.state.realtime_symbols))
+        n += j.put("meta", "day_pnl", {
+            "date": self.clock.now().strftime("%Y%m%d"),
+            "realized": self.pnl.realized,
+            "fees": self.pnl.fees,
+        })
+        if self.host is not None:
+            n += j.sync("spos", self.host.positions_state())
+            n += j.put("meta", "sday", self.host.day_state(self.clock.now().strftime("%Y%m%d")))
+        j.flush()
+        return n
+
+    # --------- risk ---------
+    def _arm_risk(self) -> None:
+        rs = self.risk_state
+        if rs.kill_switch:
+            self.pnl.breach_below = float("-inf")
+        elif rs.defense_reduce_positions:
+            self.pnl.breach_below = self.risk.kill
+        else:
+            self.pnl.breach_below = self.risk.defense
+
+    def _update_risk(self, ratio: float) -> RiskState:
+        rs = self.risk.update(ratio)
+        if rs != self.risk_state:
+            self.log.warning(
+                f"[RISK] day_pnl={ratio:.4%} kill={rs.kill_switch} defense={rs.defense_reduce_positions} "
+                f"entries={rs.allow_new_entries}"
+            )
+            log_jsonl(self.log_dir / "status.jsonl", {
+                "risk": rs.__dict__,
+                "day_pnl_ratio": ratio,
+                "realized": self.pnl.realized,
+                "unrealized": self.pnl.unrealized,
+            }, ts=self.clock.iso())
+            self.risk_state = rs
+            self._arm_risk()
+            self._push_gate()
+        return rs
+
+    def _on_pnl_breach(self, ratio: float) -> None:
+        self._update_risk(ratio)
 
     # --------- callbacks ---------
-    def on_price(self, code: str, price: float, ts_hms: str) -> None:
+    def on_price(self, code: str, price: float, ts: int) -> None:
         # update pnl last price
         self.pnl.on_price(code, price)
-
-    def on_tick(self, code: str, price: float, volume: int, ts: str) -> None:
-        # ts is "YYYY-MM-DD HH:MM:SS"
-        self.last_tick_ts[code] = time.time()
+        self._last_px[code] = price
+        if self.host is not None:
+            self.host.on_price(code, price, check_exit=self.event_mode)
+        elif self.event_mode and self.compute is None:
+            p = self.pnl.pos.get(code)
+            if p is not None and p.qty > 0:
+                self._check_exit(code)
+
+    def on_tick(self, code: str, price: float, volume: int, ts: int) -> None:
+        # ts: 체결 시각 epoch ms
+        t0 = perf_counter_ns()
+        self.last_tick_ts[code] = ts
+        self._last_tick_ns[code] = t0
+        if self.recorder is not None:
+            self.recorder.record(code, price, volume, ts, self.clock.time_us())
+        if self.compute is not None:
+            self.compute.push_tick(code, price, volume, ts, t0)
+            self.metrics.record("ring", perf_counter_ns() - t0)
+            return
         self.bar_builder.on_tick(code, price, volume, ts)
+        self.metrics.record("bar", perf_counter_ns() - t0)
 
-    def on_fill(self, code: str, filled_qty: int, filled_price: float) -> None:
-        # BrokerBase.on_fill signature: (symbol, qty, price) - side는 chejan 기반으로 추가 로깅 권장
-        # 여기서는 open_orders/positions는 broker가 유지하고 있으니, pnl만 업데이트는 체결 side를 chejan에서 받는게 정확.
-        # 임시로: filled_qty>0이면 BUY로 가정하지 않음. (Chejan 쪽 로그는 broker 내부에서 이미 가능)
-        pass
+    def on_chejan(self, ev: ChejanEvent) -> None:
+        # 체결/잔고 이벤트마다 즉시 반영 (주기적 전체 재동기화 없음)
+        if ev.gubun == GUBUN_BALANCE:
+            self.pnl.on_balance(ev.code, ev.holding_qty, ev.avg_price, ev.cur_price)
+            self._push_pos(ev.code)
+            return
+        self.orders.apply_chejan(ev)
+        if ev.is_fill:
+            if ev.side is None:
+                self.log.warning(f"[CHEJAN] fill without side order_no={ev.order_no} code={ev.code}")
+                return
+            self.pnl.on_fill(ev.code, ev.side.value, ev.fill_qty, ev.fill_price)
+            if self.host is not None:
+                self.host.on_fill(ev.code, ev.side, ev.fill_qty, ev.fill_price)
+            self._push_pos(ev.code)
+            if ev.side == Side.SELL:
+                # 자리가 비었을 수 있음 -> 다음 flush 에서 진입 재판단
+                self._entry_dirty = True
 
     def on_bar(self, b: Bar) -> None:
-        arr = self.bars_1m.setdefault(b.symbol, [])
-        arr.append({
-            "ts": b.ts,
-            "open": float(b.open),
-            "high": float(b.high),
-            "low": float(b.low),
-            "close": float(b.close),
-            "volume": int(b.volume),
-        })
-        # keep last 200
-        if len(arr) > 200:
-            del arr[:-200]
+        if b.symbol not in self.bars_1m and b.symbol in self.spill:
+            self._reload_bars(b.symbol)
+        self.symbols.touch(b.symbol)
+        # fixed-capacity ring buffer (last 200 bars per symbol)
+        self.bars_1m.append_bar(b)
+        # scored together in _on_bar_batch (one pass per bar boundary)
+        self._closed_syms[b.symbol] = None
+
+    def _on_bar_batch(self, bars: List[Bar]) -> None:
+        self._score_closed()
+
+    def _score_closed(self) -> None:
+        if not self._closed_syms:
+            return
+        syms = list(self._closed_syms)
+        self._closed_syms.clear()
+        t0 = perf_counter_ns()
+        self.sb.score_closed(self.bars_1m, syms)
+        self.metrics.record("score", perf_counter_ns() - t0)
+        if self.event_mode:
+            self._check_entries()
+
+    # --------- symbol lifecycle ---------
+    def _reload_bars(self, sym: str) -> None:
+        # 퇴출됐던 종목이 돌아옴: 디스크 이력을 링버퍼로 (점수 지표는 다음 스코어링 때 store 에서 재시드)
+        arr = self.spill.load(sym)
+        if arr is not None:
+            n = self.bars_1m.load(sym, arr)
+            self.log.info(f"[SYMBOL] reload {sym} bars={n}")
+
+    def _evict_symbol(self, sym: str) -> None:
+        if self.compute is not None:
+            self.compute.push_forget(sym)    # 실시간 바 이력은 계산 프로세스가 spill
+        else:
+            arr = self.bars_1m.export(sym)
+            if len(arr):
+                self.spill.save(sym, arr)
+        self.bars_1m.remove(sym)
+        self.sb.discard(sym)
+        if self.features is not None:
+            self.features.discard(sym)
+        if self.warm is not None:
+            self.warm.forget(sym)
+        self.order_mgr.forget(sym)
+        self.last_tick_ts.pop(sym, None)
+        self._last_tick_ns.pop(sym, None)
+        self._last_px.pop(sym, None)
+        p = self.pnl.pos.get(sym)
+        if p is not None and p.qty <= 0:
+            del self.pnl.pos[sym]
+
+    def _warm_realtime(self) -> None:
+        if self.warm is not None:
+            self.warm.warm(self.universe.state.realtime_symbols)
+
+    def _on_warm_ready(self, sym: str) -> None:
+        # 점수가 막 생겼으니 다음 flush 에서 진입 판단
+        self._entry_dirty = True
+        if self.features is not None:
+            self.features.discard(sym)    # 같은 바 ts 라도 점수가 다시 시드됨
+        if self.compute is not None:
+            self.compute.push_bars(sym, self.bars_1m.export(sym))
+
+    # --------- compute process ---------
+    def _push_pos(self, sym: str) -> None:
+        if self.compute is not None:
+            p = self.pnl.pos.get(sym)
+            self.compute.push_pos(sym, p.qty if p else 0, p.avg_price if p else 0.0)
+
+    def _push_gate(self) -> None:
+        # 진입 허용 여부 (리스크 + 컷오프 + 강제청산 구간) 가 바뀔 때만
+        if self.compute is None:
+            return
+        allow = self.risk_state.allow_new_entries and not self._after_entry_cutoff() and not self._within_force_close()
+        if allow != self._gate_pushed:
+            self.compute.push_gate(allow)
+            self._gate_pushed = allow
+
+    def _push_universe(self) -> None:
+        if self.compute is None:
+            return
+        rt = dict.fromkeys(self.universe.state.realtime_symbols)
+        self.compute.push_universe(
+            [s for s in rt if s not in self._rt_pushed], [s for s in self._rt_pushed if s not in rt],
+        )
+        self._rt_pushed = rt
 
-        # score update on bar close
-        self.sb.update(b.symbol, arr)
+    def _drain_intents(self) -> None:
+        # 계산 프로세스가 보낸 주문 의도 -> 이 프로세스 상태(미체결/재시도/보유 수)로 한 번 더 거른 뒤 전송
+        intents = self.compute.intents()
+        if not intents:
+            return
+        pending = {o.symbol for o in self.orders.working(Side.BUY)}
+        cur_positions = len(pending.union(s for s, p in self.pnl.pos.items() if p.qty > 0))
+        for sig, _t_ns in intents:
+            if sig.side == Side.SELL:
+                if sig.symbol in self._exit_retry or self.orders.open_qty(sig.symbol, Side.SELL) > 0:
+                    continue
+            elif cur_positions >= int(self.cfg.max_positions) or sig.symbol in pending:
+                continue
+            if self._send_signal(sig) and sig.side == Side.BUY:
+                cur_positions += 1
+                pending.add(sig.symbol)
+
+    def _sync_symbols(self) -> Dict[str, int]:
+        held = [s for s, p in self.pnl.pos.items() if p.qty > 0]
+        self.symbols.set_active(list(self.universe.state.realtime_symbols) + held)
+        evicted = self.symbols.evict()
+        if evicted:
+            self.log.info(f"[SYMBOL] evicted n={len(evicted)} spilled={len(self.spill)}")
+        return self.symbols.stats()
 
     # --------- timers ---------
-    def _setup_timers(self):
-        # universe refresh (minutes)
-        self.t_universe = QTimer()
-        self.t_universe.timeout.connect(self._on_universe_refresh)
-        self.t_universe.start(int(self.cfg.universe_refresh_min) * 60 * 1000)
-
-        # strategy tick
-        self.t_strategy = QTimer()
-        self.t_strategy.timeout.connect(self._on_strategy_tick)
-        self.t_strategy.start(int(self.cfg.score_refresh_sec) * 1000)
-
-        # open orders TR sync
-        self.t_trsync = QTimer()
-        self.t_trsync.timeout.connect(self._on_tr_sync)
-        self.t_trsync.start(int(self.cfg.tr_sync_sec) * 1000)
-
-        # status snapshot
-        self.t_status = QTimer()
-        self.t_status.timeout.connect(self._on_status)
-        self.t_status.start(int(self.cfg.status_sec) * 1000)
-
-        # keepalive realtime re-register
-        self.t_keepalive = QTimer()
-        self.t_keepalive.timeout.connect(self._on_rt_keepalive)
-        self.t_keepalive.start(int(self.cfg.rt_keepalive_min) * 60 * 1000)
-
-        # bar flush (1s)
-        self.t_flush = QTimer()
-        self.t_flush.timeout.connect(self._on_flush)
-        self.t_flush.start(1000)
+    def timer_specs(self) -> List[Tuple[str, int, Callable[[], None]]]:
+        # (name, interval_ms, callback) - QTimer 와 replay 가상 타이머가 공유
+        return [
+            ("universe", int(self.cfg.universe_refresh_min) * 60 * 1000, self._on_universe_refresh),
+            ("strategy", int(self.cfg.score_refresh_sec) * 1000, self._on_strategy_tick),
+            ("trsync", int(self.cfg.tr_sync_sec) * 1000, self._on_tr_sync),
+            ("status", int(self.cfg.status_sec) * 1000, self._on_status),
+            ("keepalive", int(self.cfg.rt_keepalive_min) * 60 * 1000, self._on_rt_keepalive),
+            ("flush", 1000, self._on_flush),
+            ("metrics", int(self.cfg.metrics_sec) * 1000, self._on_metrics),
+        ] + ([("intents", int(self.cfg.compute_poll_ms), self._drain_intents)] if self.compute is not None else [])
+
+    def setup_timers(self):
+        from PyQt5.QtCore import QTimer
+
+        self.timers = {}
+        for name, interval_ms, cb in self.timer_specs():
+            t = QTimer()
+            # event-loop hold time per callback -> timer.<name>
+            t.timeout.connect(self.metrics.timed(f"timer.{name}", cb))
+            t.start(interval_ms)
+            self.timers[name] = t
 
     # --------- operations ---------
     def start(self):
@@ -186,55 +478,118 @@ class PaperBotApp:
         self.broker.connect_and_login()
         acc = self.broker.get_account_no()
         self.log.info(f"[BOOT] login ok account={acc}")
+        for sym in list(self.pnl.pos):
+            self._push_pos(sym)
+        self._push_gate()
 
         # initial universe & realtime
-        self._on_universe_refresh()
+        if self.cfg.universe_realtime:
+            self.universe.start_realtime(on_change=self._on_universe_change, on_ready=self._apply_universe)
+        else:
+            self._on_universe_refresh()
+
+    def _on_metrics(self):
+        self.metrics.dump(self.log_dir / "metrics.jsonl", ts=self.clock.iso())
+
+    def shutdown(self):
+        if self.compute is not None:
+            st = self.compute.close()
+            self.log.info(f"[COMPUTE] stopped ticks={st.get('ticks')} intents={st.get('intents')} waits={self.compute.n_wait}")
+        self._on_metrics()
+        if self.journal is not None:
+            self._snapshot_state()
+            self.journal.compact()
+            self.journal.close()
+        if self.recorder is not None:
+            self.recorder.close()
 
     def _on_universe_refresh(self):
+        # 실시간 조건검색 중이면 목록은 이벤트로 갱신되므로 점수 기준 top N 재선정만
+        if self.universe.streaming:
+            self._apply_universe()
+            return
         try:
-            self.universe.refresh_from_condition()
-            self.universe.pick_realtime_top_n(scorer=self.sb)
-            self.universe.apply_realtime_registry()
+            self.universe.refresh_from_condition(on_done=self._apply_universe)
         except Exception as e:
             self.log.exception(f"[UNIVERSE] refresh failed: {e}")
 
+    def _on_universe_change(self, added: List[str], removed: List[str]) -> None:
+        # 편입/이탈분만 점수판/실시간 등록에 반영 (보유 종목은 이탈해도 시세 유지)
+        for s in removed:
+            self.sb.discard(s)
+        held = [s for s, p in self.pnl.pos.items() if p.qty > 0]
+        try:
+            self.universe.update_realtime(added, removed, keep=held)
+            self._push_universe()
+            self._warm_realtime()
+        except Exception as e:
+            self.log.exception(f"[UNIVERSE] realtime update failed: {e}")
+
+    def _apply_universe(self):
+        try:
+            held = [s for s, p in self.pnl.pos.items() if p.qty > 0]
+            self.universe.pick_realtime_top_n(scorer=self.sb, keep=held)
+            self.universe.apply_realtime_registry()
+            self._push_universe()
+            self._warm_realtime()
+        except Exception as e:
+            self.log.exception(f"[UNIVERSE] apply failed: {e}")
+
     def _on_rt_keepalive(self):
-        # simply re-apply current realtime symbols
+        # re-apply current realtime symbols (diff: no OCX calls when unchanged)
         try:
             self.universe.apply_realtime_registry()
-            self.log.info("[RT_KEEPALIVE] re-registered realtime")
         except Exception as e:
             self.log.exception(f"[RT_KEEPALIVE] failed: {e}")
 
     def _on_tr_sync(self):
         try:
-            self.open_orders = self.broker.sync_open_orders_tr()
-            log_jsonl(Path("logs/open_orders.jsonl"), {"count": len(self.open_orders)})
+            self.broker.request_open_orders().add_done_callback(self._on_open_orders_tr)
         except Exception as e:
             self.log.exception(f"[TR_SYNC] opt10075 failed: {e}")
 
+    def _on_open_orders_tr(self, fut):
+        exc = fut.exception()
+        if exc is not None:
+            self.log.error(f"[TR_SYNC] opt10075 failed: {exc}")
+            return
+        changed = self.orders.merge_tr(fut.result())
+        log_jsonl(self.log_dir / "open_orders.jsonl", {"count": self.orders.n_open(), "changed": changed}, ts=self.clock.iso())
+
     def _within_force_close(self) -> bool:
-        hm = _hm()
-        return (self.cfg.force_close_start <= hm <= self.cfg.force_close_end)
+        return self._fc_start <= self.clock.minute_of_day() <= self._fc_end
 
     def _after_entry_cutoff(self) -> bool:
-        return _hm() >= self.cfg.entry_cutoff
+        return self.clock.minute_of_day() >= self._entry_cutoff
 
     def _on_strategy_tick(self):
+        self._push_gate()
         # force close window: let existing force close logic outside
         if self._within_force_close():
             self._force_close_step()
             return
 
-        # risk state from broker day pnl (forced externally or 0)
-        rs = self.risk.update(self.broker.get_day_pnl_ratio())
+        # risk state from tracked day pnl (broker ratio can still force it lower)
+        rs = self._update_risk(min(self.pnl.day_pnl_ratio(), self.broker.get_day_pnl_ratio()))
         if rs.kill_switch:
             self.log.warning("[RISK] kill_switch ON: no new entries")
+        if self.host is not None:
+            self.host.update_risk()
+        if self.event_mode:
+            return   # 청산/진입은 on_price / 바 마감에서 처리
         allow_new = rs.allow_new_entries and (not self._after_entry_cutoff())
+        if self.host is not None:
+            self.host.check_exits()
+            if allow_new:
+                syms = sorted(self.universe.state.realtime_symbols, key=lambda s: float(self.sb.get(s)), reverse=True)
+                self.host.check_entries(syms[:10], self._last_px)
+            return
 
         # exits first
         for sym in list(self.pnl.pos.keys()):
+            t0 = perf_counter_ns()
             sig = self.strategy.decide_exit(sym)
+            self.metrics.record("decide", perf_counter_ns() - t0)
             if sig:
                 self._send_signal(sig)
 
@@ -260,52 +615,116 @@ class PaperBotApp:
                 if pl:
                     last = float(pl.last_price)
 
+            t0 = perf_counter_ns()
             sig = self.strategy.decide_entry(sym, can_hold_more=can_hold_more, last_price=last)
+            self.metrics.record("decide", perf_counter_ns() - t0)
             if sig:
                 if self._send_signal(sig):
                     # update can_hold_more
                     cur_positions += 1
                     can_hold_more = cur_positions < int(self.cfg.max_positions)
 
+    def _check_exit(self, sym: str) -> None:
+        # 재시도 대기 중이거나 매도 주문이 이미 나가 있으면 틱마다 다시 보내지 않음
+        if sym in self._exit_retry or self.orders.open_qty(sym, Side.SELL) > 0:
+            return
+        t0 = perf_counter_ns()
+        sig = self.strategy.decide_exit(sym)
+        self.metrics.record("decide", perf_counter_ns() - t0)
+        if sig:
+            self._send_signal(sig)
+
+    def _check_entries(self) -> None:
+        if not self.risk_state.allow_new_entries or self._after_entry_cutoff() or self._within_force_close():
+            return
+        if self.host is not None:
+            if self.host.allow_entries():
+                rt = set(self.universe.state.realtime_symbols)
+                self.host.check_entries(self.sb.top(10, accept=rt.__contains__), self._last_px)
+            return
+        # 체결이 비동기로 오므로 나가 있는 매수도 자리로 센다 (같은 종목 재매수/보유 한도 초과 방지)
+        pending = {o.symbol for o in self.orders.working(Side.BUY)}
+        cur_positions = len(pending.union(s for s, p in self.pnl.pos.items() if p.qty > 0))
+        if cur_positions >= int(self.cfg.max_positions):
+            return
+        rt = set(self.universe.state.realtime_symbols)
+        for sym in self.sb.top(10, accept=rt.__contains__):
+            if sym in pending:
+                continue
+            t0 = perf_counter_ns()
+            sig = self.strategy.decide_entry(
+                sym, can_hold_more=cur_positions < int(self.cfg.max_positions), last_price=self._last_px.get(sym, 0.0),
+            )
+            self.metrics.record("decide", perf_counter_ns() - t0)
+            if sig and self._send_signal(sig):
+                cur_positions += 1
+
     def _send_signal(self, sig) -> bool:
         if self.cfg.dry_run:
             self.log.info(f"[DRY_RUN] {sig.side.value} {sig.symbol} x{sig.qty} reason={sig.reason}")
             return False
+        if sig.side == Side.BUY and not self.risk_state.allow_new_entries:
+            self.log.info(f"[RISK_BLOCK] BUY {sig.symbol} reason={sig.reason}")
+            return False
         ok = self.order_mgr.send(self.strategy.to_order(sig), reason=sig.reason, cooldown_sec=int(self.cfg.per_symbol_cooldown_sec))
+        t_tick = self._last_tick_ns.get(sig.symbol)
+        if ok and t_tick:
+            self.metrics.record("tick_to_order", perf_counter_ns() - t_tick)
+        if not ok and sig.side == Side.SELL and self.order_mgr.last_wait_sec > 0:
+            # 청산은 버리지 않고 자리가 나는 시점에 다시 판단
+            self._exit_retry[sig.symbol] = self.clock.time() + self.order_mgr.last_wait_sec
+        return ok
+
+    def _send_host_signal(self, sig, inst) -> bool:
+        # 다중 전략 주문: 계좌 리스크 -> 공유 가드 (전역/종목 예산 + 전략별 한도)
+        if self.cfg.dry_run:
+            self.log.info(f"[DRY_RUN] {sig.side.value} {sig.symbol} x{sig.qty} reason={inst.name}:{sig.reason}")
+            return False
+        if sig.side == Side.BUY and not self.risk_state.allow_new_entries:
+            self.log.info(f"[RISK_BLOCK] BUY {sig.symbol} reason={inst.name}:{sig.reason}")
+            return False
+        ok = self.order_mgr.send(
+            inst.strategy.to_order(sig), reason=f"{inst.name}:{sig.reason}",
+            cooldown_sec=int(self.cfg.per_symbol_cooldown_sec), strategy=inst.name,
+        )
+        t_tick = self._last_tick_ns.get(sig.symbol)
+        if ok and t_tick:
+            self.metrics.record("tick_to_order", perf_counter_ns() - t_tick)
+        if not ok and sig.side == Side.SELL and self.order_mgr.last_wait_sec > 0:
+            inst.exit_retry[sig.symbol] = self.clock.time() + self.order_mgr.last_wait_sec
         return ok
 
+    def _retry_exits(self):
+        if self.host is not None:
+            self.host.retry_exits()
+        if not self._exit_retry:
+            return
+        now = self.clock.time()
+        for sym, due in list(self._exit_retry.items()):
+            if due > now:
+                continue
+            del self._exit_retry[sym]
+            sig = self.strategy.decide_exit(sym)
+            if sig:
+                self._send_signal(sig)
+
     def _force_close_step(self):
         # 1) 미체결 조회 + 정정/취소 + 2) 보유 포지션 전량 매도
         try:
-            oo = self.broker.get_open_orders()
-            # sync broker positions -> pnl tracker (chejan 기반 avg/qty 반영)
-            try:
-                from core.pnl_tracker import PositionLite
-                for s, p in pos.items():
-                    if int(p.qty) > 0:
-                        self.pnl.pos[s] = PositionLite(qty=int(p.qty), avg_price=float(p.avg_price), last_price=float(p.last_price))
-                    else:
-                        # remove empty
-                        if s in self.pnl.pos:
-                            self.pnl.pos.pop(s, None)
-            except Exception:
-                pass
-            if oo:
-                for order_no, o in oo.items():
-                    unfilled = int(o.get("unfilled", 0))
-                    if unfilled <= 0:
-                        continue
-                    code = str(o.get("code", "")).strip()
-                    # 정정: 시장가로 전환 시도, 실패하면 취소
+            for o in self.orders.working():
+                if o.state == OrderState.PENDING:
+                    continue   # 주문번호 수신 전에는 정정/취소 불가
+                order_no, code, side, unfilled = o.order_no, o.symbol, o.side, o.open_qty
+                # 정정: 시장가로 전환 시도, 실패하면 취소
+                try:
+                    self.broker.modify_order_to_market(order_no, code, side, unfilled)
+                    self.log.info(f"[FORCE] modify_to_market order_no={order_no} code={code} unfilled={unfilled}")
+                except Exception:
                     try:
-                        self.broker.modify_order_to_market(order_no, code, unfilled)
-                        self.log.info(f"[FORCE] modify_to_market order_no={order_no} code={code} unfilled={unfilled}")
-                    except Exception:
-                        try:
-                            self.broker.cancel_order(order_no, code, unfilled)
-                            self.log.info(f"[FORCE] cancel order_no={order_no} code={code} unfilled={unfilled}")
-                        except Exception as e2:
-                            self.log.exception(f"[FORCE] cancel failed order_no={order_no} err={e2}")
+                        self.broker.cancel_order(order_no, code, side, unfilled)
+                        self.log.info(f"[FORCE] cancel order_no={order_no} code={code} unfilled={unfilled}")
+                    except Exception as e2:
+                        self.log.exception(f"[FORCE] cancel failed order_no={order_no} err={e2}")
 
             # positions sell
             pos = self.broker.get_positions()
@@ -323,45 +742,79 @@ class PaperBotApp:
             self.log.exception(f"[FORCE] step failed: {e}")
 
     def _on_flush(self):
+        if self.compute is not None:
+            self.compute.push_flush(self.clock.time_ms())
+            self._drain_intents()
+            self._retry_exits()
+            return
         # flush bars to close minutes
-        self.bar_builder.flush(_now_ts())
+        self.bar_builder.flush(self.clock.time_ms())
+        self._score_closed()
+        self._retry_exits()
+        if self._entry_dirty:
+            self._entry_dirty = False
+            if self.event_mode:
+                self._check_entries()
 
     def _on_status(self):
         try:
-            pos = self.broker.get_positions()
-            oo = self.broker.get_open_orders()
-            # sync broker positions -> pnl tracker (chejan 기반 avg/qty 반영)
-            try:
-                from core.pnl_tracker import PositionLite
-                for s, p in pos.items():
-                    if int(p.qty) > 0:
-                        self.pnl.pos[s] = PositionLite(qty=int(p.qty), avg_price=float(p.avg_price), last_price=float(p.last_price))
-                    else:
-                        # remove empty
-                        if s in self.pnl.pos:
-                            self.pnl.pos.pop(s, None)
-            except Exception:
-                pass
-            self.open_orders = oo
-            self.log.info(f"[STATUS] t={_hms()} rt={len(self.universe.state.realtime_symbols)} pos={sum(1 for p in pos.values() if p.qty>0)} oo={len(oo)}")
+            pos_n = sum(1 for p in self.pnl.pos.values() if p.qty > 0)
+            oo_n = self.orders.n_open()
+            sym = self._sync_symbols()
+            self.log.info(
+                f"[STATUS] t={self._hms()} rt={len(self.universe.state.realtime_symbols)} pos={pos_n} oo={oo_n} "
+                f"sym={sym['resident']}/{sym['bytes'] // 1024}KB"
+            )
             # snapshot logs
-            log_jsonl(Path("logs/status.jsonl"), {
+            status = {
                 "rt_n": len(self.universe.state.realtime_symbols),
-                "pos_n": sum(1 for p in pos.values() if p.qty>0),
-                "oo_n": len(oo),
-            })
+                "pos_n": pos_n,
+                "oo_n": oo_n,
+                "symbols": sym,
+                "warm": self.warm.stats() if self.warm is not None else {},
+            }
+            if self.host is not None:
+                self.host.reconcile(self.orders.open_qty)
+                status["strategies"] = self.host.stats()
+                status["features"] = self.features.stats()
+            sink = get_jsonl_sink()
+            if sink is not None:
+                status["jsonl"] = sink.stats()
+            log_jsonl(self.log_dir / "status.jsonl", status, ts=self.clock.iso())
             self.pnl.snapshot_log()
+            if self.host is not None:
+                self.host.snapshot_log()
+            self.orders.prune()
             self._snapshot_state()
+            if self.recorder is not None:
+                self.recorder.flush()
         except Exception as e:
             self.log.exception(f"[STATUS] failed: {e}")
 
 
 def main():
+    from PyQt5.QtWidgets import QApplication
+
     cfg = load_config("config.json")
+    sink = None
+    if cfg.jsonl_async:
+        sink = JsonlSink(
+            max_queue=int(cfg.jsonl_queue_max),
+            policy=cfg.jsonl_policy,
+            flush_sec=float(cfg.jsonl_flush_sec),
+        )
+        install_jsonl_sink(sink)
     app = QApplication([])
     bot = PaperBotApp(cfg)
+    bot.setup_timers()
     bot.start()
-    app.exec_()
+    try:
+        app.exec_()
+    finally:
+        bot.shutdown()
+        if sink is not None:
+            install_jsonl_sink(None)
+            sink.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+"""계측 오버헤드 마이크로벤치마크
+
+    python -m bench.bench_metrics
+
+span 1회(perf_counter_ns 2번 + Metrics.record) 비용과, 실제 틱 경로
+(PaperBotApp.on_tick 상당: RealtimeBarBuilder.on_tick) 대비 비율을 출력한다.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime
+from time import perf_counter_ns
+
+from core.metrics import Histogram, Metrics
+from data.realtime_bar_builder import RealtimeBarBuilder
+
+N = 1_000_000
+T0_MS = int(datetime(2026, 10, 16, 9, 0).timestamp()) * 1000
+
+
+def _loop_baseline(n: int) -> float:
+    t0 = perf_counter_ns()
+    for _ in range(n):
+        pass
+    return (perf_counter_ns() - t0) / n
+
+
+def _loop_span(m: Metrics, n: int) -> float:
+    rec = m.record
+    t0 = perf_counter_ns()
+    for _ in range(n):
+        s = perf_counter_ns()
+        rec("stage", perf_counter_ns() - s)
+    return (perf_counter_ns() - t0) / n
+
+
+def _tick_path(n: int, metrics: Metrics = None) -> float:
+    bb = RealtimeBarBuilder(lambda b: None)
+    syms = [f"{i:06d}" for i in range(80)]
+    rnd = random.Random(0)
+    ticks = [(syms[i % 80], 10_000.0 + rnd.randint(-50, 50), rnd.randint(1, 100),
+              T0_MS + ((i // 8000) % 60) * 60_000) for i in range(n)]
+    t0 = perf_counter_ns()
+    if metrics is None:
+        for s, p, v, ts in ticks:
+            bb.on_tick(s, p, v, ts)
+    else:
+        rec = metrics.record
+        for s, p, v, ts in ticks:
+            t = perf_counter_ns()
+            bb.on_tick(s, p, v, ts)
+            rec("bar", perf_counter_ns() - t)
+    return (perf_counter_ns() - t0) / n
+
+
+def main() -> None:
+    base = _loop_baseline(N)
+    span = _loop_span(Metrics(), N) - base
+    off = _loop_span(Metrics(enabled=False), N) - base
+    tick_plain = _tick_path(N // 4)
+    tick_inst = _tick_path(N // 4, Metrics())
+    print(f"span (enabled)       : {span:8.1f} ns")
+    print(f"span (disabled)      : {off:8.1f} ns")
+    print(f"bar tick plain       : {tick_plain:8.1f} ns")
+    print(f"bar tick instrumented: {tick_inst:8.1f} ns  (+{(tick_inst / tick_plain - 1) * 100:.1f}%)")
+
+    # 정확도: 로그-선형 버킷 상대오차 <= 1/16
+    h = Histogram()
+    rnd = random.Random(1)
+    vals = sorted(int(rnd.lognormvariate(10, 1.5)) for _ in range(100_000))
+    for v in vals:
+        h.record(v)
+    for q in (50, 99):
+        exact = vals[int(len(vals) * q / 100) - 1]
+        print(f"p{q}: hist={h.percentile(q)} exact={exact} err={abs(h.percentile(q) - exact) / exact * 100:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
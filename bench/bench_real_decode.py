@@ -0,0 +1,70 @@
+"""실시간 체결 디코딩 벤치마크: FID 별 GetCommRealData vs real_data 단일 패스
+
+    python -m bench.bench_real_decode
+
+FakeKiwoomOcx 의 dynamicCall 은 순수 파이썬이라 실제 COM 왕복(수~수십 µs)보다 훨씬 싸다.
+따라서 여기 수치는 구 경로의 비용을 과소평가한 하한이다.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from time import perf_counter_ns
+
+from broker.fake_ocx import FakeKiwoomOcx
+from broker.kiwoom_real import RealDataDecoder, encode_real_data
+
+N = 200_000
+
+SAMPLE = {
+    20: "093015", 10: "+61200", 11: "+200", 12: "+0.33", 27: "+61300", 28: "+61200",
+    15: "-37", 13: "1523044", 14: "93211", 16: "+61000", 17: "+61500", 18: "-60800",
+    25: "2", 26: "-12001", 29: "-1200", 30: "98.12", 31: "0.03", 32: "", 228: "112.35",
+    311: "3651234", 290: "2", 691: "0", 567: "000000", 568: "000000",
+}
+
+
+def old_path(ocx: FakeKiwoomOcx, code: str) -> None:
+    cur = ocx.dynamicCall("GetCommRealData(QString, int)", code, 10)
+    vol = ocx.dynamicCall("GetCommRealData(QString, int)", code, 15)
+    price = abs(int(str(cur).strip()))
+    volume = abs(int(str(vol).strip())) if str(vol).strip() else 0
+    time.strftime("%H:%M:%S")
+    datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return price, volume
+
+
+def new_path(dec: RealDataDecoder, code: str, payload: str, today: str) -> None:
+    rec = dec.decode(code, "주식체결", payload)
+    hms = rec.hms()
+    return rec.price, abs(rec.volume), f"{today} {hms}"
+
+
+def main() -> None:
+    ocx = FakeKiwoomOcx()
+    ocx.record_calls = False
+    code = "005930"
+    ocx._real[code] = dict(SAMPLE)
+    payload = encode_real_data("주식체결", SAMPLE)
+    dec = RealDataDecoder()
+    today = "2026-10-16"
+
+    assert old_path(ocx, code)[:2] == new_path(dec, code, payload, today)[:2]
+
+    t0 = perf_counter_ns()
+    for _ in range(N):
+        old_path(ocx, code)
+    t_old = (perf_counter_ns() - t0) / N
+
+    t0 = perf_counter_ns()
+    for _ in range(N):
+        new_path(dec, code, payload, today)
+    t_new = (perf_counter_ns() - t0) / N
+
+    print(f"old (2x GetCommRealData + 2x strftime): {t_old / 1000:7.2f} us/tick  (fake OCX, COM cost excluded)")
+    print(f"new (single split decode + cached date): {t_new / 1000:7.2f} us/tick")
+    print(f"speedup >= {t_old / t_new:.1f}x; fields decoded: price, volume, cum_volume, exch_time, bid/ask, strength")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""분 경계 스코어링 벤치마크: 종목별 루프 vs 벡터화 배치
+
+    python -m bench.bench_scoring            # 200, 2000 종목
+    python -m bench.bench_scoring 80 500
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from typing import Dict, List
+
+from core.scoring import ScoreBoard
+from data.bar_store import BarStore
+
+
+def _make_history(n_syms: int, n_bars: int, seed: int = 7) -> Dict[str, List[dict]]:
+    rnd = random.Random(seed)
+    out: Dict[str, List[dict]] = {}
+    for i in range(n_syms):
+        p = rnd.uniform(1_000, 100_000)
+        bars = []
+        for t in range(n_bars):
+            p = max(1.0, p * (1 + rnd.gauss(0, 0.002)))
+            bars.append({"ts": t * 60, "open": p, "high": p, "low": p, "close": p, "volume": rnd.randint(0, 5_000)})
+        out[f"{i:06d}"] = bars
+    return out
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(n_syms: int, n_bars: int = 200, repeat: int = 5) -> Dict[str, float]:
+    hist = _make_history(n_syms, n_bars)
+    store = BarStore(capacity=n_bars, initial_symbols=n_syms)
+    for s, bars in hist.items():
+        for b in bars:
+            store.append(s, b["ts"], b["open"], b["high"], b["low"], b["close"], b["volume"])
+    syms = list(hist)
+
+    # 1) 기존 경로: 종목마다 dict 리스트 전체로 features_from_bars
+    sb_loop = ScoreBoard()
+    t_loop = _best_of(lambda: [sb_loop.update(s, hist[s]) for s in syms], repeat)
+
+    # 2) 스트리밍 O(1): 종목마다 새 바 1개 반영
+    sb_stream = ScoreBoard()
+    for s in syms:
+        for b in hist[s]:
+            sb_stream.on_bar(s, b["close"], b["volume"])
+    last = {s: hist[s][-1] for s in syms}
+    t_stream = _best_of(lambda: [sb_stream.on_bar(s, last[s]["close"], last[s]["volume"]) for s in syms], repeat)
+
+    # 3) 벡터화 배치: BarStore 행렬 한 번
+    sb_batch = ScoreBoard()
+    t_batch = _best_of(lambda: sb_batch.update_batch(store, syms), repeat)
+
+    # 결과 일치 확인
+    worst = max(abs(sb_loop.scores[s] - sb_batch.scores[s]) for s in syms)
+    return {"symbols": n_syms, "loop_ms": t_loop * 1e3, "stream_ms": t_stream * 1e3,
+            "batch_ms": t_batch * 1e3, "speedup": t_loop / t_batch, "max_abs_diff": worst}
+
+
+def main(argv: List[str]) -> None:
+    sizes = [int(x) for x in argv] or [200, 2000]
+    print(f"{'symbols':>8} {'loop_ms':>10} {'stream_ms':>10} {'batch_ms':>10} {'speedup':>8} {'max_diff':>10}")
+    for n in sizes:
+        r = run(n)
+        print(f"{r['symbols']:>8} {r['loop_ms']:>10.2f} {r['stream_ms']:>10.2f} {r['batch_ms']:>10.2f} "
+              f"{r['speedup']:>7.1f}x {r['max_abs_diff']:>10.2e}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
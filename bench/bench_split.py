@@ -0,0 +1,182 @@
+"""틱 처리: 단일 스레드 vs 2-프로세스(공유메모리 링) 비교
+
+합성 시장(bench.market_gen) 틱을 같은 ComputeEngine(분봉 -> 점수 -> 진입/청산 판단)에 두 방식으로 넣는다.
+
+- single: 주 스레드가 직접 engine.on_tick/flush (지금의 PaperBotApp 처럼 Qt 스레드 하나)
+- split:  주 스레드는 ComputeProcess.push_tick 만, 계산은 별도 프로세스 (cfg.compute_process)
+
+보고 항목:
+- max_tps: 최대한 빨리 넣을 때 계산까지 끝난 틱 / wall sec
+- main_us_per_tick: 주 스레드가 틱 하나에 쓰는 CPU 시간 (Qt 이벤트 루프 점유, 대기/스핀 제외)
+- lat_p50/p99/max_us: 합성 틱 시각대로 (버스트/장 시작 급증 포함, --duration 초 동안) 넣을 때 도착 -> 계산 완료 지연
+- --main-work-ms: 주 스레드에 1초마다 끼우는 다른 일 (_on_status, 로그, 스냅샷 흉내)
+
+    python -m bench.bench_split
+    python -m bench.bench_split --symbols 2000 --rate 20000 --main-work-ms 30
+
+두 프로세스가 실제로 병렬로 돌려면 코어가 2개 이상이어야 한다 (os.cpu_count 를 같이 출력).
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from dataclasses import replace
+from time import perf_counter_ns, thread_time_ns
+from typing import Dict, List, Optional, Tuple
+
+from bench.market_gen import MarketSpec, generate, symbols_for
+from core.compute_proc import ComputeEngine, ComputeProcess
+from core.metrics import Histogram
+from core.settings import BotConfig
+
+TickMs = Tuple[int, str, float, int]
+
+
+def _quiet() -> logging.Logger:
+    lg = logging.getLogger("bench.split")
+    lg.propagate = False
+    if not lg.handlers:
+        lg.addHandler(logging.NullHandler())
+    return lg
+
+
+def _ticks(spec: MarketSpec) -> List[TickMs]:
+    return [(int(t * 1000), c, p, v) for t, c, p, v in generate(spec)]
+
+
+def _arrivals(ticks: List[TickMs], paced: bool, t0: int) -> Optional[List[int]]:
+    # 생성된 틱 시각(ms)을 그대로 perf_counter_ns 도착 시각으로 (버스트 유지, 구간 = duration)
+    if not paced or not ticks:
+        return None
+    ts0 = ticks[0][0]
+    return [t0 + (ts - ts0) * 1_000_000 for ts, _, _, _ in ticks]
+
+
+def _wait_until(t_ns: int) -> None:
+    # 이벤트 루프처럼 대부분은 자고 (코어를 계산 프로세스에 양보) 마지막 0.1ms 만 스핀
+    d = t_ns - perf_counter_ns()
+    if d > 300_000:
+        time.sleep((d - 100_000) / 1e9)
+    while perf_counter_ns() < t_ns:
+        pass
+
+
+def _main_work(ms: float) -> None:
+    end = perf_counter_ns() + int(ms * 1e6)
+    while perf_counter_ns() < end:
+        pass
+
+
+def run_single(cfg: BotConfig, ticks: List[TickMs], syms: List[str], paced: bool,
+               main_work_ms: float) -> Dict[str, float]:
+    eng = ComputeEngine(cfg, _quiet())
+    eng.rt = dict.fromkeys(syms)
+    eng.allow_entries = True
+    lat = Histogram()
+    main_ns = 0
+    last_sec = ticks[0][0] // 1000
+    t0 = perf_counter_ns()
+    arrive = _arrivals(ticks, paced, t0 + 1_000_000)
+    next_work = t0 + 1_000_000_000
+    for i, (ts, code, price, vol) in enumerate(ticks):
+        if arrive is not None:
+            a = arrive[i]
+            _wait_until(a)
+        else:
+            a = perf_counter_ns()
+        if main_work_ms and a >= next_work:
+            _main_work(main_work_ms)
+            next_work += 1_000_000_000
+        c = thread_time_ns()
+        if ts // 1000 != last_sec:
+            last_sec = ts // 1000
+            eng.flush(ts)
+        eng.on_tick(code, price, vol, ts, a)
+        main_ns += thread_time_ns() - c
+        lat.record(perf_counter_ns() - a)
+    wall = (perf_counter_ns() - t0) / 1e9
+    s = lat.summary()
+    return {
+        "mode": "single", "ticks": eng.n_ticks, "intents": eng.n_intents,
+        "max_tps": round(eng.n_ticks / wall, 1) if wall > 0 else 0.0,
+        "main_us_per_tick": round(main_ns / max(1, len(ticks)) / 1000, 2),
+        "lat_p50_us": s["p50_us"], "lat_p99_us": s["p99_us"], "lat_max_us": s["max_us"],
+        "ring_waits": 0,
+    }
+
+
+def run_split(cfg: BotConfig, ticks: List[TickMs], syms: List[str], paced: bool,
+              main_work_ms: float) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as spill:
+        cp = ComputeProcess(cfg, spill_root=spill, capacity=int(cfg.compute_ring_size))
+        try:
+            cp.push_universe(syms, [])
+            cp.push_gate(True)
+            cp.wait_ready()
+            main_ns = 0
+            last_sec = ticks[0][0] // 1000
+            t0 = perf_counter_ns()
+            arrive = _arrivals(ticks, paced, t0 + 1_000_000)
+            next_work = t0 + 1_000_000_000
+            for i, (ts, code, price, vol) in enumerate(ticks):
+                if arrive is not None:
+                    a = arrive[i]
+                    _wait_until(a)
+                else:
+                    a = perf_counter_ns()
+                if main_work_ms and a >= next_work:
+                    _main_work(main_work_ms)
+                    next_work += 1_000_000_000
+                c = thread_time_ns()
+                if ts // 1000 != last_sec:
+                    last_sec = ts // 1000
+                    cp.push_flush(ts)
+                    cp.intents()    # 의도 링 비우기 (주문은 보내지 않음)
+                cp.push_tick(code, price, vol, ts, a)
+                main_ns += thread_time_ns() - c
+            st = cp.close(timeout=120.0)
+            wall = (perf_counter_ns() - t0) / 1e9
+        finally:
+            if cp.proc.is_alive():
+                cp.proc.terminate()
+    lat = st.get("stages", {}).get("tick_to_compute", {})
+    n = int(st.get("ticks", 0))
+    return {
+        "mode": "split", "ticks": n, "intents": int(st.get("intents", 0)),
+        "max_tps": round(n / wall, 1) if wall > 0 else 0.0,
+        "main_us_per_tick": round(main_ns / max(1, len(ticks)) / 1000, 2),
+        "lat_p50_us": lat.get("p50_us", 0.0), "lat_p99_us": lat.get("p99_us", 0.0), "lat_max_us": lat.get("max_us", 0.0),
+        "ring_waits": cp.n_wait,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="single-thread vs shared-memory two-process tick path")
+    ap.add_argument("--symbols", type=int, default=500)
+    ap.add_argument("--rate", type=float, default=None, help="mean generated ticks/sec (default 5 per symbol)")
+    ap.add_argument("--duration", type=int, default=30, help="virtual seconds of market data")
+    ap.add_argument("--main-work-ms", type=float, default=0.0, help="busy work injected on the main thread every second")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    rate = args.rate or 5.0 * args.symbols
+    spec = MarketSpec(n_symbols=args.symbols, rate=rate, duration_sec=args.duration, seed=args.seed)
+    ticks = _ticks(spec)
+    syms = symbols_for(args.symbols)
+    cfg = replace(BotConfig(), metrics_enabled=True)
+    print(f"cpus={os.cpu_count()} symbols={args.symbols} ticks={len(ticks)} rate={rate:.0f} main_work_ms={args.main_work_ms}")
+    print(f"{'mode':>7} {'pace':>6} {'ticks':>8} {'max_tps':>10} {'main_us/tick':>13} "
+          f"{'p50_us':>9} {'p99_us':>10} {'max_us':>10} {'waits':>6}")
+    for paced in (False, True):
+        for fn in (run_single, run_split):
+            r = fn(cfg, ticks, syms, paced, args.main_work_ms)
+            print(f"{r['mode']:>7} {'ts' if paced else 'max':>6} {r['ticks']:>8} {r['max_tps']:>10.0f} "
+                  f"{r['main_us_per_tick']:>13.2f} {r['lat_p50_us']:>9.1f} {r['lat_p99_us']:>10.1f} "
+                  f"{r['lat_max_us']:>10.1f} {r['ring_waits']:>6}")
+
+
+if __name__ == "__main__":
+    main()
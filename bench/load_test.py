@@ -0,0 +1,175 @@
+"""실시간 경로 부하 테스트
+
+합성 시장(bench.market_gen)을 FakeKiwoomOcx 주식체결 real_data -> KiwoomBroker._on_receive_real_data
+(단일 패스 디코딩, 거래소 시각 -> epoch ms) -> PaperBotApp.on_price/on_tick -> RealtimeBarBuilder
+-> on_bar -> 스코어링 경로로 가능한 한 빠르게 밀어 넣고
+(가상 시계 기준 flush/strategy/status 타이머 포함) 다음을 보고한다.
+--no-decode 를 줄 때만 디코딩을 빼고 SimulatedBroker.feed_tick 으로 넣는다 (decode=False).
+
+- max_tps: 최대 지속 처리량 (ticks / wall sec)
+- cpu_us_per_tick: 틱당 CPU 시간
+- mem_growth_kb: 실행 중 RSS 최대치 증가량 (POSIX), 불가하면 tracemalloc 피크
+- keeps_up: max_tps >= 목표 rate 여부
+
+    python -m bench.load_test                      # 80, 200, 2000 종목
+    python -m bench.load_test --symbols 200 --rate 2000 --duration 600
+    python -m bench.load_test --record logs/bench/load_test.jsonl   # 버전별 추적용 누적 기록
+    python -m bench.load_test --no-decode          # 디코딩 제외 (이전 수치와 비교용)
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app_replay import ReplayRunner
+from bench.market_gen import MarketSpec, generate, symbols_for
+from broker.fake_ocx import FakeKiwoomOcx
+from broker.kiwoom import KiwoomBroker
+from broker.kiwoom_real import REAL_LAYOUTS
+from broker.simulated import SimulatedBroker
+from core.clock import UTC_OFFSET_SEC, VirtualClock
+from core.logger import log_jsonl
+from core.settings import BotConfig
+from core.types import Position
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _maxrss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=Path(__file__).resolve().parents[1]).decode().strip()
+    except Exception:
+        return ""
+
+
+# 주식체결 real_data 의 나머지 FID (값은 디코딩 비용에만 영향)
+_TRADE_FIELDS = {
+    11: "+200", 12: "+0.33", 27: "+61300", 28: "+61200", 13: "1523044", 14: "93211",
+    16: "+61000", 17: "+61500", 18: "-60800", 25: "2", 26: "-12001", 29: "-1200", 30: "98.12",
+    31: "0.03", 32: "", 228: "112.35", 311: "3651234", 290: "2", 691: "0", 567: "000000", 568: "000000",
+}
+
+
+def _trade_template() -> str:
+    # 시각(20)/현재가(10)/체결량(15) 자리만 비워 둔 페이로드 서식 (틱마다 format 1회)
+    slots = {20: "{0:06d}", 10: "+{1}", 15: "+{2}"}
+    return "\t".join(slots.get(fid, _TRADE_FIELDS.get(fid, "")) for fid in REAL_LAYOUTS["주식체결"])
+
+
+class OcxFeedBroker(SimulatedBroker):
+    """틱을 FakeKiwoomOcx 실시간 이벤트로 넣어 KiwoomBroker 디코딩 경로를 거치게 하는 SimulatedBroker
+
+    feed_tick() 이 주식체결 real_data 를 만들어 OnReceiveRealData 로 보내고, 디코딩된 틱이
+    on_price/on_tick 으로 나온다 (ts 는 거래소 시각 기준). 주문/체결은 SimulatedBroker 그대로.
+    """
+
+    def __init__(self, clock: VirtualClock, universe: Optional[List[str]] = None) -> None:
+        super().__init__(clock=clock, universe=universe)
+        self.ocx = FakeKiwoomOcx()
+        self.ocx.record_calls = False
+        # 거래소 시각 -> epoch ms 변환용 자정 캐시가 첫 틱 날짜로 잡히도록 clock 을 먼저 맞춰 둘 것
+        self.kiwoom = KiwoomBroker(ocx=self.ocx, schedule=lambda delay_sec, fn: None, clock=clock)
+        self.kiwoom.on_tick = self._on_decoded_tick
+        self._emit = self.ocx.OnReceiveRealData.emit
+        self._fmt = _trade_template().format
+
+    def feed_tick(self, code: str, price: float, volume: int) -> None:
+        sod = (int(self.clock.time()) + UTC_OFFSET_SEC) % 86400
+        hhmmss = (sod // 3600) * 10000 + (sod % 3600 // 60) * 100 + sod % 60
+        self._emit(code, "주식체결", self._fmt(hhmmss, int(abs(price)), int(volume)))
+
+    def _on_decoded_tick(self, code: str, price: float, volume: int, ts: int) -> None:
+        pos = self._positions.get(code) or Position(symbol=code)
+        pos.last_price = price
+        self._positions[code] = pos
+        if self.on_price:
+            self.on_price(code, price, ts)
+        if self.on_tick:
+            self.on_tick(code, price, volume, ts)
+
+
+def run_load(spec: MarketSpec, cfg: Optional[BotConfig] = None, decode: bool = True) -> Dict[str, float]:
+    # 모든 종목 실시간 등록, 주문은 dry_run (데이터 경로 부하만 측정)
+    cfg = replace(cfg or BotConfig(), realtime_top_n=spec.n_symbols, dry_run=True, metrics_enabled=False)
+    ticks = list(generate(spec))   # 생성 비용은 측정에서 제외
+    universe = symbols_for(spec.n_symbols)
+
+    broker = None
+    if decode:
+        clock = VirtualClock()
+        clock.set(ticks[0][0] if ticks else 0.0)
+        broker = OcxFeedBroker(clock, universe)
+
+    use_tracemalloc = resource is None
+    with tempfile.TemporaryDirectory() as out:
+        runner = ReplayRunner(cfg, universe, out_dir=out, broker=broker)
+        if use_tracemalloc:
+            tracemalloc.start()
+        rss0 = _maxrss_kb()
+        cpu0 = time.process_time()
+        wall0 = time.perf_counter()
+        runner.run(ticks)
+        wall = time.perf_counter() - wall0
+        cpu = time.process_time() - cpu0
+        if use_tracemalloc:
+            mem_kb = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+        else:
+            mem_kb = _maxrss_kb() - rss0
+
+    n = max(1, runner.n_ticks)
+    max_tps = n / wall if wall > 0 else 0.0
+    return {
+        "symbols": spec.n_symbols,
+        "rate": spec.rate,
+        "decode": decode,
+        "duration_sec": spec.duration_sec,
+        "ticks": runner.n_ticks,
+        "bars": len(runner.app.bars_1m),
+        "max_tps": round(max_tps, 1),
+        "cpu_us_per_tick": round(cpu / n * 1e6, 2),
+        "mem_growth_kb": int(mem_kb),
+        "keeps_up": bool(max_tps >= spec.rate),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="realtime tick path load test")
+    ap.add_argument("--symbols", type=int, action="append", help="repeatable (default 80, 200, 2000)")
+    ap.add_argument("--rate", type=float, default=None, help="target ticks/sec (default 5 per symbol)")
+    ap.add_argument("--duration", type=int, default=120, help="virtual seconds")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--record", help="append results to this JSONL")
+    ap.add_argument("--no-decode", action="store_true", help="skip FakeKiwoomOcx real_data decoding")
+    args = ap.parse_args(argv)
+
+    rev = _git_rev()
+    print(f"{'symbols':>8} {'rate':>8} {'ticks':>9} {'max_tps':>10} {'cpu_us/tick':>12} {'mem_kb':>9} {'keeps_up':>9} {'decode':>7}")
+    for n in args.symbols or [80, 200, 2000]:
+        rate = args.rate or 5.0 * n
+        spec = MarketSpec(n_symbols=n, rate=rate, duration_sec=args.duration, seed=args.seed)
+        r = run_load(spec, decode=not args.no_decode)
+        print(f"{r['symbols']:>8} {r['rate']:>8.0f} {r['ticks']:>9} {r['max_tps']:>10.0f} "
+              f"{r['cpu_us_per_tick']:>12.2f} {r['mem_growth_kb']:>9} {str(r['keeps_up']):>9} {str(r['decode']):>7}")
+        if args.record:
+            log_jsonl(args.record, {"rev": rev, **r})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""합성 시장 틱 생성기 (부하 테스트/리플레이용)
+
+- 가격: 종목별 GBM, KRX 호가단위로 반올림
+- 도착: 종목 인기도(Zipf) 비례 포아송, 전체 평균 rate ticks/sec
+- 버스트: 종목별 2-상태(평상/버스트) 마르코프 체인, 버스트 중 도착률/거래량 배수
+- 시가 동시호가: 장 시작 시 종목별 대량 단일 체결 + 첫 1분 도착률 급증 후 감쇠
+
+같은 seed 면 같은 스트림 (numpy Generator).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+Tick = Tuple[float, str, float, int]
+
+
+def krx_tick_size(price: np.ndarray) -> np.ndarray:
+    # 2023 KRX 호가가격단위 (단순화)
+    return np.select(
+        [price < 2_000, price < 5_000, price < 20_000, price < 50_000, price < 200_000, price < 500_000],
+        [1, 5, 10, 50, 100, 500],
+        default=1_000,
+    ).astype(np.float64)
+
+
+@dataclass
+class MarketSpec:
+    n_symbols: int = 80
+    rate: float = 400.0              # 전체 평균 ticks/sec
+    duration_sec: int = 600
+    day: str = "2026-10-16"
+    start: str = "09:00"
+    sigma_daily: float = 0.03        # 일간 변동성
+    zipf_a: float = 1.1
+    burst_on_prob: float = 0.002     # 초당 평상 -> 버스트 전이 확률
+    burst_off_prob: float = 0.05     # 초당 버스트 -> 평상
+    burst_mult: float = 8.0
+    open_spike_mult: float = 6.0     # 장 시작 직후 도착률 배수 (60초 반감)
+    open_auction: bool = True
+    seed: int = 0
+
+
+def symbols_for(n: int) -> List[str]:
+    return [f"{100000 + i:06d}" for i in range(n)]
+
+
+def generate(spec: MarketSpec) -> Iterator[Tick]:
+    """초 단위 청크로 생성해 시간순 (epoch_sec, code, price, volume) 를 yield"""
+    rng = np.random.default_rng(spec.seed)
+    n = int(spec.n_symbols)
+    syms = symbols_for(n)
+    t0 = datetime.strptime(f"{spec.day} {spec.start}", "%Y-%m-%d %H:%M").timestamp()
+
+    pop = 1.0 / np.arange(1, n + 1) ** spec.zipf_a
+    rng.shuffle(pop)
+    base_rate = spec.rate * pop / pop.sum()               # 종목별 ticks/sec
+
+    price = np.exp(rng.uniform(np.log(2_000), np.log(300_000), n))
+    price = np.maximum(krx_tick_size(price), np.round(price / krx_tick_size(price)) * krx_tick_size(price))
+    sigma_sec = spec.sigma_daily / np.sqrt(23_400.0)
+    base_vol = np.maximum(1.0, 3e6 / price)                # 체결당 평균 수량 ~ 300만원어치
+    burst = np.zeros(n, dtype=bool)
+
+    if spec.open_auction:
+        auction_vol = rng.lognormal(np.log(base_vol * 50), 0.5).astype(np.int64) + 1
+        for i in np.argsort(rng.random(n)):
+            yield (t0, syms[i], float(price[i]), int(auction_vol[i]))
+
+    for sec in range(int(spec.duration_sec)):
+        flip = rng.random(n)
+        burst = np.where(burst, flip >= spec.burst_off_prob, flip < spec.burst_on_prob)
+        spike = 1.0 + (spec.open_spike_mult - 1.0) * 0.5 ** (sec / 60.0)
+        lam = base_rate * spike * np.where(burst, spec.burst_mult, 1.0)
+        counts = rng.poisson(lam)
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        sid = np.repeat(np.arange(n), counts)
+        ts = t0 + sec + rng.random(total)
+        order = np.argsort(ts, kind="stable")
+        sid = sid[order]
+        ts = ts[order]
+
+        # 틱마다 GBM 한 스텝 (dt = 종목 평균 도착 간격)
+        dt = 1.0 / np.maximum(lam[sid], 1e-9)
+        z = rng.standard_normal(total)
+        step = np.exp(-0.5 * sigma_sec ** 2 * dt + sigma_sec * np.sqrt(dt) * z)
+        px = np.empty(total)
+        # 같은 종목 내 누적: 종목별 누적곱 (sid 정렬 후 그룹 cumprod)
+        by_sym = np.argsort(sid, kind="stable")
+        s_sorted = sid[by_sym]
+        logstep = np.log(step[by_sym])
+        cum = np.cumsum(logstep)
+        starts = np.r_[0, np.flatnonzero(np.diff(s_sorted)) + 1]
+        grp_off = np.repeat(cum[starts] - logstep[starts], np.diff(np.r_[starts, total]))
+        raw = price[s_sorted] * np.exp(cum - grp_off)
+        tick = krx_tick_size(raw)
+        px[by_sym] = np.maximum(tick, np.round(raw / tick) * tick)
+        last_idx = np.r_[starts[1:] - 1, total - 1]
+        price[s_sorted[last_idx]] = px[by_sym][last_idx]
+
+        vol = rng.lognormal(np.log(base_vol[sid]), 1.0) * np.where(burst[sid], spec.burst_mult / 2, 1.0)
+        vol = vol.astype(np.int64) + 1
+
+        for t, i, p, v in zip(ts.tolist(), sid.tolist(), px.tolist(), vol.tolist()):
+            yield (t, syms[i], p, v)
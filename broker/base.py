@@ -1,15 +1,23 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Callable, Optional, Dict
+from typing import TYPE_CHECKING, Callable, Optional, Dict
 
 from core.types import Order, Position
 
+if TYPE_CHECKING:
+    from broker.kiwoom_chejan import ChejanEvent
+
 
 class BrokerBase(ABC):
     def __init__(self) -> None:
         # optional callbacks
-        self.on_price: Optional[Callable[[str, float, str], None]] = None
+        # (code, price, ts_ms) - ts_ms 는 체결 시각 epoch ms 정수
+        self.on_price: Optional[Callable[[str, float, int], None]] = None
         self.on_fill: Optional[Callable[[str, int, float], None]] = None
+        # 주문/체결/잔고 이벤트 (side 포함). 체결 반영은 이 콜백 기준
+        self.on_chejan: Optional[Callable[["ChejanEvent"], None]] = None
+        # 실시간 조건검색 편입/이탈 (code, inserted, condition_name)
+        self.on_condition: Optional[Callable[[str, bool, str], None]] = None
 
     @abstractmethod
     def connect_and_login(self) -> None:
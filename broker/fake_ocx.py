@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from broker.kiwoom_real import encode_real_data
+
+
+class FakeSignal:
+    """QAxWidget 이벤트 시그널 흉내 (connect/emit)"""
+
+    def __init__(self) -> None:
+        self._slots: List[Callable[..., Any]] = []
+
+    def connect(self, slot: Callable[..., Any]) -> None:
+        self._slots.append(slot)
+
+    def emit(self, *args: Any) -> None:
+        for s in list(self._slots):
+            s(*args)
+
+
+_CALL_RE = re.compile(r"^\s*(\w+)\s*\(")
+
+
+class FakeKiwoomOcx:
+    """KHOpenAPI OCX 대역 (Linux 테스트/벤치용)
+
+    dynamicCall("Method(...)", *args) 를 같은 이름의 _m_<Method> 로 보낸다.
+    push_real() 은 실제 OCX 처럼 real_data 페이로드를 만들고 OnReceiveRealData 를 발생시키며,
+    이후 GetCommRealData 는 그 값으로 응답한다. 모르는 메서드는 "" 를 돌려준다.
+
+    TR/조건검색 응답은 실제처럼 호출 뒤에 온다: 응답 이벤트를 pending 에 쌓고 deliver() 로 발생.
+    auto_respond=True 면 호출 안에서 바로 발생. TR 응답 행은 tr_pages[trcode] = [page1_rows, ...]
+    (행은 {항목명: 값}), 조건검색 결과는 conditions / condition_codes 로 지정한다.
+    """
+
+    def __init__(self, account: str = "8000000011") -> None:
+        self.OnEventConnect = FakeSignal()
+        self.OnReceiveTrData = FakeSignal()
+        self.OnReceiveChejanData = FakeSignal()
+        self.OnReceiveRealData = FakeSignal()
+        self.OnReceiveConditionVer = FakeSignal()
+        self.OnReceiveTrCondition = FakeSignal()
+        self.OnReceiveRealCondition = FakeSignal()
+        self.OnReceiveMsg = FakeSignal()
+
+        self.account = account
+        self.calls: List[Tuple[str, tuple]] = []
+        self.record_calls = True
+        self._real: Dict[str, Dict[int, str]] = {}
+        self._chejan: Dict[int, str] = {}
+        self.real_reg: Dict[str, Dict[str, str]] = {}   # screen -> code -> fid_list
+
+        self.auto_respond = False
+        self.pending: List[Callable[[], None]] = []
+        self.comm_rq_ret = 0
+        self.tr_pages: Dict[str, List[List[Dict[str, str]]]] = {}
+        self.tr_requests: List[Tuple[str, str, int, str]] = []   # (rqname, trcode, prev_next, screen)
+        self._tr_inputs: Dict[str, str] = {}
+        self._tr_page: Dict[str, int] = {}
+        self._tr_rows: List[Dict[str, str]] = []
+        self.conditions: Dict[int, str] = {}
+        self.condition_codes: Dict[str, List[str]] = {}
+
+    # ------------------ dispatch ------------------
+    def dynamicCall(self, sig: str, *args: Any) -> Any:
+        m = _CALL_RE.match(sig)
+        name = m.group(1) if m else sig
+        if len(args) == 1 and isinstance(args[0], list):
+            args = tuple(args[0])
+        if self.record_calls:
+            self.calls.append((name, args))
+        fn = getattr(self, f"_m_{name}", None)
+        return fn(*args) if fn else ""
+
+    # ------------------ drive events ------------------
+    def push_real(self, code: str, real_type: str, values: Dict[int, Any]) -> None:
+        sv = {int(k): str(v) for k, v in values.items()}
+        self._real[code] = sv
+        self.OnReceiveRealData.emit(code, real_type, encode_real_data(real_type, sv))
+
+    def push_chejan(self, gubun: str, values: Dict[int, Any]) -> None:
+        self._chejan = {int(k): str(v) for k, v in values.items()}
+        fids = ";".join(str(k) for k in self._chejan)
+        self.OnReceiveChejanData.emit(gubun, len(self._chejan), fids)
+
+    def push_real_condition(self, code: str, inserted: bool, name: str, index: int = 0) -> None:
+        self.OnReceiveRealCondition.emit(code, "I" if inserted else "D", name, str(index))
+
+    def _later(self, fn: Callable[[], None]) -> None:
+        if self.auto_respond:
+            fn()
+        else:
+            self.pending.append(fn)
+
+    def deliver(self, n: Optional[int] = None) -> int:
+        """쌓인 TR/조건검색 응답 이벤트를 순서대로 발생. 발생시킨 개수를 돌려준다"""
+        done = 0
+        while self.pending and (n is None or done < n):
+            self.pending.pop(0)()
+            done += 1
+        return done
+
+    # ------------------ OCX methods ------------------
+    def _m_CommConnect(self) -> int:
+        self.OnEventConnect.emit(0)
+        return 0
+
+    def _m_GetLoginInfo(self, tag: str) -> str:
+        return f"{self.account};" if tag == "ACCNO" else ""
+
+    def _m_GetCommRealData(self, code: str, fid: int) -> str:
+        return self._real.get(code, {}).get(int(fid), "")
+
+    def _m_GetChejanData(self, fid: int) -> str:
+        return self._chejan.get(int(fid), "")
+
+    def _m_SetRealReg(self, screen: str, codes: str, fids: str, opt: str) -> int:
+        reg = self.real_reg.setdefault(str(screen), {})
+        if str(opt) == "0":
+            reg.clear()
+        for c in str(codes).split(";"):
+            if c:
+                reg[c] = fids
+        return 0
+
+    def _m_SetRealRemove(self, screen: str, code: str) -> None:
+        screens = list(self.real_reg) if screen == "ALL" else [str(screen)]
+        for s in screens:
+            reg = self.real_reg.get(s, {})
+            if code == "ALL":
+                reg.clear()
+            else:
+                reg.pop(code, None)
+
+    def _m_SendOrder(self, *args: Any) -> int:
+        return 0
+
+    def _m_SetInputValue(self, key: str, value: str) -> None:
+        self._tr_inputs[str(key)] = str(value)
+
+    def _m_CommRqData(self, rqname: str, trcode: str, prev_next: int, screen: str) -> int:
+        self.tr_requests.append((rqname, trcode, int(prev_next), screen))
+        if self.comm_rq_ret != 0:
+            return self.comm_rq_ret
+        page = self._tr_page.get(rqname, 0) + 1 if int(prev_next) == 2 else 0
+        self._tr_page[rqname] = page
+        pages = self.tr_pages.get(trcode, [])
+        rows = pages[page] if page < len(pages) else []
+        more = "2" if page + 1 < len(pages) else "0"
+
+        def _emit() -> None:
+            self._tr_rows = rows
+            self.OnReceiveTrData.emit(screen, rqname, trcode, "", more, 0, "", "", "")
+
+        self._later(_emit)
+        return 0
+
+    def _m_GetRepeatCnt(self, trcode: str, rqname: str) -> int:
+        return len(self._tr_rows)
+
+    def _m_GetCommData(self, trcode: str, rqname: str, idx: int, item: str) -> str:
+        rows = self._tr_rows
+        return str(rows[idx].get(item, "")) if 0 <= int(idx) < len(rows) else ""
+
+    def _m_GetConditionLoad(self) -> int:
+        self._later(lambda: self.OnReceiveConditionVer.emit(1, ""))
+        return 1
+
+    def _m_GetConditionNameList(self) -> str:
+        return "".join(f"{i}^{nm};" for i, nm in sorted(self.conditions.items()))
+
+    def _m_SendCondition(self, screen: str, name: str, index: int, search: int) -> int:
+        codes = self.condition_codes.get(name, [])
+        self._later(lambda: self.OnReceiveTrCondition.emit(screen, "".join(f"{c};" for c in codes), name, int(index), 0))
+        return 1
+
+    def registered_codes(self) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        for screen, reg in self.real_reg.items():
+            for c in reg:
+                out[c] = screen
+        return out
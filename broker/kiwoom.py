@@ -1,21 +1,47 @@
 from __future__ import annotations
 
+import math
 import time
-from datetime import datetime
-from typing import Dict, Optional, Any, List
-
-from PyQt5.QtCore import QEventLoop
-from PyQt5.QAxContainer import QAxWidget
+from concurrent.futures import Future
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Any, List, Tuple
 
 from broker.base import BrokerBase
+from broker.kiwoom_chejan import GUBUN_BALANCE, ChejanEvent, decode_chejan
+from broker.kiwoom_real import RealDataDecoder, RealTick
+from broker.kiwoom_subs import SubscriptionManager
+from broker.tr_scheduler import PRIO_HIGH, PRIO_LOW, PRIO_NORMAL, TrScheduler, chain, completed
+from core.clock import UTC_OFFSET_SEC, WALL_CLOCK, Clock
+from core.metrics import METRICS
 from core.types import Order, Side, OrderType, Position
 
+if TYPE_CHECKING:
+    from PyQt5.QtCore import QEventLoop
+
+_COND_LOAD = "COND_LOAD"
+
+
+def _dedup_codes(raw: List[str]) -> List[str]:
+    out: List[str] = []
+    seen = set()
+    for c in raw:
+        c = c.replace("A", "").strip()
+        if c and c not in seen:
+            seen.add(c)
+            out.append(c)
+    return out
+
 
 class KiwoomBroker(BrokerBase):
-    def __init__(self) -> None:
+    def __init__(self, ocx=None, schedule=None, clock: Optional[Clock] = None) -> None:
         super().__init__()
 
-        self.ocx = QAxWidget("KHOPENAPI.KHOpenAPICtrl.1")
+        # ocx/schedule 주입 가능 (broker.fake_ocx.FakeKiwoomOcx + 가상 타이머 등)
+        # PyQt5 는 실제 OCX/QTimer/QEventLoop 를 쓸 때만 import (주입 시 Qt 없이 동작)
+        if ocx is None:
+            from PyQt5.QAxContainer import QAxWidget
+            ocx = QAxWidget("KHOPENAPI.KHOpenAPICtrl.1")
+        self.ocx = ocx
 
         self.ocx.OnEventConnect.connect(self._on_event_connect)
         self.ocx.OnReceiveTrData.connect(self._on_receive_tr_data)
@@ -25,23 +51,31 @@ class KiwoomBroker(BrokerBase):
         # 조건검색 이벤트
         self.ocx.OnReceiveConditionVer.connect(self._on_receive_condition_ver)
         self.ocx.OnReceiveTrCondition.connect(self._on_receive_tr_condition)
+        self.ocx.OnReceiveRealCondition.connect(self._on_receive_real_condition)
 
         self._login_loop: Optional[QEventLoop] = None
-        self._tr_loop: Optional[QEventLoop] = None
-        self._cond_loop: Optional[QEventLoop] = None
 
         self._account_no: Optional[str] = None
         self._positions: Dict[str, Position] = {}
         self._day_pnl_ratio_forced: float = 0.0
 
-        # on_tick callback (symbol, price, vol, ts)
+        # on_tick callback (symbol, price, vol, ts_ms)
         self.on_tick = None
+        # on_real callback (RealTick) - 호가/체결강도 등 전체 레코드가 필요한 소비자용
+        self.on_real = None
+
+        # 실시간 등록 (현재가, 거래량) - 화면 분산 + diff
+        self.subs = SubscriptionManager(self._set_real_reg, self._set_real_remove, fid_list="10;15")
 
-        # open orders: order_no -> dict
-        self._open_orders: Dict[str, Dict[str, Any]] = {}
+        # real_data 단일 패스 디코더 + 거래소 시각(HHMMSS)에 더할 로컬 자정 epoch ms 캐시
+        self._real_decoder = RealDataDecoder()
+        self.clock = clock or WALL_CLOCK
+        self._midnight_ms = self._local_midnight_ms()
+        self._last_exch_time = 0
 
-        # TR result store
-        self._tr_store: Dict[str, Any] = {}
+        # TR/조건검색 스케줄러 (조회 제한 + Future). rqname -> 응답 파서
+        self.tr = TrScheduler(schedule or self._schedule, clock=clock)
+        self._tr_parsers: Dict[str, Callable[[str, str], List[Any]]] = {}
 
         # conditions
         self._conditions: Dict[int, str] = {}
@@ -49,6 +83,8 @@ class KiwoomBroker(BrokerBase):
 
     # ------------------ login ------------------
     def connect_and_login(self) -> None:
+        from PyQt5.QtCore import QEventLoop
+
         self.ocx.dynamicCall("CommConnect()")
         self._login_loop = QEventLoop()
         self._login_loop.exec_()
@@ -78,11 +114,15 @@ class KiwoomBroker(BrokerBase):
         return float(self._day_pnl_ratio_forced)
 
     # ------------------ realtime subscribe ------------------
-    def subscribe_realtime(self, codes: list[str]) -> None:
-        screen = "0202"
-        code_list = ";".join(codes)
-        fid_list = "10;15"  # 현재가, 거래량
-        self.ocx.dynamicCall("SetRealReg(QString, QString, QString, QString)", screen, code_list, fid_list, "0")
+    def subscribe_realtime(self, codes: list[str]) -> Tuple[List[str], List[str]]:
+        # 화면 0202~ 에 100종목씩 분산, 변경분만 SetRealReg("1") / SetRealRemove. (added, removed)
+        return self.subs.sync(codes)
+
+    def _set_real_reg(self, screen: str, codes: str, fids: str, opt: str) -> int:
+        return int(self.ocx.dynamicCall("SetRealReg(QString, QString, QString, QString)", screen, codes, fids, opt) or 0)
+
+    def _set_real_remove(self, screen: str, code: str) -> None:
+        self.ocx.dynamicCall("SetRealRemove(QString, QString)", screen, code)
 
     # ------------------ order ------------------
     def place_order(self, order: Order) -> None:
@@ -106,12 +146,6 @@ class KiwoomBroker(BrokerBase):
         if int(ret) != 0:
             raise RuntimeError(f"SendOrder failed ret={ret}")
 
-    def get_open_orders(self) -> Dict[str, Dict[str, Any]]:
-        dead = [ono for ono, o in self._open_orders.items() if int(o.get("unfilled", 0)) <= 0]
-        for ono in dead:
-            self._open_orders.pop(ono, None)
-        return dict(self._open_orders)
-
     def _send_order_raw(
         self,
         rqname: str,
@@ -140,13 +174,35 @@ class KiwoomBroker(BrokerBase):
         self._send_order_raw("MODIFY_MKT", order_type, code, qty, 0, "03", org_order_no=order_no)
 
     # ------------------ TR helpers ------------------
+    def _schedule(self, delay_sec: float, fn) -> None:
+        from PyQt5.QtCore import QTimer
+
+        QTimer.singleShot(max(0, math.ceil(delay_sec * 1000)), fn)
+
     def _set_input(self, key: str, value: str) -> None:
         self.ocx.dynamicCall("SetInputValue(QString, QString)", key, value)
 
-    def _comm_rq_data(self, rqname: str, trcode: str, prev_next: int, screen: str) -> None:
-        self._tr_loop = QEventLoop()
-        self.ocx.dynamicCall("CommRqData(QString, QString, int, QString)", rqname, trcode, prev_next, screen)
-        self._tr_loop.exec_()
+    def request_tr(
+        self,
+        rqname: str,
+        trcode: str,
+        screen: str,
+        inputs: Dict[str, str],
+        parse: Callable[[str, str], List[Any]],
+        priority: int = PRIO_NORMAL,
+        max_pages: int = 1,
+    ) -> Future:
+        """TR 조회를 스케줄러에 넣고 Future(rows) 를 돌려준다. 연속조회는 max_pages 까지 이어 붙임"""
+        self._tr_parsers[rqname] = parse
+
+        def _send(prev_next: int) -> None:
+            for k, v in inputs.items():
+                self._set_input(k, v)
+            ret = int(self.ocx.dynamicCall("CommRqData(QString, QString, int, QString)", rqname, trcode, prev_next, screen))
+            if ret != 0:
+                raise RuntimeError(f"CommRqData failed rqname={rqname} ret={ret}")
+
+        return self.tr.submit(rqname, screen, _send, priority=priority, max_pages=max_pages)
 
     def _get_comm_data(self, trcode: str, rqname: str, idx: int, item: str) -> str:
         v = self.ocx.dynamicCall("GetCommData(QString, QString, int, QString)", trcode, rqname, idx, item)
@@ -159,87 +215,139 @@ class KiwoomBroker(BrokerBase):
             return 0
 
     # ------------------ opt10075 미체결요청 (2중 검증) ------------------
-    def sync_open_orders_tr(self) -> Dict[str, Dict[str, Any]]:
+    def request_open_orders(self, priority: int = PRIO_NORMAL) -> Future:
+        """opt10075 미체결 조회. Future 결과는 행 리스트 (OrderBook.merge_tr 로 병합)"""
         acc = self.get_account_no()
+        return self.request_tr(
+            "OPT10075_REQ", "opt10075", "5075",
+            {"계좌번호": acc, "전체종목구분": "0", "매매구분": "0", "체결구분": "1"},  # 체결구분 1: 미체결
+            self._parse_opt10075,
+            priority=priority,
+            max_pages=10,
+        )
 
-        rqname = "OPT10075_REQ"
-        trcode = "opt10075"
-        screen = "5075"
+    def _parse_opt10075(self, trcode: str, rqname: str) -> List[Dict[str, Any]]:
+        def _to_int(x: str) -> int:
+            try:
+                return int(str(x).strip())
+            except Exception:
+                return 0
 
-        self._tr_store.pop(rqname, None)
+        out: List[Dict[str, Any]] = []
+        cnt = self._get_repeat_cnt(trcode, rqname)
+        for i in range(cnt):
+            order_no = self._get_comm_data(trcode, rqname, i, "주문번호")
+            code = self._get_comm_data(trcode, rqname, i, "종목코드").replace("A", "").strip()
+            status = self._get_comm_data(trcode, rqname, i, "주문상태")
+            gubun = self._get_comm_data(trcode, rqname, i, "주문구분")
+            unfilled = self._get_comm_data(trcode, rqname, i, "미체결수량")
+            oqty = self._get_comm_data(trcode, rqname, i, "주문수량")
+
+            side: Optional[Side] = None
+            if "매수" in gubun:
+                side = Side.BUY
+            elif "매도" in gubun:
+                side = Side.SELL
+
+            out.append({
+                "order_no": order_no.strip(),
+                "code": code,
+                "status": status.strip(),
+                "side": side,
+                "unfilled": abs(_to_int(unfilled)),
+                "order_qty": abs(_to_int(oqty)),
+            })
+        return out
 
-        self._set_input("계좌번호", acc)
-        self._set_input("전체종목구분", "0")
-        self._set_input("매매구분", "0")
-        self._set_input("체결구분", "1")  # 미체결
-        self._comm_rq_data(rqname, trcode, 0, screen)
+    def request_minute_bars(self, code: str, tick_range: int = 1, priority: int = PRIO_LOW) -> Future:
+        """opt10080 분봉 조회 (1페이지 = 최근 900개). Future 결과는 오래된 것 -> 최신 순 바 dict 리스트
 
-        rows: List[Dict[str, Any]] = self._tr_store.get(rqname, [])
-        new_open: Dict[str, Dict[str, Any]] = {}
-        for r in rows:
-            ono = r.get("order_no", "")
-            if not ono:
-                continue
-            unfilled = int(r.get("unfilled", 0))
-            if unfilled <= 0:
+        종목마다 rqname 이 달라 여러 종목을 한꺼번에 넣어도 스케줄러가 조회 제한에 맞춰 차례로 보낸다.
+        """
+        return self.request_tr(
+            f"OPT10080_{code}", "opt10080", "5080",
+            {"종목코드": code, "틱범위": str(int(tick_range)), "수정주가구분": "1"},
+            self._parse_opt10080,
+            priority=priority,
+        )
+
+    def _parse_opt10080(self, trcode: str, rqname: str) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        cnt = self._get_repeat_cnt(trcode, rqname)
+        for i in range(cnt):
+            t = self._get_comm_data(trcode, rqname, i, "체결시간")   # YYYYMMDDHHMMSS
+            try:
+                ts = int(time.mktime((int(t[:4]), int(t[4:6]), int(t[6:8]), int(t[8:10]), int(t[10:12]), 0, 0, 0, -1)))
+                row = {
+                    "ts": ts,
+                    "open": abs(float(self._get_comm_data(trcode, rqname, i, "시가"))),
+                    "high": abs(float(self._get_comm_data(trcode, rqname, i, "고가"))),
+                    "low": abs(float(self._get_comm_data(trcode, rqname, i, "저가"))),
+                    "close": abs(float(self._get_comm_data(trcode, rqname, i, "현재가"))),
+                    "volume": abs(float(self._get_comm_data(trcode, rqname, i, "거래량"))),
+                }
+            except (ValueError, IndexError):
                 continue
-            new_open[ono] = {
-                "code": r.get("code", ""),
-                "side": r.get("side", None),
-                "status": r.get("status", ""),
-                "unfilled": unfilled,
-                "order_qty": int(r.get("order_qty", 0)),
-                "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "src": "TR",
-            }
-
-        if new_open:
-            self._open_orders = new_open
-        else:
-            self._open_orders = {k: v for k, v in self._open_orders.items() if int(v.get("unfilled", 0)) > 0}
-        return dict(self._open_orders)
+            out.append(row)
+        out.reverse()   # 응답은 최신 -> 과거
+        return out
 
     # ------------------ 조건검색 ------------------
-    def load_conditions(self) -> Dict[int, str]:
-        self._conditions = {}
-        ok = int(self.ocx.dynamicCall("GetConditionLoad()"))
-        if ok != 1:
-            raise RuntimeError("GetConditionLoad() 실패. HTS 조건식 저장/로그인 상태 확인 필요")
-        self._cond_loop = QEventLoop()
-        self._cond_loop.exec_()
-        return dict(self._conditions)
-
-    def run_condition(self, condition_name: str, screen: str = "0900") -> List[str]:
-        if not self._conditions:
-            self.load_conditions()
-
-        cond_index = None
-        for idx, nm in self._conditions.items():
-            if nm == condition_name:
-                cond_index = idx
-                break
-        if cond_index is None:
-            raise RuntimeError(f"조건식 '{condition_name}' 을(를) 찾지 못함. HTS 조건식 이름 확인 필요")
-
-        self._last_condition_codes = []
-
-        ret = int(self.ocx.dynamicCall(
-            "SendCondition(QString, QString, int, int)",
-            screen, condition_name, int(cond_index), 0
-        ))
-        if ret != 1:
-            raise RuntimeError("SendCondition() 실패")
-
-        self._cond_loop = QEventLoop()
-        self._cond_loop.exec_()
-
-        codes = [c.replace("A", "").strip() for c in self._last_condition_codes if c.strip()]
-        seen = set()
-        out = []
-        for c in codes:
-            if c not in seen:
-                seen.add(c)
-                out.append(c)
+    def request_conditions(self) -> Future:
+        """GetConditionLoad -> OnReceiveConditionVer. Future 결과는 {index: name}"""
+        if self._conditions:
+            return completed(dict(self._conditions))
+
+        def _send(prev_next: int) -> None:
+            if int(self.ocx.dynamicCall("GetConditionLoad()")) != 1:
+                raise RuntimeError("GetConditionLoad() 실패. HTS 조건식 저장/로그인 상태 확인 필요")
+
+        fut = self.tr.submit(_COND_LOAD, "", _send, priority=PRIO_HIGH)
+        return chain(fut, lambda rows: dict(self._conditions))
+
+    def request_condition(
+        self, condition_name: str, screen: str = "0900", priority: int = PRIO_NORMAL, realtime: bool = False
+    ) -> Future:
+        """조건검색 (SendCondition). Future 결과는 중복 제거된 종목코드 리스트
+
+        realtime=True 면 search type 1: 초기 목록 이후 편입/이탈이 on_condition 으로 온다.
+        """
+        out: Future = Future()
+
+        def _submit(conds: Dict[int, str]) -> None:
+            cond_index = None
+            for idx, nm in conds.items():
+                if nm == condition_name:
+                    cond_index = idx
+                    break
+            if cond_index is None:
+                raise RuntimeError(f"조건식 '{condition_name}' 을(를) 찾지 못함. HTS 조건식 이름 확인 필요")
+
+            def _send(prev_next: int) -> None:
+                ret = int(self.ocx.dynamicCall(
+                    "SendCondition(QString, QString, int, int)",
+                    screen, condition_name, int(cond_index), 1 if realtime else 0
+                ))
+                if ret != 1:
+                    raise RuntimeError("SendCondition() 실패")
+
+            fut = self.tr.submit(condition_name, screen, _send, priority=priority)
+            fut.add_done_callback(lambda f: _forward(f, _dedup_codes))
+
+        def _forward(f: Future, fn) -> None:
+            exc = f.exception()
+            if exc is not None:
+                out.set_exception(exc)
+                return
+            try:
+                v = fn(f.result())
+            except Exception as e:
+                out.set_exception(e)
+                return
+            if v is not None:   # _submit 은 None: 조건검색 응답에서 out 완료
+                out.set_result(v)
+
+        self.request_conditions().add_done_callback(lambda f: _forward(f, _submit))
         return out
 
     # ------------------ events ------------------
@@ -250,43 +358,15 @@ class KiwoomBroker(BrokerBase):
             raise RuntimeError(f"Kiwoom login failed err_code={err_code}")
 
     def _on_receive_tr_data(self, screen_no, rqname, trcode, recordname, prev_next, data_len, err_code, msg1, msg2):
-        if str(rqname).strip() == "OPT10075_REQ" and str(trcode).strip() == "opt10075":
-            out: List[Dict[str, Any]] = []
-            cnt = self._get_repeat_cnt(trcode, rqname)
-
-            for i in range(cnt):
-                order_no = self._get_comm_data(trcode, rqname, i, "주문번호")
-                code = self._get_comm_data(trcode, rqname, i, "종목코드").replace("A", "").strip()
-                status = self._get_comm_data(trcode, rqname, i, "주문상태")
-                gubun = self._get_comm_data(trcode, rqname, i, "주문구분")
-                unfilled = self._get_comm_data(trcode, rqname, i, "미체결수량")
-                oqty = self._get_comm_data(trcode, rqname, i, "주문수량")
-
-                def _to_int(x: str) -> int:
-                    try:
-                        return int(str(x).strip())
-                    except Exception:
-                        return 0
-
-                side: Optional[Side] = None
-                if "매수" in gubun:
-                    side = Side.BUY
-                elif "매도" in gubun:
-                    side = Side.SELL
-
-                out.append({
-                    "order_no": order_no.strip(),
-                    "code": code,
-                    "status": status.strip(),
-                    "side": side,
-                    "unfilled": abs(_to_int(unfilled)),
-                    "order_qty": abs(_to_int(oqty)),
-                })
-
-            self._tr_store[rqname] = out
-
-        if self._tr_loop:
-            self._tr_loop.exit()
+        rqname = str(rqname).strip()
+        trcode = str(trcode).strip()
+        parse = self._tr_parsers.get(rqname)
+        try:
+            rows = parse(trcode, rqname) if parse else []
+        except Exception as e:
+            self.tr.fail(rqname, screen_no, e)
+            return
+        self.tr.on_response(rqname, screen_no, rows, has_next=str(prev_next).strip() == "2")
 
     def _on_receive_condition_ver(self, ret, msg):
         raw = self.ocx.dynamicCall("GetConditionNameList()")
@@ -299,96 +379,109 @@ class KiwoomBroker(BrokerBase):
             except Exception:
                 continue
         self._conditions = conds
-        if self._cond_loop:
-            self._cond_loop.exit()
+        self.tr.on_response(_COND_LOAD, "")
 
     def _on_receive_tr_condition(self, screen_no, code_list, condition_name, condition_index, next):
         codes = [c for c in str(code_list).split(";") if c.strip()]
         self._last_condition_codes = codes
-        if self._cond_loop:
-            self._cond_loop.exit()
+        self.tr.on_response(condition_name, screen_no, codes)
 
-    def _on_receive_chejan_data(self, gubun, item_cnt, fid_list):
-        def _to_int_safe(x: str) -> int:
-            try:
-                return int(str(x).strip())
-            except Exception:
-                return 0
+    def _on_receive_real_condition(self, code, event_type, condition_name, condition_index):
+        code = str(code).replace("A", "").strip()
+        if code and self.on_condition:
+            self.on_condition(code, str(event_type).strip() == "I", str(condition_name))
 
-        code = self.ocx.dynamicCall("GetChejanData(int)", 9001).strip().replace("A", "").strip()
-        if not code:
+    def _on_receive_chejan_data(self, gubun, item_cnt, fid_list):
+        ev = decode_chejan(gubun, self._get_chejan)
+        if ev is None:
             return
+        if ev.gubun == GUBUN_BALANCE:
+            self._apply_balance(ev)
+        else:
+            self._apply_order(ev)
+        if self.on_chejan:
+            self.on_chejan(ev)
+        if ev.is_fill and self.on_fill:
+            self.on_fill(ev.code, ev.fill_qty, float(ev.fill_price))
+
+    def _get_chejan(self, fid: int) -> str:
+        return self.ocx.dynamicCall("GetChejanData(int)", fid)
+
+    def _apply_order(self, ev: ChejanEvent) -> None:
+        # gubun 0: 체결 시 현재가 갱신 (주문 상태는 core.order_book.OrderBook 이 on_chejan 으로 관리)
+        if ev.is_fill:
+            pos = self._positions.get(ev.code)
+            if pos is not None:
+                pos.last_price = float(ev.fill_price)
+
+    def _apply_balance(self, ev: ChejanEvent) -> None:
+        # gubun 1: 보유수량/매입단가는 잔고 이벤트가 기준값
+        pos = self._positions.get(ev.code) or Position(symbol=ev.code)
+        pos.qty = ev.holding_qty
+        pos.avg_price = float(ev.avg_price) if ev.holding_qty > 0 else 0.0
+        if ev.cur_price > 0:
+            pos.last_price = float(ev.cur_price)
+        self._positions[ev.code] = pos
+
+    def _decode_real_fallback(self, code: str, real_type: str) -> Optional[RealTick]:
+        # 레이아웃과 필드 수가 안 맞을 때만: FID 별 COM 호출 (기존 방식)
+        cur = str(self.ocx.dynamicCall("GetCommRealData(QString, int)", code, 10)).strip()
+        if not cur:
+            return None
+        vol = str(self.ocx.dynamicCall("GetCommRealData(QString, int)", code, 15)).strip()
+        rec = RealTick(code, real_type)
+        try:
+            rec.price = abs(int(cur))
+            rec.volume = int(vol) if vol else 0
+        except Exception:
+            return None
+        sod = (self.clock.time_ms() // 1000 + UTC_OFFSET_SEC) % 86400
+        rec.exch_time = (sod // 3600) * 10000 + (sod % 3600 // 60) * 100 + sod % 60
+        return rec
 
-        order_no = self.ocx.dynamicCall("GetChejanData(int)", 9203).strip()
-        order_status = self.ocx.dynamicCall("GetChejanData(int)", 913).strip()
-        order_gubun = self.ocx.dynamicCall("GetChejanData(int)", 905).strip()
-        unfilled_raw = self.ocx.dynamicCall("GetChejanData(int)", 902).strip()
-        order_qty_raw = self.ocx.dynamicCall("GetChejanData(int)", 900).strip()
-
-        unfilled = abs(_to_int_safe(unfilled_raw))
-        oqty = abs(_to_int_safe(order_qty_raw))
-
-        side: Optional[Side] = None
-        if "매수" in order_gubun:
-            side = Side.BUY
-        elif "매도" in order_gubun:
-            side = Side.SELL
-
-        if order_no:
-            if unfilled > 0:
-                self._open_orders[order_no] = {
-                    "code": code,
-                    "side": side,
-                    "status": order_status,
-                    "unfilled": unfilled,
-                    "order_qty": oqty,
-                    "ts": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "src": "CHEJAN",
-                }
-            else:
-                self._open_orders.pop(order_no, None)
-
-        holding_qty = abs(_to_int_safe(self.ocx.dynamicCall("GetChejanData(int)", 930).strip()))
-        avg_price = abs(_to_int_safe(self.ocx.dynamicCall("GetChejanData(int)", 931).strip()))
-        cur_price = abs(_to_int_safe(self.ocx.dynamicCall("GetChejanData(int)", 10).strip()))
-
-        pos = self._positions.get(code) or Position(symbol=code)
-        if holding_qty > 0:
-            pos.qty = holding_qty
-        if avg_price > 0:
-            pos.avg_price = float(avg_price)
-        if cur_price > 0:
-            pos.last_price = float(cur_price)
-
-        if pos.qty <= 0:
-            pos.qty = 0
-            pos.avg_price = 0.0
+    def _local_midnight_ms(self) -> int:
+        t = self.clock.time_ms() // 1000
+        return (t - (t + UTC_OFFSET_SEC) % 86400) * 1000
 
-        self._positions[code] = pos
+    def _exch_ms(self, hhmmss: int) -> int:
+        # 거래소 HHMMSS -> epoch ms (정수 연산만)
+        if not hhmmss:
+            return self.clock.time_ms()
+        return self._midnight_ms + ((hhmmss // 10000) * 3600 + (hhmmss // 100 % 100) * 60 + hhmmss % 100) * 1000
 
     def _on_receive_real_data(self, code, real_type, real_data):
-        cur = self.ocx.dynamicCall("GetCommRealData(QString, int)", code, 10)
-        vol = self.ocx.dynamicCall("GetCommRealData(QString, int)", code, 15)
-        if not str(cur).strip():
+        t0 = perf_counter_ns()
+        rec = self._real_decoder.decode(code, real_type, real_data)
+        if rec is None:
+            if not self._real_decoder.knows(real_type):
+                return
+            rec = self._decode_real_fallback(code, real_type)
+            if rec is None:
+                return
+
+        if rec.exch_time < self._last_exch_time:
+            # 자정 넘김 (또는 새 세션) - 날짜 캐시 갱신
+            self._midnight_ms = self._local_midnight_ms()
+        if rec.exch_time:
+            self._last_exch_time = rec.exch_time
+
+        if self.on_real:
+            self.on_real(rec)
+
+        price = rec.price
+        if price <= 0:
+            # 호가잔량 등 체결이 아닌 이벤트
+            METRICS.record("decode", perf_counter_ns() - t0)
             return
 
-        try:
-            price = abs(int(str(cur).strip()))
-        except Exception:
-            return
-
-        try:
-            volume = abs(int(str(vol).strip())) if str(vol).strip() else 0
-        except Exception:
-            volume = 0
-
         pos = self._positions.get(code) or Position(symbol=code)
         pos.last_price = float(price)
         self._positions[code] = pos
+        ts = self._exch_ms(rec.exch_time)
+        METRICS.record("decode", perf_counter_ns() - t0)
 
         if self.on_price:
-            self.on_price(code, float(price), time.strftime("%H:%M:%S"))
+            self.on_price(code, float(price), ts)
 
-        if getattr(self, "on_tick", None):
-            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.on_tick(code, float(price), int(volume), ts)
+        if self.on_tick:
+            self.on_tick(code, float(price), abs(rec.volume), ts)
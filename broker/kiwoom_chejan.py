@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from core.types import Side
+
+GUBUN_ORDER = "0"     # 주문접수/체결
+GUBUN_BALANCE = "1"   # 잔고변경
+
+
+class ChejanEvent:
+    """OnReceiveChejanData 1건을 한 번에 디코딩한 레코드
+
+    gubun "0": 주문/체결 (order_no, status, kind, side, order_qty, unfilled, fill_qty/fill_price)
+      - status: 913 주문상태 (접수/체결/확인), kind: 905 주문구분 (+매수, -매도, 매수취소, 매도정정 ...)
+      - fill_qty/fill_price 는 이번 이벤트의 단위체결량/단위체결가 (FID 915/914, 체결 상태에서만 읽음)
+      - 읽지 않은 필드는 0/"" (예: 체결 이벤트의 order_price, 취소 이벤트의 수량)
+    gubun "1": 잔고 (holding_qty, avg_price, cur_price)
+    """
+
+    __slots__ = (
+        "gubun", "code", "order_no", "orig_order_no", "status", "kind", "side",
+        "order_qty", "order_price", "unfilled", "fill_qty", "fill_price",
+        "holding_qty", "avg_price", "cur_price",
+    )
+
+    def __init__(self, gubun: str, code: str) -> None:
+        self.gubun = gubun
+        self.code = code
+        self.order_no = ""
+        self.orig_order_no = ""
+        self.status = ""
+        self.kind = ""
+        self.side: Optional[Side] = None
+        self.order_qty = 0
+        self.order_price = 0
+        self.unfilled = 0
+        self.fill_qty = 0
+        self.fill_price = 0
+        self.holding_qty = 0
+        self.avg_price = 0
+        self.cur_price = 0
+
+    @property
+    def is_order(self) -> bool:
+        return self.gubun == GUBUN_ORDER
+
+    @property
+    def is_fill(self) -> bool:
+        return self.gubun == GUBUN_ORDER and self.fill_qty > 0 and self.fill_price > 0
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"ChejanEvent({fields})"
+
+
+def _abs_int(s: str) -> int:
+    try:
+        v = int(s)
+    except ValueError:
+        s = s.strip()
+        try:
+            v = int(s) if s else 0
+        except ValueError:
+            return 0
+    return -v if v < 0 else v
+
+
+def _side(sell_buy: str, order_gubun: str) -> Optional[Side]:
+    # 907 매도수구분: 1=매도, 2=매수. 없으면 905 주문구분 텍스트(+매수/-매도, 매수정정 ...)
+    if sell_buy == "2":
+        return Side.BUY
+    if sell_buy == "1":
+        return Side.SELL
+    if "매수" in order_gubun:
+        return Side.BUY
+    if "매도" in order_gubun:
+        return Side.SELL
+    return None
+
+
+def decode_chejan(gubun: str, get: Callable[[int], str]) -> Optional[ChejanEvent]:
+    """get(fid) -> str (GetChejanData) 로 이벤트 1건 디코딩. 종목코드가 없으면 None"""
+    gubun = str(gubun).strip()
+    code = str(get(9001)).strip().replace("A", "")
+    if not code:
+        return None
+    ev = ChejanEvent(gubun, code)
+    if gubun == GUBUN_BALANCE:
+        ev.cur_price = _abs_int(str(get(10)))
+        ev.holding_qty = _abs_int(str(get(930)))
+        ev.avg_price = _abs_int(str(get(931)))
+        ev.side = _side(str(get(946)).strip(), "")
+        return ev
+
+    # 주문 이벤트는 상태별로 쓰는 FID 만 읽는다 (GetChejanData 1회 = COM 호출 1회)
+    #   공통: 9001 9203 913 905 (+ 905 로 방향을 못 정할 때만 907)
+    #   취소: 확인일 때 원주문번호 904 만 (OrderBook 은 원주문 종료만 반영)
+    #   접수/확인: 900 901 902 (+ 정정이면 904) / 체결: 900 902 914 915 (주문가는 접수 때 받음)
+    ev.order_no = str(get(9203)).strip()
+    status = ev.status = str(get(913)).strip()
+    kind = ev.kind = str(get(905)).strip()
+    ev.side = _side("", kind) or _side(str(get(907)).strip(), "")
+    if "취소" in kind:
+        if "확인" in status:
+            ev.orig_order_no = str(get(904)).strip()
+        return ev
+    ev.order_qty = _abs_int(str(get(900)))
+    ev.unfilled = _abs_int(str(get(902)))
+    if "정정" in kind:
+        ev.orig_order_no = str(get(904)).strip()
+    if "체결" in status:
+        ev.fill_price = _abs_int(str(get(914)))
+        ev.fill_qty = _abs_int(str(get(915)))
+    else:
+        ev.order_price = _abs_int(str(get(901)))
+    return ev
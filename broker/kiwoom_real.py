@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+# OnReceiveRealData 의 real_data 는 실시간 타입별로 고정된 FID 순서의 탭 구분 문자열.
+# (KOA Studio 실시간목록 기준, 앞쪽 고정 구간만 사용)
+REAL_LAYOUTS: Dict[str, Tuple[int, ...]] = {
+    "주식체결": (
+        20, 10, 11, 12, 27, 28, 15, 13, 14, 16, 17, 18, 25, 26, 29, 30, 31, 32,
+        228, 311, 290, 691, 567, 568,
+    ),
+    "주식시세": (
+        10, 11, 12, 27, 28, 13, 14, 16, 17, 18, 25, 26, 29, 30, 31, 32, 311, 567, 568,
+    ),
+    "주식우선호가": (27, 28),
+    "주식호가잔량": (21,) + tuple(
+        fid
+        for lvl in range(10)
+        for fid in (41 + lvl, 61 + lvl, 81 + lvl, 51 + lvl, 71 + lvl, 91 + lvl)
+    ),
+}
+
+# RealTick 속성 <- FID
+_ATTR_FIDS = (
+    ("price", 10),
+    ("volume", 15),
+    ("cum_volume", 13),
+    ("exch_time", 20),
+    ("best_ask", 27),
+    ("best_bid", 28),
+    ("strength", 228),
+)
+# 호가잔량은 시간/최우선호가 FID 가 다름
+_ATTR_FIDS_ORDERBOOK = (
+    ("exch_time", 21),
+    ("best_ask", 41),
+    ("best_bid", 51),
+)
+
+
+class RealTick:
+    """실시간 1건의 압축 레코드. 없는 필드는 0
+
+    volume 은 부호 포함(+ 매수체결, - 매도체결), price/호가는 절대값.
+    exch_time 은 거래소 시각 HHMMSS 정수.
+    """
+
+    __slots__ = ("code", "real_type", "price", "volume", "cum_volume", "exch_time",
+                 "best_ask", "best_bid", "strength")
+
+    def __init__(
+        self,
+        code: str,
+        real_type: str,
+        price: int = 0,
+        volume: int = 0,
+        cum_volume: int = 0,
+        exch_time: int = 0,
+        best_ask: int = 0,
+        best_bid: int = 0,
+        strength: float = 0.0,
+    ) -> None:
+        self.code = code
+        self.real_type = real_type
+        self.price = price
+        self.volume = volume
+        self.cum_volume = cum_volume
+        self.exch_time = exch_time
+        self.best_ask = best_ask
+        self.best_bid = best_bid
+        self.strength = strength
+
+    def hms(self) -> str:
+        t = self.exch_time
+        return f"{t // 10000:02d}:{t // 100 % 100:02d}:{t % 100:02d}"
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"RealTick({fields})"
+
+
+def _int(parts, i: int) -> int:
+    if i < 0:
+        return 0
+    try:
+        return int(parts[i])
+    except ValueError:
+        s = parts[i].strip()
+        try:
+            return int(s) if s else 0
+        except ValueError:
+            return 0
+
+
+def _abs_int(parts, i: int) -> int:
+    v = _int(parts, i)
+    return -v if v < 0 else v
+
+
+def _float(parts, i: int) -> float:
+    if i < 0:
+        return 0.0
+    try:
+        return float(parts[i])
+    except ValueError:
+        return 0.0
+
+
+_ATTRS = ("price", "volume", "cum_volume", "exch_time", "best_ask", "best_bid", "strength")
+
+
+class RealDataDecoder:
+    """real_data 탭 문자열을 split 한 번으로 RealTick 으로 디코딩
+
+    실시간 타입별로 속성 -> 필드 인덱스(-1 = 없음)를 생성 시 미리 계산해 두고,
+    필드 수가 레이아웃보다 적으면 None 을 돌려 호출측이 GetCommRealData 로 폴백하게 한다.
+    """
+
+    def __init__(self, layouts: Optional[Dict[str, Tuple[int, ...]]] = None) -> None:
+        self._plans: Dict[str, Tuple[int, ...]] = {}
+        for real_type, fids in (layouts or REAL_LAYOUTS).items():
+            pos = {fid: i for i, fid in enumerate(fids)}
+            attr_fid = dict(_ATTR_FIDS)
+            if real_type == "주식호가잔량":
+                attr_fid.update(_ATTR_FIDS_ORDERBOOK)
+            idx = tuple(pos.get(attr_fid[a], -1) for a in _ATTRS)
+            need = max(idx) + 1
+            self._plans[real_type] = (need,) + idx
+
+    def knows(self, real_type: str) -> bool:
+        return real_type in self._plans
+
+    def decode(self, code: str, real_type: str, real_data: str) -> Optional[RealTick]:
+        plan = self._plans.get(real_type)
+        if plan is None:
+            return None
+        need, i_px, i_vol, i_cum, i_time, i_ask, i_bid, i_str = plan
+        parts = real_data.split("\t")
+        if len(parts) < need:
+            return None
+        return RealTick(
+            code,
+            real_type,
+            _abs_int(parts, i_px),
+            _int(parts, i_vol),
+            _abs_int(parts, i_cum),
+            _int(parts, i_time),
+            _abs_int(parts, i_ask),
+            _abs_int(parts, i_bid),
+            _float(parts, i_str),
+        )
+
+
+def encode_real_data(real_type: str, values: Dict[int, str], layouts: Optional[Dict[str, Tuple[int, ...]]] = None) -> str:
+    """FID->문자열 값으로 real_data 페이로드 생성 (fake OCX/테스트/벤치용)"""
+    fids = (layouts or REAL_LAYOUTS)[real_type]
+    return "\t".join(values.get(fid, "") for fid in fids)
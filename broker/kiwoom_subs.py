@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 화면당 실시간 등록 한도 (Kiwoom)
+MAX_PER_SCREEN = 100
+
+RegisterFn = Callable[[str, str, str, str], Optional[int]]   # SetRealReg(screen, codes, fids, opt) -> 0 성공
+RemoveFn = Callable[[str, str], None]                        # SetRealRemove(screen, code)
+
+
+class SubscriptionManager:
+    """실시간 등록을 여러 화면에 나눠 담고 변경분만 보낸다
+
+    sync(codes) 는 현재 등록 집합과의 차이만 계산해
+    제거분은 SetRealRemove(screen, code), 추가분은 화면별로 묶어 SetRealReg(..., "1") 로 보낸다.
+    추가는 번호가 낮은 화면의 빈자리부터 채운다. 집합이 같으면 OCX 호출이 없다.
+    등록 상태는 OCX 호출이 성공한 뒤에만 바꾼다 (SetRealReg 가 0 이 아닌 값을 돌려주거나 예외가 나면
+    그 화면 묶음은 미등록으로 남아 다음 sync 의 추가분에 다시 들어간다).
+    """
+
+    def __init__(
+        self,
+        register: RegisterFn,
+        remove: RemoveFn,
+        fid_list: str = "10;15",
+        screen_base: int = 202,
+        max_screens: int = 20,
+        per_screen: int = MAX_PER_SCREEN,
+    ) -> None:
+        self._register = register
+        self._remove = remove
+        self.fid_list = fid_list
+        self.per_screen = int(per_screen)
+        self.screens: List[str] = [f"{screen_base + i:04d}" for i in range(int(max_screens))]
+        self._by_screen: Dict[str, Dict[str, None]] = {s: {} for s in self.screens}
+        self._screen_of: Dict[str, str] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self.per_screen * len(self.screens)
+
+    def __len__(self) -> int:
+        return len(self._screen_of)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._screen_of
+
+    def codes(self) -> List[str]:
+        return list(self._screen_of)
+
+    def screen_of(self, code: str) -> Optional[str]:
+        return self._screen_of.get(code)
+
+    def occupancy(self) -> Dict[str, int]:
+        """화면별 등록 종목 수 (비어 있는 화면 제외)"""
+        return {s: len(c) for s, c in self._by_screen.items() if c}
+
+    def sync(self, codes: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """등록 집합을 codes 로 맞춘다. 실제로 반영된 (added, removed) 반환"""
+        want = dict.fromkeys(c for c in codes if c)
+        if len(want) > self.capacity:
+            raise ValueError(f"realtime codes {len(want)} > capacity {self.capacity} "
+                             f"({len(self.screens)} screens x {self.per_screen})")
+        removed = self.remove([c for c in self._screen_of if c not in want])
+        added = self.add([c for c in want if c not in self._screen_of])
+        return added, removed
+
+    def add(self, codes: Iterable[str]) -> List[str]:
+        """실제로 등록된 종목만 반환 (SetRealReg 실패한 화면 묶음은 빠진다)"""
+        # 화면 배정은 먼저 계획만 하고, 상태는 SetRealReg 성공 후 반영
+        batches: Dict[str, Dict[str, None]] = {}
+        planned: Dict[str, None] = {}
+        it = iter(self.screens)
+        screen = next(it)
+        for c in codes:
+            if not c or c in self._screen_of or c in planned:
+                continue
+            while len(self._by_screen[screen]) + len(batches.get(screen, ())) >= self.per_screen:
+                screen = next(it, None)
+                if screen is None:
+                    raise ValueError(f"realtime capacity {self.capacity} exceeded")
+            batches.setdefault(screen, {})[c] = None
+            planned[c] = None
+        out: List[str] = []
+        for screen, batch in batches.items():
+            ret = self._register(screen, ";".join(batch), self.fid_list, "1")
+            if ret:
+                continue    # 음수 에러코드: 상태를 바꾸지 않아 다음 sync 에서 다시 시도
+            self._by_screen[screen].update(batch)
+            for c in batch:
+                self._screen_of[c] = screen
+            out.extend(batch)
+        return out
+
+    def remove(self, codes: Iterable[str]) -> List[str]:
+        out: List[str] = []
+        for c in codes:
+            screen = self._screen_of.get(c)
+            if screen is None:
+                continue
+            self._remove(screen, c)
+            del self._screen_of[c]
+            self._by_screen[screen].pop(c, None)
+            out.append(c)
+        return out
+
+    def clear(self) -> None:
+        """모든 화면 등록 해제 (재접속 전 등)"""
+        for screen, codes in self._by_screen.items():
+            if codes:
+                self._remove(screen, "ALL")
+                for c in codes:
+                    self._screen_of.pop(c, None)
+                codes.clear()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from broker.base import BrokerBase
+from broker.kiwoom_chejan import GUBUN_BALANCE, GUBUN_ORDER, ChejanEvent
+from broker.tr_scheduler import PRIO_LOW, PRIO_NORMAL, completed
+from core.clock import Clock, WALL_CLOCK
+from core.types import Order, Side, OrderType, Position
+
+
+class SimulatedBroker(BrokerBase):
+    """Qt/COM 없이 KiwoomBroker 와 같은 인터페이스/콜백을 흉내내는 브로커
+
+    - feed_tick() 이 _on_receive_real_data 와 같은 순서로 on_price/on_tick 을 호출
+    - 시장가 주문은 마지막 체결가(±slippage_bp)로 즉시 전량 체결
+    - 체결마다 on_chejan(주문/체결 gubun 0 -> 잔고 gubun 1) + on_fill(code, qty, price)
+    """
+
+    def __init__(self, clock: Optional[Clock] = None, universe: Optional[List[str]] = None, slippage_bp: int = 0) -> None:
+        super().__init__()
+        self.clock = clock or WALL_CLOCK
+        self.slippage_bp = int(slippage_bp)
+
+        self._account_no: Optional[str] = None
+        self._positions: Dict[str, Position] = {}
+        self._day_pnl_ratio_forced: float = 0.0
+        self._order_seq = 0
+
+        self.universe: List[str] = list(universe or [])
+        self.realtime: List[str] = []
+
+        # on_tick callback (symbol, price, vol, ts_ms)
+        self.on_tick = None
+
+        # request_minute_bars 응답 (code -> 오래된 것 -> 최신 바 dict 리스트), 테스트/리플레이가 채움
+        self.minute_bars: Dict[str, List[Dict[str, Any]]] = {}
+
+        self.fills: List[Dict[str, Any]] = []
+        # 청산(매도) 단위 실현손익 - 스윕/리포트용
+        self.realized_pnl: float = 0.0
+        self.round_trips: List[float] = []
+
+    # ------------------ login ------------------
+    def connect_and_login(self) -> None:
+        self._account_no = "SIM0000000"
+
+    def get_account_no(self) -> str:
+        if not self._account_no:
+            raise RuntimeError("계좌가 설정되지 않았습니다. connect_and_login() 먼저 호출하세요.")
+        return self._account_no
+
+    # ------------------ positions / pnl ------------------
+    def get_positions(self) -> Dict[str, Position]:
+        return self._positions
+
+    def set_day_pnl_ratio(self, pnl_ratio: float) -> None:
+        try:
+            self._day_pnl_ratio_forced = float(pnl_ratio)
+        except Exception:
+            self._day_pnl_ratio_forced = 0.0
+
+    def get_day_pnl_ratio(self) -> float:
+        return float(self._day_pnl_ratio_forced)
+
+    # ------------------ universe / realtime ------------------
+    def request_condition(
+        self, condition_name: str, screen: str = "0900", priority: int = PRIO_NORMAL, realtime: bool = False
+    ) -> Future:
+        return completed(list(self.universe))
+
+    def push_condition(self, code: str, inserted: bool, condition_name: str = "") -> None:
+        """실시간 조건검색 편입/이탈 이벤트 흉내"""
+        if inserted and code not in self.universe:
+            self.universe.append(code)
+        elif not inserted and code in self.universe:
+            self.universe.remove(code)
+        if self.on_condition:
+            self.on_condition(code, inserted, condition_name)
+
+    def subscribe_realtime(self, codes: list[str]) -> Tuple[List[str], List[str]]:
+        want = dict.fromkeys(codes)
+        cur = dict.fromkeys(self.realtime)
+        added = [c for c in want if c not in cur]
+        removed = [c for c in cur if c not in want]
+        self.realtime = list(want)
+        return added, removed
+
+    # ------------------ market data ------------------
+    def feed_tick(self, code: str, price: float, volume: int) -> None:
+        price = abs(float(price))
+        if price <= 0:
+            return
+        pos = self._positions.get(code) or Position(symbol=code)
+        pos.last_price = price
+        self._positions[code] = pos
+
+        ts = self.clock.time_ms()
+        if self.on_price:
+            self.on_price(code, price, ts)
+        if self.on_tick:
+            self.on_tick(code, price, int(volume), ts)
+
+    # ------------------ order ------------------
+    def place_order(self, order: Order) -> None:
+        self.get_account_no()
+        code = order.symbol.strip()
+        if len(code) != 6:
+            raise ValueError(f"Kiwoom requires 6-digit code. got: {code}")
+
+        pos = self._positions.get(code) or Position(symbol=code)
+        last = pos.last_price
+        if order.order_type == OrderType.LIMIT and order.price:
+            last = float(order.price)
+        if last <= 0:
+            raise RuntimeError(f"SendOrder failed: no price for {code}")
+
+        qty = int(order.qty)
+        if order.side == Side.SELL:
+            qty = min(qty, pos.qty)
+        if qty <= 0:
+            raise RuntimeError(f"SendOrder failed: qty=0 for {code}")
+
+        slip = self.slippage_bp / 10000.0
+        px = last * (1 + slip) if order.side == Side.BUY else last * (1 - slip)
+        self._order_seq += 1
+        self._fill(code, order.side, qty, px, f"{self._order_seq:07d}")
+
+    def _fill(self, code: str, side: Side, qty: int, price: float, order_no: str) -> None:
+        pos = self._positions.get(code) or Position(symbol=code)
+        if side == Side.BUY:
+            new_qty = pos.qty + qty
+            pos.avg_price = (pos.avg_price * pos.qty + price * qty) / new_qty
+            pos.qty = new_qty
+        else:
+            pnl = (price - pos.avg_price) * qty
+            self.realized_pnl += pnl
+            self.round_trips.append(pnl)
+            pos.qty -= qty
+            if pos.qty <= 0:
+                pos.qty = 0
+                pos.avg_price = 0.0
+        self._positions[code] = pos
+
+        self.fills.append({
+            "order_no": order_no,
+            "code": code,
+            "side": side.value,
+            "qty": qty,
+            "price": price,
+            "ts": self.clock.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        if self.on_chejan:
+            ev = ChejanEvent(GUBUN_ORDER, code)
+            ev.order_no = order_no
+            ev.status = "체결"
+            ev.side = side
+            ev.order_qty = qty
+            ev.fill_qty = qty
+            ev.fill_price = price
+            self.on_chejan(ev)
+            bal = ChejanEvent(GUBUN_BALANCE, code)
+            bal.side = side
+            bal.holding_qty = pos.qty
+            bal.avg_price = pos.avg_price
+            bal.cur_price = pos.last_price
+            self.on_chejan(bal)
+        if self.on_fill:
+            self.on_fill(code, qty, price)
+
+    def unrealized_pnl(self) -> float:
+        return sum((p.last_price - p.avg_price) * p.qty for p in self._positions.values() if p.qty > 0)
+
+    def request_open_orders(self, priority: int = PRIO_NORMAL) -> Future:
+        # 즉시 전량 체결이라 미체결 없음
+        return completed([])
+
+    def request_minute_bars(self, code: str, tick_range: int = 1, priority: int = PRIO_LOW) -> Future:
+        return completed(list(self.minute_bars.get(code, [])))
+
+    def cancel_order(self, order_no: str, code: str, orig_side: Side, qty: int) -> None:
+        pass
+
+    def modify_order_to_market(self, order_no: str, code: str, orig_side: Side, qty: int) -> None:
+        pass
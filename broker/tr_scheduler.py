@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import heapq
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.clock import Clock, WALL_CLOCK
+
+# 우선순위 (작을수록 먼저). 연속조회 다음 페이지는 항상 맨 앞
+PRIO_CONT = -1
+PRIO_HIGH = 0
+PRIO_NORMAL = 5
+PRIO_LOW = 9
+
+Key = Tuple[str, str]   # (rqname, screen)
+Schedule = Callable[[float, Callable[[], None]], None]
+
+
+class TokenBucket:
+    """limit 회 / window 초를 넘지 않는 토큰 버킷
+
+    burst 개까지 즉시 쓰고 이후 (limit - burst) / window 속도로 채운다.
+    어떤 window 구간에서도 burst + 충전량 <= limit 이 되도록 잡은 값.
+    """
+
+    def __init__(self, limit: int, window_sec: float, burst: int = 1, clock: Optional[Clock] = None) -> None:
+        if not 0 < burst < limit:
+            raise ValueError("burst must be in (0, limit)")
+        self.clock = clock or WALL_CLOCK
+        self.capacity = float(burst)
+        self.rate = (limit - burst) / float(window_sec)
+        self.tokens = float(burst)
+        self._t = self.clock.time()
+
+    def _refill(self, now: float) -> None:
+        if now > self._t:
+            self.tokens = min(self.capacity, self.tokens + (now - self._t) * self.rate)
+            self._t = now
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """토큰 1개가 생길 때까지 남은 초 (0 = 지금 가능)"""
+        now = self.clock.time() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def take(self, now: Optional[float] = None) -> bool:
+        now = self.clock.time() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class TrRequest:
+    """큐에 들어가는 조회 1건. send(prev_next) 가 SetInputValue + CommRqData 등을 수행"""
+
+    __slots__ = ("key", "send", "priority", "max_pages", "timeout_sec", "future", "rows", "page", "prev_next", "_token")
+
+    def __init__(self, key: Key, send: Callable[[int], None], priority: int, max_pages: int, timeout_sec: float) -> None:
+        self.key = key
+        self.send = send
+        self.priority = priority
+        self.max_pages = max_pages
+        self.timeout_sec = timeout_sec
+        self.future: Future = Future()
+        self.rows: List[Any] = []
+        self.page = 0
+        self.prev_next = 0
+        self._token = 0
+
+
+class TrScheduler:
+    """TR/조건검색 요청 스케줄러 (중첩 QEventLoop 대체)
+
+    - submit() 은 바로 Future 를 돌려주고, 응답 이벤트에서 on_response() 로 완료된다.
+      같은 (rqname, screen) 이 대기/진행 중이면 새로 보내지 않고 그 Future 를 돌려준다.
+    - 우선순위 힙 + 토큰 버킷 2개 (초당 5회, 시간당 1000회) 로 보낼 시점을 정한다.
+    - 연속조회(prev_next == 2)는 max_pages 까지 다음 페이지를 자동 요청해 rows 를 이어 붙인다.
+    - 타이머는 schedule(delay_sec, fn) 으로 주입 (Qt: QTimer.singleShot, 테스트: 가상 타이머).
+    """
+
+    def __init__(
+        self,
+        schedule: Schedule,
+        clock: Optional[Clock] = None,
+        per_sec: int = 5,
+        per_hour: int = 1000,
+        hour_burst: int = 100,
+    ) -> None:
+        self.schedule = schedule
+        self.clock = clock or WALL_CLOCK
+        self.buckets = [
+            TokenBucket(per_sec, 1.0, burst=1, clock=self.clock),
+            TokenBucket(per_hour, 3600.0, burst=hour_burst, clock=self.clock),
+        ]
+        self._heap: List[Tuple[int, int, TrRequest]] = []
+        self._seq = 0
+        self._pending: Dict[Key, TrRequest] = {}    # 큐 대기 + 응답 대기
+        self._inflight: Dict[Key, TrRequest] = {}
+        self._wake_at: Optional[float] = None
+        self.sent = 0
+
+    # ------------------ public ------------------
+    def submit(
+        self,
+        rqname: str,
+        screen: str,
+        send: Callable[[int], None],
+        priority: int = PRIO_NORMAL,
+        max_pages: int = 1,
+        timeout_sec: float = 10.0,
+    ) -> Future:
+        key = (str(rqname), str(screen))
+        req = self._pending.get(key)
+        if req is not None:
+            return req.future
+        req = TrRequest(key, send, int(priority), max(1, int(max_pages)), float(timeout_sec))
+        self._pending[key] = req
+        self._push(req, req.priority)
+        self.pump()
+        return req.future
+
+    def on_response(self, rqname: str, screen: str, rows: Optional[List[Any]] = None, has_next: bool = False) -> None:
+        """응답 이벤트(OnReceiveTrData 등)에서 호출. 모르는 키는 무시"""
+        key = (str(rqname), str(screen))
+        req = self._inflight.pop(key, None)
+        if req is None:
+            return
+        if rows:
+            req.rows.extend(rows)
+        if has_next and req.page < req.max_pages:
+            req.prev_next = 2
+            self._push(req, PRIO_CONT)
+        else:
+            self._finish(req)
+            req.future.set_result(req.rows)
+        self.pump()
+
+    def fail(self, rqname: str, screen: str, exc: BaseException) -> None:
+        key = (str(rqname), str(screen))
+        req = self._inflight.pop(key, None)
+        if req is not None:
+            self._finish(req)
+            req.future.set_exception(exc)
+        self.pump()
+
+    def wait_time(self) -> float:
+        now = self.clock.time()
+        return max(b.wait_time(now) for b in self.buckets)
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def queued(self) -> int:
+        return len(self._heap)
+
+    # ------------------ internals ------------------
+    def _push(self, req: TrRequest, priority: int) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (priority, self._seq, req))
+
+    def _finish(self, req: TrRequest) -> None:
+        self._pending.pop(req.key, None)
+        req._token += 1
+
+    def pump(self) -> None:
+        """보낼 수 있는 만큼 보내고, 남으면 다음 토큰 시점에 다시 깨어난다"""
+        h = self._heap
+        while h:
+            wait = self.wait_time()
+            if wait > 0:
+                self._wake(wait)
+                return
+            req = heapq.heappop(h)[2]
+            now = self.clock.time()
+            for b in self.buckets:
+                b.take(now)
+            self._send(req)
+
+    def _send(self, req: TrRequest) -> None:
+        req.page += 1
+        req._token += 1
+        token = req._token
+        self._inflight[req.key] = req
+        self.sent += 1
+        try:
+            req.send(req.prev_next)
+        except Exception as e:
+            if self._inflight.get(req.key) is req:
+                self._inflight.pop(req.key, None)
+                self._finish(req)
+                req.future.set_exception(e)
+            return
+        if req.timeout_sec > 0 and self._inflight.get(req.key) is req:
+            self.schedule(req.timeout_sec, lambda: self._expire(req, token))
+
+    def _expire(self, req: TrRequest, token: int) -> None:
+        if req._token != token or self._inflight.get(req.key) is not req:
+            return
+        self._inflight.pop(req.key, None)
+        self._finish(req)
+        req.future.set_exception(TimeoutError(f"TR timeout rqname={req.key[0]} screen={req.key[1]} page={req.page}"))
+        self.pump()
+
+    def _wake(self, delay: float) -> None:
+        at = self.clock.time() + delay
+        if self._wake_at is not None and self._wake_at <= at:
+            return
+        self._wake_at = at
+
+        def _tick() -> None:
+            if self._wake_at == at:
+                self._wake_at = None
+            self.pump()
+
+        self.schedule(delay, _tick)
+
+
+def completed(value: Any) -> Future:
+    """이미 끝난 Future (동기 브로커/캐시 응답용)"""
+    f: Future = Future()
+    f.set_result(value)
+    return f
+
+
+def chain(fut: Future, fn: Callable[[Any], Any]) -> Future:
+    """fut 결과에 fn 을 적용한 새 Future. 예외는 그대로 전달"""
+    out: Future = Future()
+
+    def _done(f: Future) -> None:
+        exc = f.exception()
+        if exc is not None:
+            out.set_exception(exc)
+            return
+        try:
+            out.set_result(fn(f.result()))
+        except Exception as e:
+            out.set_exception(e)
+
+    fut.add_done_callback(_done)
+    return out
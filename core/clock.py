@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+
+# 로컬(KST) - UTC 초 차이. 분/바 경계는 epoch 정수에 이 값을 더해 나눈다
+UTC_OFFSET_SEC = int(time.localtime().tm_gmtoff)
+
+
+def hm_minutes(hm: str) -> int:
+    """HH:MM -> 자정 이후 분 (설정값을 한 번만 파싱해 정수 비교용으로)"""
+    return int(hm[:2]) * 60 + int(hm[3:5])
+
+
+def fmt_ms(ts_ms: int, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+    """epoch ms -> 로컬 시각 문자열 (로그 출력 지점에서만 사용)"""
+    return time.strftime(fmt, time.localtime(ts_ms // 1000))
+
+
+class Clock:
+    """벽시계. 시간을 읽는 컴포넌트는 이걸 주입받아 리플레이/테스트에서 교체 가능
+
+    틱/바 경로는 time_ms() 정수 epoch 만 주고받고, 문자열 변환은 로그 지점에서만 한다.
+    """
+
+    def time(self) -> float:
+        return time.time()
+
+    def time_ms(self) -> int:
+        return time.time_ns() // 1_000_000
+
+    def time_us(self) -> int:
+        return time.time_ns() // 1_000
+
+    def minute_of_day(self) -> int:
+        """로컬 자정 이후 분"""
+        return (self.time_ms() // 1000 + UTC_OFFSET_SEC) // 60 % 1440
+
+    def monotonic_ns(self) -> int:
+        """간격 계산용 단조 증가 정수 ns (벽시계 보정에 흔들리지 않음)"""
+        return time.monotonic_ns()
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time())
+
+    def iso(self) -> str:
+        return self.now().isoformat(timespec="milliseconds")
+
+
+class VirtualClock(Clock):
+    """리플레이용 가상 시계. 러너가 set()/advance() 로만 움직인다"""
+
+    def __init__(self, t: float = 0.0) -> None:
+        self.t = float(t)
+
+    def time(self) -> float:
+        return self.t
+
+    def time_ms(self) -> int:
+        return int(round(self.t * 1e3))
+
+    def time_us(self) -> int:
+        return int(round(self.t * 1e6))
+
+    def monotonic_ns(self) -> int:
+        return int(round(self.t * 1e9))
+
+    def set(self, t: float) -> None:
+        if t > self.t:
+            self.t = float(t)
+
+    def advance(self, dt: float) -> None:
+        self.t += float(dt)
+
+
+class FixedClock(VirtualClock):
+    """테스트용 고정 시계. 스스로 움직이지 않고 set() 은 과거로도 옮길 수 있다"""
+
+    def set(self, t: float) -> None:
+        self.t = float(t)
+
+
+WALL_CLOCK = Clock()
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import time
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.metrics import Metrics
+from core.pnl_tracker import PnLTracker, PositionLite
+from core.scoring import ScoreBoard
+from core.settings import BotConfig
+from core.shm_ring import ShmRing
+from core.strategy import Signal, SimpleScoreStrategy
+from core.types import Side
+from data.bar_spill import BarSpill
+from data.bar_store import BAR_DTYPE, BarStore
+from data.realtime_bar_builder import Bar, RealtimeBarBuilder
+
+# 주 프로세스 -> 계산 프로세스 레코드 종류
+K_TICK = 1      # code, ts=체결 epoch ms, p0=가격, v=거래량, t_ns=수신 perf_counter_ns
+K_POS = 2       # code, p0=평단, v=보유 수량 (체결/잔고 반영 후)
+K_FLUSH = 3     # ts=현재 epoch ms (지난 경계의 바 마감)
+K_UNIV = 4      # code, v=1 실시간 편입 / 0 이탈
+K_GATE = 5      # v=1 신규 진입 허용 / 0 (리스크/컷오프/강제청산 구간은 주 프로세스가 판단)
+K_BAR = 6       # code, ts=바 시작 epoch, p0..p3=OHLC, v=거래량 (warm start 이력)
+K_SEEDED = 7    # code 의 K_BAR 묶음 끝 -> store 에 붙이고 지표 재시드
+K_FORGET = 8    # code 퇴출 (바 이력은 spill 로)
+K_STOP = 9
+
+# 레코드 1개 = 64바이트 (캐시라인 1개)
+IN_DTYPE = np.dtype([
+    ("kind", "i1"), ("code", "S7"), ("ts", "i8"),
+    ("p0", "f8"), ("p1", "f8"), ("p2", "f8"), ("p3", "f8"),
+    ("v", "i8"), ("t_ns", "i8"),
+])
+# 계산 프로세스 -> 주 프로세스: 주문 의도 (가드/리스크/전송은 주 프로세스)
+OUT_DTYPE = np.dtype([
+    ("side", "i1"), ("reason", "i1"), ("code", "S6"),
+    ("qty", "i8"), ("price", "f8"), ("ts", "i8"), ("t_ns", "i8"),
+])
+REASONS = ("score_entry", "stop_loss", "take_profit")
+
+# 같은 종목 청산 의도를 다시 보내기까지 (포지션 갱신이 오면 바로 풀림)
+EXIT_RESEND_MS = 1000
+
+Intent = Tuple[Signal, int]     # (signal, 틱 수신 perf_counter_ns)
+
+
+def _intent_rec(sig: Signal, price: float, ts_ms: int, t_ns: int) -> tuple:
+    side = 1 if sig.side == Side.BUY else -1
+    reason = REASONS.index(sig.reason) if sig.reason in REASONS else -1
+    return (side, reason, sig.symbol.encode(), int(sig.qty), float(price), int(ts_ms), int(t_ns))
+
+
+class ComputeEngine:
+    """분리 모드의 계산 쪽: 틱 -> 분봉 -> 점수 -> 진입/청산 의도
+
+    PaperBotApp 이벤트 모드와 같은 판단(바 마감 후 top-K 진입, 보유 종목 틱마다 청산)을 하되
+    주문은 보내지 않고 on_intent 로 의도만 넘긴다. 포지션은 주 프로세스가 보내는 K_POS 미러.
+    같은 프로세스에서 handle() 을 직접 부르면 단일 스레드 모드와 같은 계산 경로가 된다 (벤치 비교용).
+    """
+
+    def __init__(
+        self,
+        cfg: BotConfig,
+        logger,
+        spill: Optional[BarSpill] = None,
+        on_intent: Optional[Callable[[tuple], None]] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        self.cfg = cfg
+        self.log = logger
+        self.spill = spill
+        self.on_intent = on_intent
+        self.metrics = metrics or Metrics(enabled=bool(cfg.metrics_enabled))
+        self.store = BarStore(capacity=200)
+        self.sb = ScoreBoard(batch_min=int(cfg.batch_score_min))
+        self.pnl = PnLTracker(logger)     # 포지션 미러 (손익/리스크 집계는 주 프로세스)
+        self.strategy = SimpleScoreStrategy(logger, cfg, self.sb, self.pnl)
+        self.builder = RealtimeBarBuilder(self._on_bar, interval_sec=int(cfg.bar_interval_sec), on_batch=self._on_batch)
+        self.rt: Dict[str, None] = {}
+        self.allow_entries = False
+        self._closed: Dict[str, None] = {}
+        self._last_px: Dict[str, float] = {}
+        self._tick_ns: Dict[str, int] = {}
+        self._exit_sent: Dict[str, int] = {}
+        self._seed: Dict[str, List[tuple]] = {}
+        self._entry_dirty = False
+        self._now_ms = 0
+        self.n_ticks = 0
+        self.n_intents = 0
+
+    # ------------------ dispatch ------------------
+    def handle(self, recs: np.ndarray) -> bool:
+        """레코드 묶음 처리. K_STOP 을 만나면 False"""
+        alive = True
+        for kind, code, ts, p0, p1, p2, p3, v, t_ns in recs.tolist():
+            if kind == K_TICK:
+                self.on_tick(code.decode(), p0, v, ts, t_ns)
+            elif kind == K_FLUSH:
+                self.flush(ts)
+            elif kind == K_POS:
+                self.on_pos(code.decode(), v, p0)
+            elif kind == K_UNIV:
+                if v:
+                    self.rt[code.decode()] = None
+                else:
+                    self.rt.pop(code.decode(), None)
+            elif kind == K_GATE:
+                self.allow_entries = bool(v)
+            elif kind == K_BAR:
+                self._seed.setdefault(code.decode(), []).append((ts, p0, p1, p2, p3, v))
+            elif kind == K_SEEDED:
+                self._on_seeded(code.decode())
+            elif kind == K_FORGET:
+                self.forget(code.decode())
+            elif kind == K_STOP:
+                alive = False
+                break
+        if self.metrics.enabled:
+            # 수신(주 프로세스) -> 계산 완료 지연
+            t_ns = recs["t_ns"][recs["kind"] == K_TICK]
+            if len(t_ns):
+                self.metrics.hist("tick_to_compute").record_many(perf_counter_ns() - t_ns)
+        return alive
+
+    def on_tick(self, sym: str, price: float, volume: int, ts_ms: int, t_ns: int) -> None:
+        self.n_ticks += 1
+        self._now_ms = ts_ms
+        self._last_px[sym] = price
+        self._tick_ns[sym] = t_ns
+        self.builder.on_tick(sym, price, volume, ts_ms)
+        p = self.pnl.pos.get(sym)
+        if p is not None and p.qty > 0:
+            self.pnl.on_price(sym, price)
+            self._check_exit(sym)
+
+    def on_pos(self, sym: str, qty: int, avg_price: float) -> None:
+        self._exit_sent.pop(sym, None)
+        if qty <= 0:
+            self.pnl.pos.pop(sym, None)
+            self._entry_dirty = True    # 자리가 비었을 수 있음
+            return
+        self.pnl.pos[sym] = PositionLite(qty=int(qty), avg_price=float(avg_price),
+                                         last_price=self._last_px.get(sym, float(avg_price)))
+        self._check_exit(sym)
+
+    def flush(self, now_ms: int) -> None:
+        self._now_ms = max(self._now_ms, now_ms)
+        self.builder.flush(now_ms)
+        self._score_closed()
+        if self._entry_dirty:
+            self._entry_dirty = False
+            self._check_entries()
+
+    # ------------------ bars / scoring ------------------
+    def _on_bar(self, b: Bar) -> None:
+        if b.symbol not in self.store and self.spill is not None and b.symbol in self.spill:
+            arr = self.spill.load(b.symbol)
+            if arr is not None:
+                self.store.load(b.symbol, arr)
+        self.store.append_bar(b)
+        self._closed[b.symbol] = None
+
+    def _on_batch(self, bars: List[Bar]) -> None:
+        self._score_closed()
+
+    def _score_closed(self) -> None:
+        if not self._closed:
+            return
+        syms = list(self._closed)
+        self._closed.clear()
+        t0 = perf_counter_ns()
+        self.sb.score_closed(self.store, syms)
+        self.metrics.record("score", perf_counter_ns() - t0)
+        self._check_entries()
+
+    def _on_seeded(self, sym: str) -> None:
+        rows = self._seed.pop(sym, [])
+        self.store.prepend(sym, np.array(rows, dtype=BAR_DTYPE))
+        self.sb.reseed(sym, self.store)
+        self._entry_dirty = True
+
+    def forget(self, sym: str) -> None:
+        arr = self.store.export(sym)
+        if len(arr) and self.spill is not None:
+            self.spill.save(sym, arr)
+        self.store.remove(sym)
+        self.sb.discard(sym)
+        self.rt.pop(sym, None)
+        for d in (self._last_px, self._tick_ns, self._exit_sent, self._seed):
+            d.pop(sym, None)
+        p = self.pnl.pos.get(sym)
+        if p is not None and p.qty <= 0:
+            del self.pnl.pos[sym]
+
+    # ------------------ decisions ------------------
+    def _check_exit(self, sym: str) -> None:
+        sent = self._exit_sent.get(sym)
+        if sent is not None and self._now_ms - sent < EXIT_RESEND_MS:
+            return
+        sig = self.strategy.decide_exit(sym)
+        if sig:
+            self._exit_sent[sym] = self._now_ms
+            self._emit(sig)
+
+    def _check_entries(self) -> None:
+        if not self.allow_entries:
+            return
+        cur_positions = sum(1 for p in self.pnl.pos.values() if p.qty > 0)
+        if cur_positions >= int(self.cfg.max_positions):
+            return
+        for sym in self.sb.top(10, accept=self.rt.__contains__):
+            sig = self.strategy.decide_entry(
+                sym, can_hold_more=cur_positions < int(self.cfg.max_positions), last_price=self._last_px.get(sym, 0.0),
+            )
+            if sig:
+                self._emit(sig)
+                cur_positions += 1
+
+    def _emit(self, sig: Signal) -> None:
+        self.n_intents += 1
+        if self.on_intent is not None:
+            rec = _intent_rec(sig, self._last_px.get(sig.symbol, 0.0), self._now_ms, self._tick_ns.get(sig.symbol, 0))
+            self.on_intent(rec)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "ticks": self.n_ticks,
+            "intents": self.n_intents,
+            "symbols": len(self.store),
+            "stages": self.metrics.snapshot(),
+        }
+
+
+# ------------------ process ------------------
+_IDLE_SPIN = 200          # 빈 pop 이 이만큼 이어지면 잠깐 잠든다
+_IDLE_SLEEP_SEC = 0.0002
+
+
+def compute_main(in_name: str, out_name: str, in_cap: int, out_cap: int, cfg: BotConfig,
+                 spill_root: Optional[str], conn) -> None:
+    """계산 프로세스 진입점 (spawn). K_STOP 을 받으면 stats 를 conn 으로 보내고 끝낸다"""
+    from core.logger import setup_logger
+
+    log = setup_logger("compute", filename="compute.log")
+    rin = ShmRing.attach(in_name, IN_DTYPE, in_cap)
+    rout = ShmRing.attach(out_name, OUT_DTYPE, out_cap)
+
+    def _send(rec: tuple) -> None:
+        while not rout.push(rec):
+            time.sleep(0)     # 주 프로세스가 의도를 비울 때까지
+
+    spill = BarSpill(Path(spill_root)) if spill_root else None
+    eng = ComputeEngine(cfg, log, spill=spill, on_intent=_send)
+    log.info(f"[COMPUTE] started in={in_name} out={out_name}")
+    conn.send({"ready": True})
+    idle = 0
+    try:
+        while True:
+            recs = rin.pop()
+            if len(recs) == 0:
+                idle += 1
+                time.sleep(_IDLE_SLEEP_SEC if idle > _IDLE_SPIN else 0)
+                continue
+            idle = 0
+            if not eng.handle(recs):
+                break
+    except Exception as e:
+        log.exception(f"[COMPUTE] failed: {e}")
+    finally:
+        conn.send(eng.stats())
+        conn.close()
+        rin.close()
+        rout.close()
+
+
+class ComputeProcess:
+    """주(Qt) 프로세스 쪽 핸들: 계산 프로세스를 띄우고 링 두 개로 틱/상태를 보내고 의도를 받는다
+
+    입력 링이 가득 차면 틱을 버리지 않고 계산 쪽이 따라잡을 때까지 기다린다 (n_wait 로 집계).
+    """
+
+    def __init__(self, cfg: BotConfig, spill_root: Optional[Path] = None, capacity: int = 1 << 16,
+                 out_capacity: int = 1 << 12) -> None:
+        self.rin = ShmRing.create(IN_DTYPE, capacity)
+        self.rout = ShmRing.create(OUT_DTYPE, out_capacity)
+        ctx = mp.get_context("spawn")    # Qt/COM 상태를 물려받지 않도록 (Windows 는 어차피 spawn)
+        self._conn, child = ctx.Pipe(duplex=False)
+        self.proc = ctx.Process(
+            target=compute_main, name="compute", daemon=True,
+            args=(self.rin.name, self.rout.name, capacity, out_capacity, cfg,
+                  str(spill_root) if spill_root is not None else None, child),
+        )
+        self.proc.start()
+        child.close()
+        self.n_wait = 0
+        self._ready = False
+        self.result: Dict[str, object] = {}
+
+    def wait_ready(self, timeout: float = 30.0) -> bool:
+        """계산 프로세스가 링에 붙을 때까지 대기 (안 기다려도 틱은 링에 쌓인다)"""
+        if self._ready:
+            return True
+        if self._conn.poll(timeout):
+            try:
+                self._ready = bool(self._conn.recv().get("ready"))
+            except EOFError:
+                return False    # 기동 중 죽음 (spawn 실패 등)
+        return self._ready
+
+    def _push(self, rec: tuple) -> None:
+        if self.rin.push(rec):
+            return
+        self.n_wait += 1
+        while not self.rin.push(rec):
+            if not self.proc.is_alive():
+                raise RuntimeError("compute process exited")
+            time.sleep(0)
+
+    def push_tick(self, code: str, price: float, volume: int, ts_ms: int, t_ns: int) -> None:
+        self._push((K_TICK, code.encode(), ts_ms, price, 0.0, 0.0, 0.0, volume, t_ns))
+
+    def push_pos(self, code: str, qty: int, avg_price: float) -> None:
+        self._push((K_POS, code.encode(), 0, avg_price, 0.0, 0.0, 0.0, qty, 0))
+
+    def push_flush(self, now_ms: int) -> None:
+        self._push((K_FLUSH, b"", now_ms, 0.0, 0.0, 0.0, 0.0, 0, 0))
+
+    def push_universe(self, added, removed) -> None:
+        for s in removed:
+            self._push((K_UNIV, s.encode(), 0, 0.0, 0.0, 0.0, 0.0, 0, 0))
+        for s in added:
+            self._push((K_UNIV, s.encode(), 0, 0.0, 0.0, 0.0, 0.0, 1, 0))
+
+    def push_gate(self, allow: bool) -> None:
+        self._push((K_GATE, b"", 0, 0.0, 0.0, 0.0, 0.0, int(allow), 0))
+
+    def push_bars(self, code: str, bars: np.ndarray) -> None:
+        b = code.encode()
+        for ts, o, h, lo, c, v in bars.tolist():
+            self._push((K_BAR, b, ts, o, h, lo, c, int(v), 0))
+        self._push((K_SEEDED, b, 0, 0.0, 0.0, 0.0, 0.0, 0, 0))
+
+    def push_forget(self, code: str) -> None:
+        self._push((K_FORGET, code.encode(), 0, 0.0, 0.0, 0.0, 0.0, 0, 0))
+
+    def intents(self) -> List[Intent]:
+        """쌓인 주문 의도를 Signal 로 (없으면 빈 리스트)"""
+        out: List[Intent] = []
+        recs = self.rout.pop()
+        for side, reason, code, qty, price, ts, t_ns in recs.tolist():
+            sig = Signal(
+                symbol=code.decode(), side=Side.BUY if side > 0 else Side.SELL, qty=int(qty),
+                reason=REASONS[reason] if 0 <= reason < len(REASONS) else "compute",
+            )
+            out.append((sig, t_ns))
+        return out
+
+    def close(self, timeout: float = 5.0) -> Dict[str, object]:
+        """K_STOP 을 보내고 종료를 기다린다. 계산 프로세스 stats 반환
+
+        기다리는 동안 의도 링을 비운다 (버림). 의도 링이 가득 차 있으면 계산 쪽이 _send 에서
+        멈춰 K_STOP 을 읽지 못하기 때문.
+        """
+        if self.proc.is_alive():
+            deadline = time.monotonic() + timeout
+            stop = (K_STOP, b"", 0, 0.0, 0.0, 0.0, 0.0, 0, 0)
+            while not self.rin.push(stop):
+                self.rout.pop()
+                if not self.proc.is_alive() or time.monotonic() >= deadline:
+                    break
+                time.sleep(0)
+            self.wait_ready(max(0.0, deadline - time.monotonic()))
+            while time.monotonic() < deadline:
+                self.rout.pop()
+                alive = self.proc.is_alive()
+                if self._conn.poll(0.01):
+                    try:
+                        self.result = self._conn.recv()
+                    except EOFError:
+                        pass
+                    break
+                if not alive:
+                    break
+            self.proc.join(max(0.0, deadline - time.monotonic()))
+            if self.proc.is_alive():
+                self.proc.terminate()
+        self.rin.close()
+        self.rout.close()
+        return self.result
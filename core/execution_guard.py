@@ -1,51 +1,125 @@
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Tuple, Optional
-import time
+from typing import Deque, Dict, List, Tuple, Optional
 
-from core.types import Order
+from core.clock import Clock, WALL_CLOCK
+from core.types import Order, Side
+
+_NS = 1_000_000_000
 
 
 @dataclass
 class GuardConfig:
     max_orders_per_minute: int = 10
     min_seconds_between_orders: int = 1
+    max_orders_per_symbol_per_minute: int = 3
+    max_orders_per_side_per_minute: int = 0      # 0 = 제한 없음
+    kiwoom_orders_per_sec: int = 5               # 키움 주문 제한 (초당 5회)
+
+
+class SlidingWindow:
+    """window_ns 안에 limit 건까지 허용하는 슬라이딩 윈도우
+
+    기록 시각(단조 정수 ns)을 deque 에 쌓고 만료분은 앞에서 버린다.
+    각 기록은 한 번 들어가고 한 번 나가므로 wait_ns/record 는 분할상환 O(1).
+    """
+
+    __slots__ = ("limit", "window_ns", "_q")
+
+    def __init__(self, limit: int, window_sec: float) -> None:
+        self.limit = int(limit)
+        self.window_ns = int(window_sec * _NS)
+        self._q: Deque[int] = deque()
+
+    def wait_ns(self, now: int) -> int:
+        """다음 자리가 날 때까지 남은 ns (0 = 지금 가능)"""
+        q = self._q
+        edge = now - self.window_ns
+        while q and q[0] <= edge:
+            q.popleft()
+        if len(q) < self.limit:
+            return 0
+        return q[-self.limit] - edge
+
+    def record(self, now: int) -> None:
+        self._q.append(now)
+
+    def __len__(self) -> int:
+        return len(self._q)
 
 
 class ExecutionGuard:
-    """주문 폭주/중복 방지용 가드"""
+    """주문 폭주/중복 방지용 가드
+
+    예산별 슬라이딩 윈도우 (전역 간격, 전역 분당, 키움 초당, 종목별 분당, 매수/매도별 분당, 전략별 분당).
+    여러 전략이 한 계좌를 같이 쓰면 전역/종목 예산은 공유하고 set_quota() 로 전략마다 몫을 따로 둔다.
+    check() 는 막힌 경우 다음 자리까지의 대기시간을 함께 돌려줘 호출측이 재시도 시점을 잡을 수 있다.
+    """
 
-    def __init__(self, cfg: GuardConfig) -> None:
+    def __init__(self, cfg: GuardConfig, clock: Optional[Clock] = None) -> None:
         self.cfg = cfg
-        self._count_by_min: Dict[str, int] = {}
-        self._last_order_ts: float = 0.0
-
-    def begin_tick(self, ts_sec: str) -> None:
-        minute_key = ts_sec[:16]
-        if minute_key not in self._count_by_min:
-            # 오래된 키 정리
-            keys = sorted(self._count_by_min.keys())
-            if len(keys) > 10:
-                for k in keys[:-5]:
-                    self._count_by_min.pop(k, None)
-
-    def allow_order(self, ts_sec: str, order: Order) -> Tuple[bool, str]:
-        self.begin_tick(ts_sec)
-
-        # 1) 전역 주문 간 최소 간격
-        now = time.time()
-        if now - self._last_order_ts < float(self.cfg.min_seconds_between_orders):
-            return False, "min_seconds_between_orders"
-
-        # 2) 분당 주문 제한
-        minute_key = ts_sec[:16]
-        cnt = self._count_by_min.get(minute_key, 0)
-        if cnt >= int(self.cfg.max_orders_per_minute):
-            return False, "rate_limit_per_minute"
-
-        return True, "ok"
-
-    def record_order(self, ts_sec: str, symbol: str) -> None:
-        minute_key = ts_sec[:16]
-        self._count_by_min[minute_key] = self._count_by_min.get(minute_key, 0) + 1
-        self._last_order_ts = time.time()
+        self.clock = clock or WALL_CLOCK
+        self._global: List[Tuple[str, SlidingWindow]] = []
+        if cfg.min_seconds_between_orders > 0:
+            self._global.append(("min_seconds_between_orders", SlidingWindow(1, cfg.min_seconds_between_orders)))
+        if cfg.kiwoom_orders_per_sec > 0:
+            self._global.append(("kiwoom_rate_per_sec", SlidingWindow(cfg.kiwoom_orders_per_sec, 1)))
+        if cfg.max_orders_per_minute > 0:
+            self._global.append(("rate_limit_per_minute", SlidingWindow(cfg.max_orders_per_minute, 60)))
+        self._by_symbol: Dict[str, SlidingWindow] = {}
+        self._by_side: Dict[Side, SlidingWindow] = {}
+        self._by_strategy: Dict[str, SlidingWindow] = {}
+
+    def set_quota(self, strategy: str, per_minute: int) -> None:
+        """전략별 분당 주문 한도 (0 이하면 제한 없음)"""
+        if per_minute > 0:
+            self._by_strategy[strategy] = SlidingWindow(per_minute, 60)
+        else:
+            self._by_strategy.pop(strategy, None)
+
+    def _windows(self, symbol: str, side: Optional[Side], create: bool,
+                 strategy: Optional[str] = None) -> List[Tuple[str, SlidingWindow]]:
+        out = list(self._global)
+        if self.cfg.max_orders_per_symbol_per_minute > 0:
+            w = self._by_symbol.get(symbol)
+            if w is None and create:
+                w = self._by_symbol[symbol] = SlidingWindow(self.cfg.max_orders_per_symbol_per_minute, 60)
+            if w is not None:
+                out.append(("symbol_rate_per_minute", w))
+        if side is not None and self.cfg.max_orders_per_side_per_minute > 0:
+            w = self._by_side.get(side)
+            if w is None and create:
+                w = self._by_side[side] = SlidingWindow(self.cfg.max_orders_per_side_per_minute, 60)
+            if w is not None:
+                out.append(("side_rate_per_minute", w))
+        if strategy is not None:
+            w = self._by_strategy.get(strategy)
+            if w is not None:
+                out.append(("strategy_quota_per_minute", w))
+        return out
+
+    def check(self, order: Order, strategy: Optional[str] = None) -> Tuple[float, str]:
+        """(대기 초, 사유). 대기 0 이면 지금 주문 가능, 아니면 가장 늦게 풀리는 예산의 사유"""
+        now = self.clock.monotonic_ns()
+        wait = 0
+        reason = "ok"
+        for name, w in self._windows(order.symbol, order.side, create=False, strategy=strategy):
+            ns = w.wait_ns(now)
+            if ns > wait:
+                wait = ns
+                reason = name
+        return wait / _NS, reason
+
+    def allow_order(self, order: Order, strategy: Optional[str] = None) -> Tuple[bool, str]:
+        wait, reason = self.check(order, strategy)
+        return wait <= 0, reason
+
+    def forget(self, symbol: str) -> None:
+        """퇴출된 종목의 종목별 윈도우 제거"""
+        self._by_symbol.pop(symbol, None)
+
+    def record_order(self, symbol: str, side: Optional[Side] = None, strategy: Optional[str] = None) -> None:
+        now = self.clock.monotonic_ns()
+        for _, w in self._windows(symbol, side, create=True, strategy=strategy):
+            w.record(now)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Tuple
+
+from data.bar_store import BarStore
+
+# StreamingFeatures 가 한 번에 내는 기본 피처
+BASE_FEATURES = ("ret_1", "ret_5", "ema_5", "ema_20", "rsi_14", "vol_ratio")
+
+FeatureFn = Callable[[BarStore, str], float]
+
+
+class FeatureCache:
+    """(종목, 바 ts, 피처) 메모 캐시 - 여러 전략이 같은 바의 같은 피처를 한 번만 계산
+
+    종목마다 최신 바 ts 의 값만 들고 있다 (바가 닫혀 ts 가 바뀌면 그 종목 메모를 비움).
+    - "score": 공유 ScoreBoard 점수 (바 마감 스코어링 한 번으로 모든 전략이 같이 씀)
+    - BASE_FEATURES: ScoreBoard 의 StreamingFeatures 에서 여섯 개를 한 번에 채움
+    - register(name, fn): fn(store, symbol) -> float 사용자 피처, 처음 요청될 때 계산
+    get(symbol, name="score") 는 ScoreBoard.get 과 같은 모양이라 전략에 scoreboard 대신 넘길 수 있다.
+    """
+
+    def __init__(self, store: BarStore, scoreboard) -> None:
+        self.store = store
+        self.sb = scoreboard
+        self._fns: Dict[str, FeatureFn] = {}
+        self._memo: Dict[str, Tuple[int, Dict[str, float]]] = {}
+        self.n_hit = 0
+        self.n_miss = 0
+
+    def register(self, name: str, fn: FeatureFn) -> None:
+        if name == "score" or name in BASE_FEATURES:
+            raise ValueError(f"feature name is reserved: {name}")
+        self._fns[name] = fn
+
+    def _bar_ts(self, symbol: str) -> int:
+        ts = self.store.view(symbol, "ts", 1)
+        return int(ts[0]) if len(ts) else -1
+
+    def get(self, symbol: str, name: str = "score") -> float:
+        ts = self._bar_ts(symbol)
+        memo = self._memo.get(symbol)
+        if memo is None or memo[0] != ts:
+            memo = self._memo[symbol] = (ts, {})
+        vals = memo[1]
+        v = vals.get(name)
+        if v is not None:
+            self.n_hit += 1
+            return v
+        self.n_miss += 1
+        if name == "score":
+            v = vals[name] = self.sb.get(symbol)
+        elif name in BASE_FEATURES:
+            vals.update(self._base(symbol))
+            v = vals.get(name, float("nan"))
+        else:
+            fn = self._fns.get(name)
+            if fn is None:
+                raise KeyError(f"unknown feature: {name}")
+            v = vals[name] = float(fn(self.store, symbol))
+        return v
+
+    def _base(self, symbol: str) -> Dict[str, float]:
+        f = self.sb.features_for(symbol, self.store)
+        return f if f else {k: float("nan") for k in BASE_FEATURES}
+
+    def discard(self, symbol: str) -> None:
+        self._memo.pop(symbol, None)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.n_hit + self.n_miss
+        return {
+            "symbols": len(self._memo),
+            "hit": self.n_hit,
+            "miss": self.n_miss,
+            "hit_rate": round(self.n_hit / total, 4) if total else 0.0,
+        }
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import List, Dict
+from collections import deque
+from typing import Deque, List, Dict
 
 def ema(values: List[float], period: int) -> float:
     if not values:
@@ -45,3 +46,108 @@ def features_from_bars(bars: List[dict]) -> Dict[str, float]:
     avg5 = (sum(vols[-6:-1]) / 5) if len(vols) >= 6 else (sum(vols) / len(vols))
     f["vol_ratio"] = (vols[-1] / avg5) if avg5 > 0 else 1.0
     return f
+
+
+class WindowEma:
+    """ema(values[-window:], period) 와 동일한 값을 바 1개당 O(1)로 유지.
+
+    ema() 는 윈도우 첫 값으로 시드한 뒤 나머지를 접어 넣으므로
+    e = k * sum_{j<n-1} d^j v[-1-j] + d^(n-1) v[-n]  (d = 1-k) 이다.
+    S = sum_{j<n} d^j v[-1-j] 를 슬라이딩으로 갱신해서 같은 값을 만든다.
+    """
+
+    def __init__(self, period: int, window: int) -> None:
+        self.k = 2 / (period + 1)
+        self.d = 1 - self.k
+        self.window = int(window)
+        self._d_pow_window = self.d ** self.window
+        self._vals: Deque[float] = deque(maxlen=self.window)
+        self._s = 0.0
+
+    def update(self, v: float) -> None:
+        if len(self._vals) == self.window:
+            self._s = v + self.d * self._s - self._d_pow_window * self._vals[0]
+        else:
+            self._s = v + self.d * self._s
+        self._vals.append(v)
+
+    def value(self) -> float:
+        n = len(self._vals)
+        if n == 0:
+            return 0.0
+        oldest = self._vals[0]
+        tail = self.d ** (n - 1) * oldest
+        return self.k * (self._s - tail) + tail
+
+
+class StreamingFeatures:
+    """features_from_bars() 의 종목별 스트리밍 버전.
+
+    닫힌 바 하나마다 update() 를 호출하면 전체 히스토리를 다시 훑지 않고
+    ret_1/ret_5/ema_5/ema_20/rsi_14/vol_ratio 를 갱신한다.
+    """
+
+    MIN_BARS = 20
+
+    def __init__(self, rsi_period: int = 14) -> None:
+        self.n = 0
+        self.rsi_period = int(rsi_period)
+        self._ema5 = WindowEma(5, 20)
+        self._ema20 = WindowEma(20, 40)
+        self._closes: Deque[float] = deque(maxlen=max(6, self.rsi_period + 1))
+        self._vols: Deque[float] = deque(maxlen=6)
+        self._diffs: Deque[float] = deque(maxlen=self.rsi_period)
+        self._gains = 0.0
+        self._losses = 0.0
+        self._n_losses = 0
+
+    def update(self, close: float, volume: float) -> Dict[str, float]:
+        close = float(close)
+        volume = float(volume)
+        if self._closes:
+            diff = close - self._closes[-1]
+            if len(self._diffs) == self.rsi_period:
+                old = self._diffs[0]
+                if old >= 0:
+                    self._gains -= old
+                else:
+                    self._losses += old
+                    self._n_losses -= 1
+            self._diffs.append(diff)
+            if diff >= 0:
+                self._gains += diff
+            else:
+                self._losses -= diff
+                self._n_losses += 1
+            if self._n_losses == 0:
+                # 누적 합의 부동소수 잔차 제거 (rsi() 의 losses == 0 분기와 일치)
+                self._losses = 0.0
+        self._closes.append(close)
+        self._vols.append(volume)
+        self._ema5.update(close)
+        self._ema20.update(close)
+        self.n += 1
+        return self.features()
+
+    def _rsi(self) -> float:
+        if self.n < self.rsi_period + 1:
+            return 50.0
+        if self._n_losses == 0:
+            return 100.0
+        rs = max(0.0, self._gains) / self._losses
+        return 100 - (100 / (1 + rs))
+
+    def features(self) -> Dict[str, float]:
+        if self.n < self.MIN_BARS:
+            return {}
+        closes = self._closes
+        vols = self._vols
+        f: Dict[str, float] = {}
+        f["ret_1"] = pct_change(closes[-1], closes[-2])
+        f["ret_5"] = pct_change(closes[-1], closes[-6])
+        f["ema_5"] = self._ema5.value()
+        f["ema_20"] = self._ema20.value()
+        f["rsi_14"] = self._rsi()
+        avg5 = (vols[0] + vols[1] + vols[2] + vols[3] + vols[4]) / 5
+        f["vol_ratio"] = (vols[-1] / avg5) if avg5 > 0 else 1.0
+        return f
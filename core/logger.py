@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+import time
+from collections import deque
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
 from pathlib import Path
+from typing import Deque, Dict, Optional, TextIO, Tuple
 
 from core.settings import LOG_DIR
 
-def setup_logger(name: str = "bot") -> logging.Logger:
+def setup_logger(name: str = "bot", filename: str = "bot.log") -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
     logger.propagate = False
@@ -28,17 +32,189 @@ def setup_logger(name: str = "bot") -> logging.Logger:
     logger.addHandler(ch)
 
     fh = RotatingFileHandler(
-        LOG_DIR / "bot.log", maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
+        LOG_DIR / filename, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
     )
     fh.setFormatter(fmt)
     logger.addHandler(fh)
 
     return logger
 
-def log_jsonl(path: str | Path, payload: dict) -> None:
+class JsonlSink:
+    """log_jsonl 비동기 백엔드: 경로별 파일 핸들 유지 + 백그라운드 writer 스레드
+
+    호출 스레드(Qt)는 bounded 큐에 넣기만 하고, 직렬화/쓰기/flush 는 writer 가 배치로 처리.
+    - flush 트리거: 버퍼 flush_bytes 이상 또는 마지막 flush 후 flush_sec 경과
+    - 큐가 가득 차면 policy="drop_oldest" 는 가장 오래된 레코드를 버리고,
+      policy="block" 은 자리가 날 때까지 호출자를 기다리게 한다
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10_000,
+        policy: str = "block",
+        flush_bytes: int = 64 * 1024,
+        flush_sec: float = 1.0,
+    ) -> None:
+        if policy not in ("drop_oldest", "block"):
+            raise ValueError(f"unknown backpressure policy: {policy}")
+        self.max_queue = int(max_queue)
+        self.policy = policy
+        self.flush_bytes = int(flush_bytes)
+        self.flush_sec = float(flush_sec)
+
+        self._q: Deque[Tuple[Path, dict]] = deque()
+        self._cv = threading.Condition()
+        self._files: Dict[Path, TextIO] = {}
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._force = False    # flush() 요청: writer 가 flush_sec 을 기다리지 않고 바로 _flush_files
+
+        # counters
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="jsonl-sink", daemon=True)
+        self._thread.start()
+
+    # ------------------ producer side ------------------
+    def write(self, path: Path, obj: dict) -> None:
+        with self._cv:
+            if self._closed:
+                return
+            if len(self._q) >= self.max_queue:
+                if self.policy == "drop_oldest":
+                    self._q.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._q) >= self.max_queue and not self._closed:
+                        self._cv.wait()
+            self._q.append((path, obj))
+            self.enqueued += 1
+            self._cv.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cv:
+            queued = len(self._q)
+        return {
+            "queued": queued,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "errors": self.errors,
+        }
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """큐를 비우고 파일을 flush 할 때까지 대기. timeout 안에 못 끝내면 False"""
+        deadline = time.monotonic() + timeout
+        with self._cv:
+            if not self._thread.is_alive():
+                return not self._q
+            self._force = True
+            self._cv.notify_all()
+            while self._force and self._thread.is_alive():
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cv.wait(left)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        self.flush(timeout)
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+        self._thread.join(timeout)
+
+    # ------------------ writer thread ------------------
+    def _file(self, path: Path) -> TextIO:
+        f = self._files.get(path)
+        if f is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            f = self._files[path] = path.open("a", encoding="utf-8")
+        return f
+
+    def _flush_files(self) -> None:
+        for f in self._files.values():
+            try:
+                f.flush()
+            except Exception:
+                self.errors += 1
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+    def _run(self) -> None:
+        while True:
+            with self._cv:
+                while not self._q and not self._closed and not self._force:
+                    if self._pending_bytes:
+                        left = self.flush_sec - (time.monotonic() - self._last_flush)
+                        if left <= 0:
+                            break
+                        self._cv.wait(left)
+                    else:
+                        self._cv.wait()
+                batch = list(self._q)
+                self._q.clear()
+                closing = self._closed
+                force = self._force
+                self._cv.notify_all()  # block 정책 producer 깨우기
+
+            for path, obj in batch:
+                try:
+                    line = json.dumps(obj, ensure_ascii=False) + "\n"
+                    self._file(path).write(line)
+                    self._pending_bytes += len(line)
+                    self.written += 1
+                except Exception:
+                    self.errors += 1
+
+            if (self._pending_bytes >= self.flush_bytes
+                    or time.monotonic() - self._last_flush >= self.flush_sec
+                    or force or closing or not batch):
+                self._flush_files()
+            if force:
+                with self._cv:
+                    if not self._q:
+                        self._force = False    # 그 사이 들어온 레코드가 있으면 다음 배치까지 쓰고 flush
+                    self._cv.notify_all()
+
+            if closing:
+                for f in self._files.values():
+                    try:
+                        f.close()
+                    except Exception:
+                        self.errors += 1
+                self._files.clear()
+                with self._cv:
+                    self._cv.notify_all()
+                return
+
+
+_SINK: Optional[JsonlSink] = None
+
+
+def install_jsonl_sink(sink: Optional[JsonlSink]) -> Optional[JsonlSink]:
+    """log_jsonl 를 sink 로 보냄 (None 이면 동기 쓰기로 복귀). 이전 sink 반환"""
+    global _SINK
+    prev, _SINK = _SINK, sink
+    return prev
+
+
+def get_jsonl_sink() -> Optional[JsonlSink]:
+    return _SINK
+
+
+def log_jsonl(path: str | Path, payload: dict, ts: Optional[str] = None) -> None:
     p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
     obj = dict(payload)
-    obj["ts"] = datetime.now().isoformat(timespec="milliseconds")
+    obj["ts"] = ts or datetime.now().isoformat(timespec="milliseconds")
+    sink = _SINK
+    if sink is not None:
+        sink.write(p, obj)
+        return
+    p.parent.mkdir(parents=True, exist_ok=True)
     with p.open("a", encoding="utf-8") as f:
         f.write(json.dumps(obj, ensure_ascii=False) + "\n")
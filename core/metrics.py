@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.logger import log_jsonl
+
+# 로그-선형 버킷: 2배 구간마다 16칸 (상대오차 <= 1/16), 0ns ~ 약 2^40ns(18분)
+_SUB_BITS = 4
+_SUB = 1 << _SUB_BITS
+_N_BUCKETS = _SUB + (40 << _SUB_BITS)
+
+
+class Histogram:
+    """고정 버킷(HDR 스타일) 지연시간 히스토그램
+
+    record() 는 리스트 append 뿐이고, 버킷 집계는 _FOLD_AT 개마다(또는 조회 시)
+    NumPy 로 한 번에 한다. 메모리는 버킷 배열 + 최대 _FOLD_AT 개 샘플로 고정.
+    """
+
+    __slots__ = ("counts", "count", "total", "max", "_pending")
+
+    _FOLD_AT = 4096
+
+    def __init__(self) -> None:
+        self.counts = np.zeros(_N_BUCKETS, dtype=np.int64)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self._pending: List[int] = []
+
+    def record(self, v: int) -> None:
+        p = self._pending
+        p.append(v)
+        if len(p) >= self._FOLD_AT:
+            self._fold()
+
+    def record_many(self, values: Iterable[int]) -> None:
+        """여러 샘플을 한 번에 (NumPy 배열이면 tolist 한 번)"""
+        p = self._pending
+        p.extend(values.tolist() if isinstance(values, np.ndarray) else values)
+        if len(p) >= self._FOLD_AT:
+            self._fold()
+
+    def _fold(self) -> None:
+        if not self._pending:
+            return
+        v = np.asarray(self._pending, dtype=np.int64)
+        self._pending = []
+        np.maximum(v, 0, out=v)
+        # bit_length == frexp 지수 (2^53 미만 정수는 정확)
+        _, e = np.frexp(v.astype(np.float64))
+        shift = np.maximum(e.astype(np.int64) - _SUB_BITS - 1, 0)
+        idx = np.where(v < _SUB, v, _SUB + (shift << _SUB_BITS) + ((v >> shift) - _SUB))
+        np.minimum(idx, _N_BUCKETS - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=_N_BUCKETS)
+        self.count += len(v)
+        self.total += int(v.sum())
+        self.max = max(self.max, int(v.max()))
+
+    @staticmethod
+    def _upper(idx: int) -> int:
+        if idx < _SUB:
+            return idx
+        shift = (idx - _SUB) >> _SUB_BITS
+        mant = _SUB + ((idx - _SUB) & (_SUB - 1))
+        return ((mant + 1) << shift) - 1
+
+    def percentile(self, q: float) -> int:
+        self._fold()
+        if self.count == 0:
+            return 0
+        target = max(1, int(round(self.count * q / 100.0)))
+        i = int(np.searchsorted(np.cumsum(self.counts), target))
+        return min(self._upper(i), self.max)
+
+    def reset(self) -> None:
+        self.counts[:] = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self._pending = []
+
+    def summary(self) -> Dict[str, float]:
+        self._fold()
+        return {
+            "n": self.count,
+            "p50_us": self.percentile(50) / 1000.0,
+            "p99_us": self.percentile(99) / 1000.0,
+            "max_us": self.max / 1000.0,
+            "mean_us": (self.total / self.count / 1000.0) if self.count else 0.0,
+        }
+
+
+class Metrics:
+    """단계별 지연시간 계측 (decode, bar, score, decide, guard, send, timer.*)
+
+        t0 = perf_counter_ns()
+        ...
+        METRICS.record("bar", perf_counter_ns() - t0)
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.hists: Dict[str, Histogram] = {}
+
+    def hist(self, stage: str) -> Histogram:
+        h = self.hists.get(stage)
+        if h is None:
+            h = self.hists[stage] = Histogram()
+        return h
+
+    def record(self, stage: str, ns: int) -> None:
+        if not self.enabled:
+            return
+        h = self.hists.get(stage)
+        if h is None:
+            h = self.hists[stage] = Histogram()
+        # Histogram.record 인라인 (핫패스 호출 1단계 절약)
+        p = h._pending
+        p.append(ns)
+        if len(p) >= Histogram._FOLD_AT:
+            h._fold()
+
+    def timed(self, stage: str, fn: Callable[[], None]) -> Callable[[], None]:
+        """인자 없는 콜백(QTimer 등)을 감싸 실행 시간을 stage 로 기록"""
+        def _wrapped() -> None:
+            t0 = perf_counter_ns()
+            try:
+                fn()
+            finally:
+                self.record(stage, perf_counter_ns() - t0)
+        return _wrapped
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for k, h in sorted(self.hists.items()):
+            s = h.summary()
+            if s["n"]:
+                out[k] = s
+        return out
+
+    def dump(self, path: str | Path, ts: Optional[str] = None, reset: bool = True) -> None:
+        """구간 p50/p99/max 를 metrics JSONL 에 한 줄로 기록 (기본: 기록 후 리셋)"""
+        snap = self.snapshot()
+        if not snap:
+            return
+        log_jsonl(path, {"stages": snap}, ts=ts)
+        if reset:
+            for h in self.hists.values():
+                h.reset()
+
+
+METRICS = Metrics()
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from core.clock import Clock, WALL_CLOCK
+from core.types import Side
+
+
+class OrderState(Enum):
+    PENDING = "PENDING"        # 전송함, 주문번호 미수신
+    ACCEPTED = "ACCEPTED"      # 접수
+    PARTIAL = "PARTIAL"        # 일부 체결
+    FILLED = "FILLED"
+    CANCELLED = "CANCELLED"    # 취소/정정으로 대체/TR 에서 사라짐
+    REJECTED = "REJECTED"
+
+
+OPEN_STATES = (OrderState.PENDING, OrderState.ACCEPTED, OrderState.PARTIAL)
+
+_NEXT = {
+    OrderState.PENDING: {OrderState.ACCEPTED, OrderState.PARTIAL, OrderState.FILLED, OrderState.CANCELLED, OrderState.REJECTED},
+    OrderState.ACCEPTED: {OrderState.ACCEPTED, OrderState.PARTIAL, OrderState.FILLED, OrderState.CANCELLED, OrderState.REJECTED},
+    OrderState.PARTIAL: {OrderState.PARTIAL, OrderState.FILLED, OrderState.CANCELLED},
+    OrderState.FILLED: set(),
+    OrderState.CANCELLED: set(),
+    OrderState.REJECTED: set(),
+}
+
+
+class BookOrder(NamedTuple):
+    """주문 1건의 불변 레코드. 갱신 시 _replace 로 새 레코드로 교체"""
+    order_no: str              # PENDING 동안은 임시키 "P<seq>"
+    symbol: str
+    side: Side
+    qty: int
+    filled: int = 0
+    price: float = 0.0
+    state: OrderState = OrderState.PENDING
+    orig_order_no: str = ""
+    updated: float = 0.0
+    src: str = ""
+
+    @property
+    def is_open(self) -> bool:
+        return self.state in OPEN_STATES
+
+    @property
+    def open_qty(self) -> int:
+        return self.qty - self.filled if self.state in OPEN_STATES else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "order_no": self.order_no,
+            "symbol": self.symbol,
+            "side": self.side.value,
+            "qty": self.qty,
+            "filled": self.filled,
+            "price": self.price,
+            "state": self.state.value,
+            "orig_order_no": self.orig_order_no,
+            "updated": self.updated,
+            "src": self.src,
+        }
+
+
+class OrderBookSnapshot:
+    """version 시점의 읽기 전용 뷰 (order_no -> BookOrder). 변경이 없으면 같은 객체를 재사용"""
+
+    __slots__ = ("version", "orders")
+
+    def __init__(self, version: int, orders: Mapping[str, BookOrder]) -> None:
+        self.version = version
+        self.orders = orders
+
+    def working(self, side: Optional[Side] = None) -> List[BookOrder]:
+        return [o for o in self.orders.values() if o.is_open and (side is None or o.side == side)]
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+
+class OrderBook:
+    """주문 생애주기 장부 (PENDING -> ACCEPTED -> PARTIAL -> FILLED/CANCELLED/REJECTED)
+
+    인덱스: order_no, 종목별, 상태별, 매수/매도별 미체결. 종목x방향 미체결 수량은 카운터로 유지해 O(1).
+    체잔(apply_chejan)과 미체결 TR(merge_tr)은 있는 레코드에 증분 병합한다.
+    상태를 바꾸는 연산마다 version 이 올라가고 snapshot() 은 version 별로 한 번만 만든다.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None, tr_grace_sec: float = 5.0, pending_grace_sec: float = 60.0) -> None:
+        self.clock = clock or WALL_CLOCK
+        # TR 응답에 없더라도 최근 tr_grace_sec 안에 갱신된 주문은 닫지 않는다 (응답과 체잔 사이 경합)
+        self.tr_grace_sec = float(tr_grace_sec)
+        # 체잔이 끝내 안 온 PENDING (OnReceiveMsg 로만 거부 통보 등) 은 이 시간이 지나면 TR 병합 때 REJECTED
+        self.pending_grace_sec = float(pending_grace_sec)
+        self.version = 0
+        self._orders: Dict[str, BookOrder] = {}
+        self._by_symbol: Dict[str, Dict[str, None]] = {}
+        self._by_state: Dict[OrderState, Dict[str, None]] = {s: {} for s in OrderState}
+        self._open_qty: Dict[Tuple[str, Side], int] = {}
+        self._pending_seq = 0
+        self._snap: Optional[OrderBookSnapshot] = None
+
+    # ------------------ queries (O(1)) ------------------
+    def get(self, order_no: str) -> Optional[BookOrder]:
+        return self._orders.get(order_no)
+
+    def open_qty(self, symbol: str, side: Optional[Side] = None) -> int:
+        if side is not None:
+            return self._open_qty.get((symbol, side), 0)
+        return self._open_qty.get((symbol, Side.BUY), 0) + self._open_qty.get((symbol, Side.SELL), 0)
+
+    def in_state(self, state: OrderState) -> List[BookOrder]:
+        return [self._orders[k] for k in self._by_state[state]]
+
+    def working(self, side: Optional[Side] = None) -> List[BookOrder]:
+        """미체결(PENDING/ACCEPTED/PARTIAL) 주문, side 지정 시 해당 방향만"""
+        out: List[BookOrder] = []
+        for st in OPEN_STATES:
+            for k in self._by_state[st]:
+                o = self._orders[k]
+                if side is None or o.side == side:
+                    out.append(o)
+        return out
+
+    def for_symbol(self, symbol: str) -> List[BookOrder]:
+        return [self._orders[k] for k in self._by_symbol.get(symbol, ())]
+
+    def n_open(self) -> int:
+        return sum(len(self._by_state[st]) for st in OPEN_STATES)
+
+    def snapshot(self) -> OrderBookSnapshot:
+        snap = self._snap
+        if snap is None or snap.version != self.version:
+            snap = self._snap = OrderBookSnapshot(self.version, MappingProxyType(dict(self._orders)))
+        return snap
+
+    # ------------------ index maintenance ------------------
+    def _put(self, new: BookOrder, old_key: Optional[str] = None) -> BookOrder:
+        key = old_key if old_key is not None else new.order_no
+        old = self._orders.pop(key, None)
+        if old is not None:
+            self._by_state[old.state].pop(key, None)
+            self._by_symbol.get(old.symbol, {}).pop(key, None)
+            if old.open_qty:
+                k = (old.symbol, old.side)
+                left = self._open_qty[k] - old.open_qty
+                if left:
+                    self._open_qty[k] = left
+                else:
+                    del self._open_qty[k]
+        new = new._replace(updated=self.clock.time())
+        self._orders[new.order_no] = new
+        self._by_state[new.state][new.order_no] = None
+        self._by_symbol.setdefault(new.symbol, {})[new.order_no] = None
+        if new.open_qty:
+            k = (new.symbol, new.side)
+            self._open_qty[k] = self._open_qty.get(k, 0) + new.open_qty
+        self.version += 1
+        return new
+
+    def _transition(self, o: BookOrder, state: OrderState, old_key: Optional[str] = None, **changes: Any) -> Optional[BookOrder]:
+        if state not in _NEXT[o.state]:
+            return None
+        return self._put(o._replace(state=state, **changes), old_key=old_key)
+
+    def _match_pending(self, symbol: str, side: Optional[Side]) -> Optional[BookOrder]:
+        # 주문번호가 처음 보이면 같은 종목/방향의 가장 오래된 PENDING 으로 간주 (FIFO)
+        for k in self._by_state[OrderState.PENDING]:
+            o = self._orders[k]
+            if o.symbol == symbol and (side is None or o.side == side):
+                return o
+        return None
+
+    # ------------------ local orders ------------------
+    def add_pending(self, symbol: str, side: Side, qty: int, price: float = 0.0) -> str:
+        """SendOrder 직전 등록. 임시키를 돌려주며 체잔 수신 시 주문번호로 바뀐다"""
+        self._pending_seq += 1
+        key = f"P{self._pending_seq}"
+        self._put(BookOrder(key, symbol, side, int(qty), price=float(price or 0.0), src="LOCAL"))
+        return key
+
+    def reject(self, order_no: str) -> None:
+        o = self._orders.get(order_no)
+        if o is not None:
+            self._transition(o, OrderState.REJECTED)
+
+    # ------------------ chejan ------------------
+    def apply_chejan(self, ev: Any) -> Optional[BookOrder]:
+        """gubun 0 체잔 이벤트 병합 (ChejanEvent 의 order_no/status/kind/side/order_qty/unfilled/orig_order_no)"""
+        if not ev.order_no:
+            return None
+        kind = ev.kind or ""
+        status = ev.status or ""
+
+        if "취소" in kind or "정정" in kind:
+            # 취소/정정 주문: 확인 시 원주문 종료, 정정은 새 주문번호로 이어짐
+            if "확인" in status and ev.orig_order_no:
+                orig = self._orders.get(ev.orig_order_no)
+                if orig is not None:
+                    self._transition(orig, OrderState.CANCELLED, src="CHEJAN")
+            if "정정" not in kind or "확인" in status:
+                return None
+
+        if "거부" in status:
+            o = self._orders.get(ev.order_no) or self._match_pending(ev.code, ev.side)
+            if o is not None:
+                return self._transition(o, OrderState.REJECTED, old_key=o.order_no, order_no=ev.order_no, src="CHEJAN")
+            return None
+
+        o = self._orders.get(ev.order_no)
+        old_key = None
+        if o is None:
+            # 정정 주문은 로컬 PENDING 과 무관 (원주문에서 이어지는 새 주문번호)
+            o = None if "정정" in kind else self._match_pending(ev.code, ev.side)
+            if o is not None:
+                old_key = o.order_no
+            elif ev.side is None:
+                return None
+            else:
+                o = BookOrder(ev.order_no, ev.code, ev.side, int(ev.order_qty), state=OrderState.ACCEPTED)
+
+        qty = int(ev.order_qty) or o.qty
+        filled = max(o.filled, qty - int(ev.unfilled)) if "체결" in status else o.filled
+        if filled >= qty > 0:
+            state = OrderState.FILLED
+        elif filled > 0:
+            state = OrderState.PARTIAL
+        else:
+            state = OrderState.ACCEPTED
+        price = float(ev.order_price) if ev.order_price else o.price
+        return self._transition(
+            o, state, old_key=old_key,
+            order_no=ev.order_no, qty=qty, filled=filled, price=price,
+            orig_order_no=ev.orig_order_no or o.orig_order_no, src="CHEJAN",
+        )
+
+    # ------------------ TR reconciliation ------------------
+    def merge_tr(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """opt10075 미체결 행 병합. 변경 건수 반환
+
+        TR 에 없는 접수/부분체결은 tr_grace_sec 이후 CANCELLED, 주문번호를 끝내 못 받은 PENDING 은
+        pending_grace_sec 이후 REJECTED (미체결 수량이 남아 그 종목 청산을 영구히 막지 않도록).
+        """
+        v0 = self.version
+        seen: Dict[str, None] = {}
+        for r in rows:
+            ono = str(r.get("order_no", "")).strip()
+            side = r.get("side")
+            if not ono or side is None:
+                continue
+            qty = int(r.get("order_qty", 0))
+            unfilled = int(r.get("unfilled", 0))
+            if unfilled <= 0:
+                continue
+            seen[ono] = None
+            filled = max(0, qty - unfilled)
+            state = OrderState.PARTIAL if filled > 0 else OrderState.ACCEPTED
+            o = self._orders.get(ono)
+            if o is None:
+                self._put(BookOrder(ono, str(r.get("code", "")), side, qty, filled=filled, state=state, src="TR"))
+            elif (o.qty, o.filled, o.state) != (qty, filled, state):
+                self._transition(o, state, qty=qty, filled=max(o.filled, filled), src="TR")
+
+        cutoff = self.clock.time() - self.tr_grace_sec
+        for st in (OrderState.ACCEPTED, OrderState.PARTIAL):
+            for k in list(self._by_state[st]):
+                o = self._orders[k]
+                if k not in seen and o.updated <= cutoff:
+                    self._transition(o, OrderState.CANCELLED, src="TR")
+        # PENDING 은 임시키라 TR 행과 맞출 수 없다 (체잔이 오면 주문번호로 바뀌어 위에서 처리됨)
+        cutoff = self.clock.time() - self.pending_grace_sec
+        for k in list(self._by_state[OrderState.PENDING]):
+            o = self._orders[k]
+            if o.updated <= cutoff:
+                self._transition(o, OrderState.REJECTED, src="TR")
+        return self.version - v0
+
+    # ------------------ persistence ------------------
+    def to_state(self) -> List[Dict[str, Any]]:
+        return [o.to_dict() for o in self.working() if o.state != OrderState.PENDING]
+
+    def restore(self, items: Iterable[Dict[str, Any]]) -> None:
+        for d in items:
+            try:
+                o = BookOrder(
+                    order_no=str(d["order_no"]),
+                    symbol=str(d["symbol"]),
+                    side=Side(d["side"]),
+                    qty=int(d["qty"]),
+                    filled=int(d.get("filled", 0)),
+                    price=float(d.get("price", 0.0)),
+                    state=OrderState(d.get("state", "ACCEPTED")),
+                    orig_order_no=str(d.get("orig_order_no", "")),
+                    src="STATE",
+                )
+            except (KeyError, ValueError, TypeError):
+                continue
+            if o.is_open:
+                self._put(o)
+
+    def prune(self, keep_closed: int = 1000) -> None:
+        """종료된 주문이 keep_closed 건을 넘으면 오래된 것부터 제거"""
+        closed = [k for st in (OrderState.FILLED, OrderState.CANCELLED, OrderState.REJECTED) for k in self._by_state[st]]
+        if len(closed) <= keep_closed:
+            return
+        closed.sort(key=lambda k: self._orders[k].updated)
+        for k in closed[: len(closed) - keep_closed]:
+            o = self._orders.pop(k)
+            self._by_state[o.state].pop(k, None)
+            self._by_symbol.get(o.symbol, {}).pop(k, None)
+        self.version += 1
@@ -1,51 +1,91 @@
 from __future__ import annotations
-import time
-from collections import defaultdict, deque
-from typing import Tuple
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Dict, Optional, Tuple
 
+from core.clock import Clock, WALL_CLOCK
 from core.execution_guard import ExecutionGuard
 from core.logger import log_jsonl
+from core.metrics import METRICS, Metrics
+from core.order_book import OrderBook
 from core.settings import LOG_DIR
 from core.types import Order
 
 class OrderManager:
-    def __init__(self, logger, broker, guard: ExecutionGuard) -> None:
+    def __init__(
+        self,
+        logger,
+        broker,
+        guard: ExecutionGuard,
+        clock: Optional[Clock] = None,
+        log_dir: Path = LOG_DIR,
+        metrics: Optional[Metrics] = None,
+        book: Optional[OrderBook] = None,
+    ) -> None:
         self.log = logger
         self.broker = broker
         self.guard = guard
-        self._last_symbol_ts = defaultdict(float)
+        self.clock = clock or WALL_CLOCK
+        self.log_dir = Path(log_dir)
+        self.metrics = metrics or METRICS
+        # 전송 직전 PENDING 으로 등록, 주문번호/상태는 체잔으로 갱신
+        self.book = book if book is not None else OrderBook(clock=self.clock)
+        self._last_symbol_ns: Dict[str, int] = {}
+        # 마지막으로 막힌 주문이 다시 가능해질 때까지 남은 초 (재시도 스케줄용)
+        self.last_wait_sec = 0.0
 
-    def can_order(self, symbol: str, cooldown_sec: int, ts_str: str, order: Order) -> Tuple[bool, str]:
-        now = time.time()
-        if now - self._last_symbol_ts[symbol] < cooldown_sec:
+    def can_order(self, symbol: str, cooldown_sec: int, order: Order, strategy: Optional[str] = None) -> Tuple[bool, str]:
+        self.last_wait_sec = 0.0
+        now = self.clock.monotonic_ns()
+        last = self._last_symbol_ns.get(symbol)
+        if last is not None and now - last < int(cooldown_sec * 1_000_000_000):
+            self.last_wait_sec = (last + int(cooldown_sec * 1_000_000_000) - now) / 1e9
             return False, "symbol_cooldown"
-        ok, reason = self.guard.allow_order(ts_str, order)
-        return ok, reason
+        wait, reason = self.guard.check(order, strategy)
+        if wait > 0:
+            self.last_wait_sec = wait
+            return False, reason
+        return True, reason
 
-    def record_order(self, symbol: str, ts_str: str) -> None:
-        self._last_symbol_ts[symbol] = time.time()
-        self.guard.record_order(ts_str, symbol)
+    def forget(self, symbol: str) -> None:
+        # 퇴출된 종목의 쿨다운/레이트 상태 제거
+        self._last_symbol_ns.pop(symbol, None)
+        self.guard.forget(symbol)
 
-    def send(self, order: Order, reason: str, cooldown_sec: int = 3) -> bool:
-        ts = time.strftime("%Y-%m-%d %H:%M:%S")
-        ok, why = self.can_order(order.symbol, cooldown_sec, ts, order)
+    def record_order(self, order: Order, strategy: Optional[str] = None) -> None:
+        self._last_symbol_ns[order.symbol] = self.clock.monotonic_ns()
+        self.guard.record_order(order.symbol, order.side, strategy)
+
+    def send(self, order: Order, reason: str, cooldown_sec: int = 3, strategy: Optional[str] = None) -> bool:
+        # strategy: 여러 전략 운용 시 전략 이름 (전략별 주문 한도 + orders.jsonl 기록)
+        t0 = perf_counter_ns()
+        ok, why = self.can_order(order.symbol, cooldown_sec, order, strategy)
+        self.metrics.record("guard", perf_counter_ns() - t0)
         if not ok:
-            self.log.info(f"[ORDER_BLOCK] {order.symbol} {order.side.value} qty={order.qty} why={why}")
+            self.log.info(f"[ORDER_BLOCK] {order.symbol} {order.side.value} qty={order.qty} why={why} wait={self.last_wait_sec:.2f}s")
             return False
 
-        log_jsonl(LOG_DIR / "orders.jsonl", {
+        rec = {
             "symbol": order.symbol,
             "side": order.side.value,
             "qty": int(order.qty),
             "type": order.order_type.value,
             "price": order.price,
             "reason": reason,
-        })
+        }
+        if strategy is not None:
+            rec["strategy"] = strategy
+        log_jsonl(self.log_dir / "orders.jsonl", rec, ts=self.clock.iso())
+        key = self.book.add_pending(order.symbol, order.side, int(order.qty), order.price or 0.0)
         try:
+            t0 = perf_counter_ns()
             self.broker.place_order(order)
-            self.record_order(order.symbol, ts)
-            self.log.info(f"[ORDER] {order.side.value} {order.symbol} x{order.qty} reason={reason}")
+            self.metrics.record("send", perf_counter_ns() - t0)
+            self.record_order(order, strategy)
+            tag = f" strategy={strategy}" if strategy is not None else ""
+            self.log.info(f"[ORDER] {order.side.value} {order.symbol} x{order.qty} reason={reason}{tag}")
             return True
         except Exception as e:
+            self.book.reject(key)
             self.log.exception(f"[ORDER_FAIL] {order.side.value} {order.symbol} x{order.qty} reason={reason} err={e}")
             return False
@@ -1,7 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
 
+from core.clock import Clock, WALL_CLOCK
 from core.logger import log_jsonl
 from core.settings import LOG_DIR
 
@@ -12,39 +14,144 @@ class PositionLite:
     last_price: float = 0.0
 
 class PnLTracker:
-    def __init__(self, logger) -> None:
+    """포지션 + 당일 손익 집계
+
+    realized(수수료/세금 차감), unrealized, gross exposure 는 on_price/on_fill/on_balance 마다
+    해당 종목의 기여분만 빼고 더해 O(1) 로 유지한다. day_pnl_ratio = (realized + unrealized) / start_equity.
+    on_breach 가 있으면 비율이 breach_below 이하가 되는 그 틱에 호출한다.
+    """
+
+    def __init__(
+        self,
+        logger,
+        clock: Optional[Clock] = None,
+        log_dir: Path = LOG_DIR,
+        start_equity: float = 0.0,
+        fee_rate: float = 0.0,
+        sell_tax_rate: float = 0.0,
+    ) -> None:
         self.log = logger
+        self.clock = clock or WALL_CLOCK
+        self.log_dir = Path(log_dir)
         self.pos: Dict[str, PositionLite] = {}
 
+        self.start_equity = float(start_equity)
+        self.fee_rate = float(fee_rate)
+        self.sell_tax_rate = float(sell_tax_rate)
+        self.realized = 0.0          # 수수료/세금 차감 후
+        self.fees = 0.0              # 누적 수수료 + 세금
+        self.unrealized = 0.0
+        self.exposure = 0.0          # sum(qty * last)
+        self.breach_below = float("-inf")
+        self.on_breach: Optional[Callable[[float], None]] = None
+
+    # ------------------ aggregates ------------------
+    @staticmethod
+    def _contrib(p: PositionLite) -> Tuple[float, float]:
+        if p.qty <= 0:
+            return 0.0, 0.0
+        if p.last_price <= 0:
+            return 0.0, p.avg_price * p.qty
+        return (p.last_price - p.avg_price) * p.qty, p.last_price * p.qty
+
+    def day_pnl(self) -> float:
+        return self.realized + self.unrealized
+
+    def day_pnl_ratio(self) -> float:
+        if self.start_equity <= 0:
+            return 0.0
+        return (self.realized + self.unrealized) / self.start_equity
+
+    def _check_breach(self) -> None:
+        if self.on_breach is not None and self.start_equity > 0:
+            r = (self.realized + self.unrealized) / self.start_equity
+            if r <= self.breach_below:
+                self.on_breach(r)
+
+    def recompute(self) -> None:
+        """전 종목 기준으로 unrealized/exposure 재계산 (복원 직후, 주기적 부동소수 오차 정리)"""
+        u = e = 0.0
+        for p in self.pos.values():
+            du, de = self._contrib(p)
+            u += du
+            e += de
+        self.unrealized = u
+        self.exposure = e
+
+    # ------------------ events ------------------
     def on_price(self, symbol: str, last_price: float) -> None:
         p = self.pos.get(symbol)
         if p:
-            p.last_price = float(last_price)
+            if p.qty > 0:
+                u0, e0 = self._contrib(p)
+                p.last_price = float(last_price)
+                u1, e1 = self._contrib(p)
+                self.unrealized += u1 - u0
+                self.exposure += e1 - e0
+                self._check_breach()
+            else:
+                p.last_price = float(last_price)
 
     def on_fill(self, symbol: str, side: str, fill_qty: int, fill_price: float) -> None:
         p = self.pos.setdefault(symbol, PositionLite())
         fill_price = float(fill_price)
+        fill_qty = int(fill_qty)
+        u0, e0 = self._contrib(p)
+        notional = fill_price * fill_qty
+        cost = notional * self.fee_rate
         if side == "BUY":
-            new_qty = p.qty + int(fill_qty)
+            new_qty = p.qty + fill_qty
             if new_qty > 0:
                 p.avg_price = (p.avg_price * p.qty + fill_price * fill_qty) / new_qty if p.qty > 0 else fill_price
             p.qty = new_qty
             p.last_price = fill_price
         else:
-            p.qty -= int(fill_qty)
+            cost += notional * self.sell_tax_rate
+            closed = min(fill_qty, p.qty)
+            if closed > 0:
+                self.realized += (fill_price - p.avg_price) * closed
+            p.qty -= fill_qty
             p.last_price = fill_price
             if p.qty <= 0:
                 p.qty = 0
                 p.avg_price = 0.0
+        self.realized -= cost
+        self.fees += cost
+        u1, e1 = self._contrib(p)
+        self.unrealized += u1 - u0
+        self.exposure += e1 - e0
 
-        log_jsonl(LOG_DIR / "fills.jsonl", {
+        log_jsonl(self.log_dir / "fills.jsonl", {
             "symbol": symbol,
             "side": side,
-            "fill_qty": int(fill_qty),
-            "fill_price": float(fill_price),
+            "fill_qty": fill_qty,
+            "fill_price": fill_price,
             "pos_qty": p.qty,
             "pos_avg": p.avg_price,
-        })
+            "cost": cost,
+            "realized": self.realized,
+        }, ts=self.clock.iso())
+        self._check_breach()
+
+    def on_balance(self, symbol: str, qty: int, avg_price: float, last_price: float = 0.0) -> None:
+        # 잔고(gubun 1) 이벤트: 브로커 보유수량/매입단가가 기준값
+        p = self.pos.get(symbol)
+        if p is not None:
+            u0, e0 = self._contrib(p)
+            self.unrealized -= u0
+            self.exposure -= e0
+        if qty <= 0:
+            self.pos.pop(symbol, None)
+            return
+        p = self.pos.setdefault(symbol, PositionLite())
+        p.qty = int(qty)
+        if avg_price > 0:
+            p.avg_price = float(avg_price)
+        if last_price > 0:
+            p.last_price = float(last_price)
+        u1, e1 = self._contrib(p)
+        self.unrealized += u1
+        self.exposure += e1
 
     def unrealized_bp(self, symbol: str) -> int:
         p = self.pos.get(symbol)
@@ -53,12 +160,21 @@ class PnLTracker:
         return int(((p.last_price - p.avg_price) / p.avg_price) * 10000)
 
     def snapshot_log(self) -> None:
+        self.recompute()
+        log_jsonl(self.log_dir / "pnl.jsonl", {
+            "symbol": "*",
+            "realized": self.realized,
+            "unrealized": self.unrealized,
+            "fees": self.fees,
+            "exposure": self.exposure,
+            "day_pnl_ratio": self.day_pnl_ratio(),
+        }, ts=self.clock.iso())
         for s, p in self.pos.items():
             if p.qty > 0:
-                log_jsonl(LOG_DIR / "pnl.jsonl", {
+                log_jsonl(self.log_dir / "pnl.jsonl", {
                     "symbol": s,
                     "qty": p.qty,
                     "avg": p.avg_price,
                     "last": p.last_price,
                     "unreal_bp": self.unrealized_bp(s),
-                })
+                }, ts=self.clock.iso())
@@ -1,27 +1,217 @@
 from __future__ import annotations
-from typing import Dict, List
-from core.indicators import features_from_bars
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.indicators import features_from_bars, StreamingFeatures
+
+
+def score_from_features(f: Dict[str, float]) -> float:
+    score = 0.0
+    score += 1000.0 * f["ret_5"]
+    score += 200.0 * (f["vol_ratio"] - 1.0)
+    score += 100.0 * (1.0 if f["ema_5"] > f["ema_20"] else -1.0)
+
+    if f["rsi_14"] >= 80:
+        score -= 50.0
+    elif f["rsi_14"] <= 30:
+        score += 20.0
+    return score
+
+
+# ------------------ vectorized (cross-sectional) ------------------
+BATCH_WINDOW = 40   # ema_20 이 보는 최대 구간
+
+
+def _ema_weights(n_valid: np.ndarray, period: int, window: int) -> np.ndarray:
+    """ema(values[-n:], period) 를 내적으로 만드는 (종목, window) 가중치 행렬
+
+    값은 왼쪽이 NaN 패딩된 window 길이 행에 정렬되어 있다고 가정.
+    """
+    k = 2 / (period + 1)
+    d = 1 - k
+    j = np.arange(window)
+    w = np.tile(k * d ** (window - 1 - j), (len(n_valid), 1))
+    w[j[None, :] < (window - n_valid)[:, None]] = 0.0
+    seed = d ** (n_valid - 1).astype(np.float64)
+    rows = np.arange(len(n_valid))
+    w[rows, window - n_valid] = seed
+    return w
+
+
+def batch_scores(closes: np.ndarray, vols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """유니버스 전체 점수를 한 번의 NumPy 패스로 계산
+
+    closes/vols: (종목, >=BATCH_WINDOW) 행렬, 오래된 것 -> 최신, 바가 모자라면 왼쪽 NaN.
+    반환: (scores, ranked) - 바가 20개 미만인 종목 score 는 NaN 이고 ranked 에서 빠진다.
+    ScoreBoard.update / features_from_bars 와 같은 값을 낸다.
+    """
+    c = np.asarray(closes, dtype=np.float64)[:, -BATCH_WINDOW:]
+    v = np.asarray(vols, dtype=np.float64)[:, -BATCH_WINDOW:]
+    s_n, w_n = c.shape
+    if s_n == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    n_valid = np.count_nonzero(~np.isnan(c), axis=1)
+    ok = n_valid >= StreamingFeatures.MIN_BARS
+    scores = np.full(s_n, np.nan)
+    if not ok.any():
+        return scores, np.zeros(0, dtype=np.int64)
+    c = np.nan_to_num(c[ok])
+    v = np.nan_to_num(v[ok])
+    n = np.minimum(n_valid[ok], w_n)
+
+    last = c[:, -1]
+    c6 = c[:, -6]
+    ret_5 = np.divide(last - c6, c6, out=np.zeros_like(last), where=c6 != 0)
+
+    avg5 = v[:, -6:-1].sum(axis=1) / 5
+    vol_ratio = np.divide(v[:, -1], avg5, out=np.ones_like(avg5), where=avg5 > 0)
+
+    ema_5 = c[:, -20:] @ _ema_weights(np.full(len(c), 20), 5, 20)[0]
+    ema_20 = (c * _ema_weights(n, 20, w_n)).sum(axis=1)
+
+    diffs = np.diff(c[:, -15:], axis=1)
+    gains = np.where(diffs >= 0, diffs, 0.0).sum(axis=1)
+    losses = np.where(diffs < 0, -diffs, 0.0).sum(axis=1)
+    safe_losses = np.where(losses == 0, 1.0, losses)
+    rsi = np.where(losses == 0, 100.0, 100 - (100 / (1 + gains / safe_losses)))
+
+    sc = 1000.0 * ret_5 + 200.0 * (vol_ratio - 1.0) + np.where(ema_5 > ema_20, 100.0, -100.0)
+    sc = sc + np.where(rsi >= 80, -50.0, np.where(rsi <= 30, 20.0, 0.0))
+    scores[ok] = sc
+
+    valid_idx = np.flatnonzero(ok)
+    ranked = valid_idx[np.argsort(-sc, kind="stable")]
+    return scores, ranked
+
 
 class ScoreBoard:
-    def __init__(self) -> None:
+    def __init__(self, batch_min: int = 8) -> None:
         self.scores: Dict[str, float] = {}
+        self.features: Dict[str, StreamingFeatures] = {}
+        # 같은 분에 닫힌 종목 수가 이 이상이면 벡터화 경로로 점수 계산
+        self.batch_min = int(batch_min)
+        # 종목별 StreamingFeatures 에 마지막으로 반영된 바 ts
+        self._synced_ts: Dict[str, int] = {}
+        # 점수 최대힙 (-score, seq, symbol). 갱신 시 새 항목을 넣고 옛 항목은 seq 로 걸러낸다 (lazy deletion)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._live: Dict[str, int] = {}
+        self._seq = 0
 
     def get(self, symbol: str) -> float:
         return self.scores.get(symbol, -1e9)
 
+    def _set(self, symbol: str, score: float) -> None:
+        self.scores[symbol] = score
+        self._seq += 1
+        self._live[symbol] = self._seq
+        heapq.heappush(self._heap, (-score, self._seq, symbol))
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = [(-self.scores[s], q, s) for s, q in self._live.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, k: int, accept: Optional[Callable[[str], bool]] = None) -> List[str]:
+        """점수 상위 k 종목 (accept 로 후보 제한). 전체 정렬 없이 힙에서 O(k log n)"""
+        out: List[str] = []
+        taken: List[Tuple[float, int, str]] = []
+        heap = self._heap
+        live = self._live
+        while heap and len(out) < k:
+            e = heapq.heappop(heap)
+            if live.get(e[2]) != e[1]:
+                continue    # 갱신/삭제된 옛 항목은 버림
+            taken.append(e)
+            if accept is None or accept(e[2]):
+                out.append(e[2])
+        for e in taken:
+            heapq.heappush(heap, e)
+        return out
+
+    def discard(self, symbol: str) -> None:
+        """유니버스에서 빠진 종목의 점수/지표 상태 제거"""
+        self.scores.pop(symbol, None)
+        self._live.pop(symbol, None)
+        self.features.pop(symbol, None)
+        self._synced_ts.pop(symbol, None)
+
+    def on_bar(self, symbol: str, close: float, volume: float) -> None:
+        """닫힌 바 1개로 종목 지표를 O(1) 갱신하고 점수 재계산"""
+        sf = self.features.get(symbol)
+        if sf is None:
+            sf = self.features[symbol] = StreamingFeatures()
+        f = sf.update(close, volume)
+        if not f:
+            return
+        self._set(symbol, score_from_features(f))
+
+    def reseed(self, symbol: str, store) -> None:
+        """store 이력이 통째로 바뀐 뒤 (warm start/재적재) 스트리밍 지표를 store 에서 다시 시드"""
+        self.features.pop(symbol, None)
+        self._synced_ts.pop(symbol, None)
+        self.update_from_store(symbol, store)
+
     def update(self, symbol: str, bars: List[dict]) -> None:
+        # 전체 바 리스트로 재계산 (스트리밍 상태와 무관한 일회성 경로)
         f = features_from_bars(bars)
         if not f:
             return
+        self._set(symbol, score_from_features(f))
 
-        score = 0.0
-        score += 1000.0 * f["ret_5"]
-        score += 200.0 * (f["vol_ratio"] - 1.0)
-        score += 100.0 * (1.0 if f["ema_5"] > f["ema_20"] else -1.0)
+    # ------------------ BarStore 기반 ------------------
+    def update_from_store(self, symbol: str, store) -> None:
+        """store 의 최신 바로 스트리밍 지표 갱신, 어긋나 있으면 store 에서 다시 시드"""
+        ts = store.view(symbol, "ts", 2)
+        if len(ts) == 0:
+            return
+        last_ts = int(ts[-1])
+        if self._synced_ts.get(symbol) == last_ts:
+            return
+        if symbol in self.features and len(ts) == 2 and self._synced_ts.get(symbol) == int(ts[0]):
+            self.on_bar(symbol, float(store.closes(symbol, 1)[0]), float(store.volumes(symbol, 1)[0]))
+        else:
+            self.features.pop(symbol, None)
+            for c, v in zip(store.closes(symbol, BATCH_WINDOW).tolist(), store.volumes(symbol, BATCH_WINDOW).tolist()):
+                self.on_bar(symbol, c, v)
+        self._synced_ts[symbol] = last_ts
 
-        if f["rsi_14"] >= 80:
-            score -= 50.0
-        elif f["rsi_14"] <= 30:
-            score += 20.0
+    def features_for(self, symbol: str, store) -> Dict[str, float]:
+        """store 최신 바 기준 스트리밍 피처 (상태가 없거나 어긋나 있으면 store 에서 다시 시드)"""
+        self.update_from_store(symbol, store)
+        sf = self.features.get(symbol)
+        return sf.features() if sf is not None else {}
 
-        self.scores[symbol] = score
+    def update_batch(self, store, symbols: Optional[Iterable[str]] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """store 의 (종목, 40) 행렬로 한 번에 점수 계산. (symbols, scores, ranked) 반환"""
+        syms = list(store.row_of.keys()) if symbols is None else [s for s in symbols if s in store]
+        scores, ranked = batch_scores(
+            store.matrix("close", BATCH_WINDOW, syms),
+            store.matrix("volume", BATCH_WINDOW, syms),
+        )
+        features = self.features
+        synced = self._synced_ts
+        for s, sc in zip(syms, scores.tolist()):
+            if sc == sc:  # not NaN
+                self._set(s, sc)
+            sf = features.get(s)
+            if sf is None:
+                continue    # 스트리밍 상태가 없는 종목은 필요할 때 store 에서 시드
+            ts = store.view(s, "ts", 2)
+            if len(ts) == 2 and synced.get(s) == int(ts[0]):
+                # 한 바 뒤처진 스트리밍 상태는 새 바만 O(1) 로 밀어 넣어 유지 (점수는 배치 값)
+                sf.update(float(store.closes(s, 1)[0]), float(store.volumes(s, 1)[0]))
+                synced[s] = int(ts[1])
+            elif not len(ts) or synced.get(s) != int(ts[-1]):
+                features.pop(s, None)
+                synced.pop(s, None)
+        return syms, scores, ranked
+
+    def score_closed(self, store, symbols: Iterable[str]) -> None:
+        """같은 분 경계에서 닫힌 종목들 점수 갱신 (많으면 벡터화, 적으면 O(1) 스트리밍)"""
+        syms = [s for s in symbols if s in store]
+        if len(syms) >= self.batch_min:
+            self.update_batch(store, syms)
+        else:
+            for s in syms:
+                self.update_from_store(s, store)
@@ -13,6 +13,7 @@ class BotConfig:
     # universe
     universe_condition: str = "TV_TOP200"
     universe_refresh_min: int = 10
+    universe_realtime: bool = True       # 실시간 조건검색(편입/이탈 이벤트), False 면 주기적 일회 조회
     realtime_top_n: int = 80
 
     # trading
@@ -28,17 +29,60 @@ class BotConfig:
     tr_sync_sec: int = 30
     status_sec: int = 30
     rt_keepalive_min: int = 5
+    record_ticks: bool = False           # data/ticks/YYYYMMDD.* 로 틱 녹화 (리플레이용)
+
+    # jsonl logging (background writer)
+    jsonl_async: bool = True
+    jsonl_queue_max: int = 10_000
+    jsonl_policy: str = "block"          # 큐 포화 시 "block" | "drop_oldest"
+    jsonl_flush_sec: float = 1.0
+
+    # latency metrics (logs/metrics.jsonl)
+    metrics_enabled: bool = True
+    metrics_sec: int = 60
 
     # execution guard
     max_orders_per_minute: int = 10
     min_seconds_between_orders: int = 1
+    max_orders_per_symbol_per_minute: int = 3
+    max_orders_per_side_per_minute: int = 0      # 0 = 제한 없음
+    kiwoom_orders_per_sec: int = 5               # 키움 주문 제한
     per_symbol_cooldown_sec: int = 3
 
+    # risk / day pnl
+    start_equity_krw: int = 10_000_000   # 당일 손익률 기준 (시작 평가금)
+    fee_rate: float = 0.00015            # 매수/매도 수수료
+    sell_tax_rate: float = 0.0020        # 매도 거래세 (KOSPI/KOSDAQ 2026 기준)
+    risk_kill_ratio: float = -0.01
+    risk_defense_ratio: float = -0.005
+
     # strategy
+    strategy_mode: str = "event"  # "event": 시세/바 마감 이벤트에서 판단 | "poll": score_refresh_sec 주기 전체 순회
     score_refresh_sec: int = 5
     score_entry_threshold: float = 30.0
     stop_loss_bp: int = 80        # 0.8%
     take_profit_bp: int = 150     # 1.5%
+    batch_score_min: int = 8      # 같은 분에 닫힌 종목이 이 이상이면 벡터화 스코어링
+    bar_interval_sec: int = 60    # 실시간 바 간격 (하루를 나누어 떨어지게)
+
+    # warm start (부팅/편입 시 분봉 이력 선적재: 자체 보관본 -> opt10080)
+    warm_start: bool = True
+    warm_max_gap_min: int = 10           # 보관본 마지막 바가 이보다 오래되면 TR 로 다시 받음
+
+    # 분리 모드: 틱 -> 공유메모리 링 -> 계산 프로세스(바/점수/판단) -> 주문 의도 링 (이벤트 모드 전용)
+    compute_process: bool = False
+    compute_ring_size: int = 65536      # 입력 링 레코드 수 (2의 거듭제곱, 레코드당 64바이트)
+    compute_poll_ms: int = 10            # 주문 의도 링 확인 주기
+
+    # 다중 전략: 한 시세/바/피처 캐시 위에서 전략 여러 개 (비어 있으면 기존 단일 전략)
+    # 항목마다 {"name": ..., BotConfig 필드 덮어쓰기...}, 예: {"name": "tight", "take_profit_bp": 80, "start_equity_krw": 3000000}
+    strategies: tuple = ()
+    strategy_orders_per_minute: int = 0  # 전략별 분당 주문 한도 (0 = 제한 없음, 항목에서 덮어씀)
+
+    # symbol lifecycle (유니버스에서 빠진 종목 상태 정리)
+    symbol_max_resident: int = 400       # 상주 종목 수 예산 (0 = 제한 없음)
+    symbol_max_mb: float = 0.0           # 상주 바 이력 메모리 예산 MB (0 = 제한 없음)
+    symbol_warm_min: int = 30            # 비활성 후 이 시간 동안은 퇴출하지 않음
 
 CFG = BotConfig()
 
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
 
 from core.settings import DATA_DIR
 
@@ -23,3 +25,174 @@ def save_state(state: dict) -> None:
     tmp = STATE_PATH.with_suffix(".tmp")
     tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
     tmp.replace(STATE_PATH)
+
+
+# ------------------ journaled store ------------------
+SNAP_PATH = DATA_DIR / "state.snap.json"
+JOURNAL_PATH = DATA_DIR / "state.journal.jsonl"
+
+_DUMPS = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class StateJournal:
+    """스냅샷 + append-only 델타 로그 상태 저장소
+
+    상태는 kind -> {key: value} 두 단계 dict (예: "pos" -> 종목 -> 포지션, "order" -> 주문번호 -> 주문,
+    "univ" -> 종목 -> 1, "meta" -> 이름 -> 값). put/delete/sync 는 바뀐 항목만 버퍼에 쌓고,
+    flush() 가 한 번의 write + fsync 로 journal 에 붙인다 (배치 단위, 크래시 시 최대 1배치 손실).
+    journal 이 compact_every 줄을 넘으면 스냅샷을 새로 쓰고 journal 을 비운다.
+    각 줄은 seq 를 가지며 복구 시 스냅샷 seq 이하 줄은 건너뛴다 (스냅샷 교체 직후 크래시 대비).
+    """
+
+    def __init__(
+        self,
+        snap_path: Path = SNAP_PATH,
+        journal_path: Path = JOURNAL_PATH,
+        compact_every: int = 2000,
+        fsync: bool = True,
+    ) -> None:
+        self.snap_path = Path(snap_path)
+        self.journal_path = Path(journal_path)
+        self.compact_every = int(compact_every)
+        self.fsync = fsync
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.seq = 0
+        self._snap_seq = 0
+        self._journal_lines = 0
+        self._buf: List[str] = []
+        self._f: Optional[BinaryIO] = None
+
+    # ------------------ recovery ------------------
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """스냅샷 + journal tail 재생. 마지막 줄이 잘려 있으면(쓰다 죽음) 그 줄부터 잘라 버린다"""
+        self.state = {}
+        self.seq = self._snap_seq = 0
+        if self.snap_path.exists():
+            try:
+                snap = json.loads(self.snap_path.read_bytes())
+                self.state = {k: dict(v) for k, v in snap.get("state", {}).items()}
+                self.seq = self._snap_seq = int(snap.get("seq", 0))
+            except (ValueError, TypeError, AttributeError):
+                self.state = {}
+        n = 0
+        if self.journal_path.exists():
+            records = self._read_journal()
+            state = self.state
+            snap_seq = self._snap_seq
+            for seq, kind, key, v in records:
+                if seq <= snap_seq:
+                    continue
+                d = state.get(kind)
+                if d is None:
+                    d = state[kind] = {}
+                d.pop(key, None)    # 재삽입은 뒤로 (dict 순서 = 최근 삽입 순)
+                if v is not None:
+                    d[key] = v
+                self.seq = seq
+            n = len(records)
+        self._journal_lines = n
+        return self.state
+
+    def _read_journal(self) -> List[list]:
+        data = self.journal_path.read_bytes()
+        end = data.rfind(b"\n") + 1
+        try:
+            # 온전한 줄 전체를 JSON 배열 하나로 한 번에 파싱 (줄마다 loads 하는 것보다 훨씬 빠름)
+            records = json.loads(b"[" + data[:end].rstrip(b"\n").replace(b"\n", b",") + b"]")
+        except ValueError:
+            records = []
+            pos = 0
+            while pos < end:
+                nl = data.index(b"\n", pos)
+                try:
+                    records.append(json.loads(data[pos:nl]))
+                except ValueError:
+                    break
+                pos = nl + 1
+            end = pos
+        if end < len(data):
+            # 잘린 꼬리는 잘라내야 다음 append 가 그 뒤에 붙지 않는다
+            with self.journal_path.open("r+b") as f:
+                f.truncate(end)
+        return records
+
+    def get(self, kind: str) -> Dict[str, Any]:
+        return self.state.get(kind, {})
+
+    # ------------------ deltas ------------------
+    def put(self, kind: str, key: str, value: Any) -> bool:
+        d = self.state.get(kind)
+        if d is None:
+            d = self.state[kind] = {}
+        if key in d and d[key] == value:
+            return False
+        d.pop(key, None)
+        d[key] = value
+        self._append(kind, key, value)
+        return True
+
+    def delete(self, kind: str, key: str) -> bool:
+        d = self.state.get(kind)
+        if not d or key not in d:
+            return False
+        del d[key]
+        self._append(kind, key, None)
+        return True
+
+    def sync(self, kind: str, mapping: Dict[str, Any]) -> int:
+        """kind 전체를 mapping 으로 맞춘다 (변경분만 기록). 기록한 델타 수 반환"""
+        cur = self.state.get(kind, {})
+        n = 0
+        for key in [k for k in cur if k not in mapping]:
+            n += self.delete(kind, key)
+        for key, value in mapping.items():
+            n += self.put(kind, key, value)
+        return n
+
+    def _append(self, kind: str, key: str, value: Any) -> None:
+        self.seq += 1
+        self._buf.append(_DUMPS([self.seq, kind, key, value]))
+
+    # ------------------ durability ------------------
+    def flush(self) -> int:
+        """버퍼된 델타를 한 번에 쓰고 fsync. 쓴 줄 수 반환"""
+        if not self._buf:
+            return 0
+        if self._f is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = self.journal_path.open("ab")
+        n = len(self._buf)
+        self._f.write(("\n".join(self._buf) + "\n").encode("utf-8"))
+        self._buf.clear()
+        self._f.flush()
+        if self.fsync:
+            os.fsync(self._f.fileno())
+        self._journal_lines += n
+        if self._journal_lines >= self.compact_every:
+            self.compact()
+        return n
+
+    def compact(self) -> None:
+        """현재 상태를 스냅샷으로 쓰고 journal 을 비운다"""
+        if self._buf:
+            self.flush()
+        self.snap_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.snap_path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            f.write(_DUMPS({"seq": self.seq, "saved_at": datetime.now().isoformat(timespec="seconds"),
+                            "state": self.state}).encode("utf-8"))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.snap_path)
+        self._snap_seq = self.seq
+        if self._f is not None:
+            self._f.close()
+        self._f = self.journal_path.open("wb")
+        self._journal_lines = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._f is not None:
+            self._f.close()
+            self._f = None
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import replace
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from core.clock import Clock, WALL_CLOCK
+from core.feature_cache import FeatureCache
+from core.logger import log_jsonl
+from core.metrics import METRICS
+from core.pnl_tracker import PnLTracker, PositionLite
+from core.risk_manager import RiskManager, RiskState
+from core.settings import BotConfig
+from core.strategy import Signal, SimpleScoreStrategy
+from core.types import Side
+
+STRATEGY_KINDS = {"simple_score": SimpleScoreStrategy}
+
+# (신호, 보낸 전략) -> 전송 여부. 앱의 공유 OrderManager/가드/계좌 리스크를 거친다
+SendFn = Callable[[Signal, "StrategyInstance"], bool]
+
+
+class StrategyInstance:
+    """전략 1개: 자기 설정 + 자기 포지션 장부/손익 + 리스크 예산 (계좌/시세/바는 공유)"""
+
+    def __init__(self, name: str, cfg: BotConfig, logger, features: FeatureCache, clock: Clock,
+                 log_dir: Path, kind: str = "simple_score") -> None:
+        if kind not in STRATEGY_KINDS:
+            raise ValueError(f"unknown strategy kind: {kind}")
+        self.name = name
+        self.cfg = cfg
+        self.log = logger
+        self.clock = clock
+        # fills.jsonl / pnl.jsonl / status.jsonl 은 logs/strategies/<name>/ 아래
+        self.pnl = PnLTracker(
+            logger, clock=clock, log_dir=log_dir,
+            start_equity=float(cfg.start_equity_krw),
+            fee_rate=float(cfg.fee_rate),
+            sell_tax_rate=float(cfg.sell_tax_rate),
+        )
+        self.strategy = STRATEGY_KINDS[kind](logger, cfg, features, self.pnl)
+        self.risk = RiskManager(kill=float(cfg.risk_kill_ratio), defense=float(cfg.risk_defense_ratio))
+        self.risk_state = RiskState()
+        self.pnl.on_breach = self._on_breach
+        self._arm_risk()
+        # rate limit 에 막힌 청산: symbol -> 재시도 시각 (clock.time())
+        self.exit_retry: Dict[str, float] = {}
+        self.n_sent = 0
+
+    def n_positions(self) -> int:
+        return sum(1 for p in self.pnl.pos.values() if p.qty > 0)
+
+    def held(self, symbol: str) -> int:
+        p = self.pnl.pos.get(symbol)
+        return p.qty if p is not None and p.qty > 0 else 0
+
+    def _arm_risk(self) -> None:
+        rs = self.risk_state
+        if rs.kill_switch:
+            self.pnl.breach_below = float("-inf")
+        elif rs.defense_reduce_positions:
+            self.pnl.breach_below = self.risk.kill
+        else:
+            self.pnl.breach_below = self.risk.defense
+
+    def update_risk(self, ratio: Optional[float] = None) -> RiskState:
+        if ratio is None:
+            ratio = self.pnl.day_pnl_ratio()
+        rs = self.risk.update(ratio)
+        if rs != self.risk_state:
+            self.log.warning(
+                f"[RISK] strategy={self.name} day_pnl={ratio:.4%} kill={rs.kill_switch} "
+                f"defense={rs.defense_reduce_positions} entries={rs.allow_new_entries}"
+            )
+            log_jsonl(self.pnl.log_dir / "status.jsonl", {
+                "strategy": self.name,
+                "risk": rs.__dict__,
+                "day_pnl_ratio": ratio,
+                "realized": self.pnl.realized,
+                "unrealized": self.pnl.unrealized,
+            }, ts=self.clock.iso())
+            self.risk_state = rs
+            self._arm_risk()
+        return rs
+
+    def _on_breach(self, ratio: float) -> None:
+        self.update_risk(ratio)
+
+
+class StrategyHost:
+    """전략 여러 개를 한 시세/바 저장소/피처 캐시 위에서 돌린다
+
+    틱 -> 바 -> 스코어링은 앱이 한 번만 하고, 전략들은 FeatureCache 로 같은 (종목, 바 ts, 피처) 값을 읽는다.
+    주문은 send(sig, inst) 로 앱의 공유 OrderManager/ExecutionGuard 를 거친다 (전략별 분당 한도는 guard.set_quota).
+    체결은 (종목, 매수/매도) 별로 보낸 순서대로(FIFO) 전략 장부에 나눠 준다.
+    보낸 주문이 없는 매도(강제청산, 수동 주문)는 그 종목을 보유한 전략 순서로 나눈다.
+    """
+
+    def __init__(self, logger, cfg: BotConfig, features: FeatureCache, send: SendFn, guard,
+                 clock: Optional[Clock] = None, log_dir: Optional[Path] = None, metrics=None) -> None:
+        self.log = logger
+        self.cfg = cfg
+        self.features = features
+        self.send = send
+        self.clock = clock or WALL_CLOCK
+        self.metrics = metrics or METRICS
+        root = Path(log_dir) / "strategies" if log_dir is not None else Path("logs") / "strategies"
+        self.instances: List[StrategyInstance] = []
+        self.by_name: Dict[str, StrategyInstance] = {}
+        for spec in cfg.strategies:
+            spec = dict(spec)
+            name = str(spec.pop("name", "") or "")
+            if not name or name in self.by_name:
+                raise ValueError(f"strategy name must be unique and non-empty: {name!r}")
+            kind = spec.pop("kind", "simple_score")
+            try:
+                icfg = replace(cfg, strategies=(), **spec)
+            except TypeError as e:
+                raise ValueError(f"strategy {name}: {e}") from None
+            inst = StrategyInstance(name, icfg, logger, features, self.clock, root / name, kind=kind)
+            guard.set_quota(name, int(icfg.strategy_orders_per_minute))
+            self.instances.append(inst)
+            self.by_name[name] = inst
+        # (종목, 방향) -> [[전략, 남은 수량], ...] 보낸 순서
+        self._sent: Dict[Tuple[str, Side], Deque[list]] = {}
+
+    def __len__(self) -> int:
+        return len(self.instances)
+
+    # ------------------ attribution ------------------
+    def open_qty(self, inst: StrategyInstance, symbol: str, side: Side) -> int:
+        q = self._sent.get((symbol, side))
+        if not q:
+            return 0
+        return sum(e[1] for e in q if e[0] is inst)
+
+    def _send(self, inst: StrategyInstance, sig: Signal) -> bool:
+        # 모의 브로커는 place_order 안에서 바로 체결하므로 보내기 전에 줄을 세우고 실패하면 뺀다
+        q = self._sent.setdefault((sig.symbol, sig.side), deque())
+        entry = [inst, int(sig.qty)]
+        q.append(entry)
+        ok = self.send(sig, inst)
+        if ok:
+            inst.n_sent += 1
+        else:
+            for i, e in enumerate(q):
+                if e is entry:
+                    del q[i]
+                    break
+            if not q:
+                self._sent.pop((sig.symbol, sig.side), None)
+        return ok
+
+    def on_fill(self, symbol: str, side: Side, qty: int, price: float) -> None:
+        key = (symbol, side)
+        q = self._sent.get(key)
+        while qty > 0 and q:
+            e = q[0]
+            n = min(qty, e[1])
+            e[0].pnl.on_fill(symbol, side.value, n, price)
+            qty -= n
+            e[1] -= n
+            if e[1] <= 0:
+                q.popleft()
+        if q is not None and not q:
+            del self._sent[key]
+        if qty <= 0:
+            return
+        if side == Side.SELL:
+            for inst in self.instances:
+                n = min(qty, inst.held(symbol))
+                if n > 0:
+                    inst.pnl.on_fill(symbol, side.value, n, price)
+                    qty -= n
+                    if qty <= 0:
+                        return
+        self.log.warning(f"[HOST] unattributed fill {side.value} {symbol} x{qty}")
+
+    def reconcile(self, open_qty: Callable[[str, Side], int]) -> int:
+        """장부에 미체결이 없는 (종목, 방향) 대기열 정리 (취소/거부/부분체결 후 잔량). 버린 주문 수"""
+        n = 0
+        for key in [k for k in self._sent if open_qty(*k) <= 0]:
+            n += len(self._sent.pop(key))
+        return n
+
+    # ------------------ decisions ------------------
+    def on_price(self, symbol: str, price: float, check_exit: bool = True) -> None:
+        for inst in self.instances:
+            p = inst.pnl.pos.get(symbol)
+            if p is None:
+                continue
+            inst.pnl.on_price(symbol, price)
+            if check_exit and p.qty > 0:
+                self._check_exit(inst, symbol)
+
+    def _check_exit(self, inst: StrategyInstance, symbol: str) -> None:
+        # 재시도 대기 중이거나 이 전략의 매도가 이미 나가 있으면 틱마다 다시 보내지 않음
+        if symbol in inst.exit_retry or self.open_qty(inst, symbol, Side.SELL) > 0:
+            return
+        t0 = perf_counter_ns()
+        sig = inst.strategy.decide_exit(symbol)
+        self.metrics.record("decide", perf_counter_ns() - t0)
+        if sig:
+            self._send(inst, sig)
+
+    def check_exits(self) -> None:
+        for inst in self.instances:
+            for sym in [s for s, p in inst.pnl.pos.items() if p.qty > 0]:
+                self._check_exit(inst, sym)
+
+    def check_entries(self, candidates: Iterable[str], last_px: Dict[str, float]) -> None:
+        # 후보(점수 상위)는 앱이 한 번 뽑고 모든 전략이 같이 본다
+        cands = list(candidates)
+        if not cands:
+            return
+        for inst in self.instances:
+            if not inst.risk_state.allow_new_entries:
+                continue
+            pending = {s for (s, side), q in self._sent.items() if side == Side.BUY and any(e[0] is inst for e in q)}
+            cur = inst.n_positions() + sum(1 for s in pending if inst.held(s) <= 0)
+            cap = int(inst.cfg.max_positions)
+            for sym in cands:
+                if cur >= cap:
+                    break
+                if sym in pending:
+                    continue
+                t0 = perf_counter_ns()
+                sig = inst.strategy.decide_entry(sym, can_hold_more=True, last_price=last_px.get(sym, 0.0))
+                self.metrics.record("decide", perf_counter_ns() - t0)
+                if sig and self._send(inst, sig):
+                    cur += 1
+
+    def retry_exits(self) -> None:
+        now = self.clock.time()
+        for inst in self.instances:
+            if not inst.exit_retry:
+                continue
+            for sym, due in list(inst.exit_retry.items()):
+                if due > now:
+                    continue
+                del inst.exit_retry[sym]
+                sig = inst.strategy.decide_exit(sym)
+                if sig:
+                    self._send(inst, sig)
+
+    def update_risk(self) -> None:
+        for inst in self.instances:
+            inst.update_risk()
+
+    def allow_entries(self) -> bool:
+        return any(inst.risk_state.allow_new_entries for inst in self.instances)
+
+    # ------------------ status / state ------------------
+    def stats(self) -> Dict[str, dict]:
+        out: Dict[str, dict] = {}
+        for inst in self.instances:
+            out[inst.name] = {
+                "pos_n": inst.n_positions(),
+                "sent": inst.n_sent,
+                "realized": round(inst.pnl.realized, 1),
+                "day_pnl_ratio": round(inst.pnl.day_pnl_ratio(), 6),
+                "entries": inst.risk_state.allow_new_entries,
+            }
+        return out
+
+    def snapshot_log(self) -> None:
+        for inst in self.instances:
+            inst.pnl.snapshot_log()
+
+    def positions_state(self) -> Dict[str, dict]:
+        # journal "spos": "<전략>/<종목>" -> 포지션
+        return {
+            f"{inst.name}/{s}": {"qty": p.qty, "avg_price": p.avg_price, "last_price": p.last_price}
+            for inst in self.instances
+            for s, p in inst.pnl.pos.items()
+            if p.qty > 0
+        }
+
+    def day_state(self, date: str) -> Dict[str, dict]:
+        return {
+            inst.name: {"date": date, "realized": inst.pnl.realized, "fees": inst.pnl.fees}
+            for inst in self.instances
+        }
+
+    def restore(self, positions: Dict[str, dict], day: Dict[str, dict], date: str) -> int:
+        n = 0
+        for key, p in (positions or {}).items():
+            name, _, sym = key.partition("/")
+            inst = self.by_name.get(name)
+            if inst is None or not sym:
+                continue    # 설정에서 빠진 전략
+            try:
+                inst.pnl.pos[sym] = PositionLite(
+                    qty=int(p.get("qty", 0)),
+                    avg_price=float(p.get("avg_price", 0.0)),
+                    last_price=float(p.get("last_price", 0.0)),
+                )
+                n += 1
+            except Exception:
+                continue
+        for name, d in (day or {}).items():
+            inst = self.by_name.get(name)
+            if inst is not None and d.get("date") == date:
+                inst.pnl.realized = float(d.get("realized", 0.0))
+                inst.pnl.fees = float(d.get("fees", 0.0))
+        for inst in self.instances:
+            inst.pnl.recompute()
+        return n
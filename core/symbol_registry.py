@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.clock import Clock, WALL_CLOCK
+
+
+class SymbolState(Enum):
+    ACTIVE = "active"    # 실시간 등록 또는 보유 중
+    WARM = "warm"        # 비활성이지만 최근 warm_sec 안에 바가 있었음 (곧 돌아올 수 있음)
+    COLD = "cold"        # 비활성 + warm_sec 이상 조용함 -> 예산 초과 시 퇴출 대상
+
+
+class SymbolRegistry:
+    """종목별 상태(바 이력/점수/주문 간격 등)를 들고 있는 '상주' 종목 관리
+
+    touch() 순서의 LRU(OrderedDict) 로 상주 종목을 들고, evict() 는 오래된 쪽부터
+    COLD 종목만 골라 on_evict(symbol) 로 넘긴다. 상주 수(max_resident) 또는
+    바이트(max_bytes = 상주 수 x bytes_per_symbol) 예산 안으로 들어오면 멈춘다.
+    ACTIVE/WARM 종목은 예산을 넘어도 내보내지 않는다.
+    """
+
+    def __init__(
+        self,
+        clock: Optional[Clock] = None,
+        max_resident: int = 400,
+        max_bytes: int = 0,
+        warm_sec: int = 1800,
+        bytes_per_symbol: int = 0,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.clock = clock or WALL_CLOCK
+        self.max_resident = int(max_resident)     # 0 = 제한 없음
+        self.max_bytes = int(max_bytes)           # 0 = 제한 없음
+        self.warm_ms = int(warm_sec) * 1000
+        self.bytes_per_symbol = int(bytes_per_symbol)
+        self.on_evict = on_evict
+        self._last: "OrderedDict[str, int]" = OrderedDict()   # symbol -> 마지막 touch (epoch ms)
+        self._active: Dict[str, None] = {}
+        self.n_evicted = 0
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._last
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._last) * self.bytes_per_symbol
+
+    def touch(self, symbol: str, now_ms: Optional[int] = None) -> None:
+        self._last[symbol] = self.clock.time_ms() if now_ms is None else now_ms
+        self._last.move_to_end(symbol)
+
+    def set_active(self, symbols: Iterable[str]) -> None:
+        """실시간 등록 + 보유 종목 집합. 빠진 종목은 WARM 부터 시작"""
+        self._active = dict.fromkeys(symbols)
+        now = self.clock.time_ms()
+        for s in self._active:
+            if s not in self._last:
+                self._last[s] = now
+
+    def state(self, symbol: str, now_ms: Optional[int] = None) -> Optional[SymbolState]:
+        if symbol in self._active:
+            return SymbolState.ACTIVE
+        last = self._last.get(symbol)
+        if last is None:
+            return None
+        now = self.clock.time_ms() if now_ms is None else now_ms
+        return SymbolState.WARM if now - last < self.warm_ms else SymbolState.COLD
+
+    def discard(self, symbol: str) -> None:
+        self._last.pop(symbol, None)
+        self._active.pop(symbol, None)
+
+    def _over(self) -> bool:
+        n = len(self._last)
+        if self.max_resident > 0 and n > self.max_resident:
+            return True
+        return self.max_bytes > 0 and n * self.bytes_per_symbol > self.max_bytes
+
+    def evict(self, now_ms: Optional[int] = None) -> List[str]:
+        """예산을 넘은 만큼 LRU 순으로 COLD 종목 퇴출. 퇴출한 종목 반환"""
+        if not self._over():
+            return []
+        now = self.clock.time_ms() if now_ms is None else now_ms
+        edge = now - self.warm_ms
+        out: List[str] = []
+        for s, last in list(self._last.items()):
+            if last > edge:
+                break    # 이후는 모두 더 최근 -> COLD 없음
+            if s in self._active:
+                continue
+            del self._last[s]
+            out.append(s)
+            if self.on_evict is not None:
+                self.on_evict(s)
+            if not self._over():
+                break
+        self.n_evicted += len(out)
+        return out
+
+    def stats(self, now_ms: Optional[int] = None) -> Dict[str, int]:
+        now = self.clock.time_ms() if now_ms is None else now_ms
+        edge = now - self.warm_ms
+        n_active = sum(1 for s in self._active if s in self._last)
+        n_cold = sum(1 for s, last in self._last.items() if last <= edge and s not in self._active)
+        return {
+            "resident": len(self._last),
+            "active": n_active,
+            "warm": len(self._last) - n_active - n_cold,
+            "cold": n_cold,
+            "bytes": self.nbytes,
+            "evicted": self.n_evicted,
+        }
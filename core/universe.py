@@ -1,12 +1,15 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from core.settings import BotConfig
 
+Diff = Tuple[List[str], List[str]]   # (added, removed)
+
 @dataclass
 class UniverseState:
-    all_symbols: List[str] = field(default_factory=list)
+    # 조건검색 편입 순서를 유지하는 ordered set
+    all_symbols: Dict[str, None] = field(default_factory=dict)
     realtime_symbols: List[str] = field(default_factory=list)
     last_refresh_ts: float = 0.0
 
@@ -17,27 +20,128 @@ class UniverseManager:
         self.cfg = cfg
         self.state = UniverseState()
         self._inflight = False
+        # 실시간 조건검색(search type 1) 수신 중이면 True: 주기 재조회 없이 편입/이탈 이벤트로 갱신
+        self.streaming = False
+        self._on_change: Optional[Callable[[List[str], List[str]], None]] = None
+
+    def set_symbols(self, codes: Iterable[str]) -> Diff:
+        """전체 목록 교체. 기존 순서는 유지하고 새 종목은 뒤에 붙인다"""
+        want = dict.fromkeys(codes)
+        cur = self.state.all_symbols
+        removed = [c for c in cur if c not in want]
+        added = [c for c in want if c not in cur]
+        for c in removed:
+            del cur[c]
+        for c in added:
+            cur[c] = None
+        self.state.last_refresh_ts = __import__("time").time()
+        return added, removed
 
-    def refresh_from_condition(self) -> None:
+    def refresh_from_condition(self, on_done: Optional[Callable[[], None]] = None) -> None:
+        # 조건검색 응답은 비동기 (broker.request_condition -> Future). on_done 은 성공 시에만 호출
         if self._inflight:
             return
         self._inflight = True
         try:
-            codes = self.broker.run_condition(self.cfg.universe_condition)
-            self.state.all_symbols = codes
-            self.state.last_refresh_ts = __import__("time").time()
-            self.log.info(f"[UNIVERSE] condition={self.cfg.universe_condition} size={len(codes)}")
-        finally:
+            fut = self.broker.request_condition(self.cfg.universe_condition)
+        except Exception:
             self._inflight = False
+            raise
+        fut.add_done_callback(lambda f: self._on_condition_result(f, on_done))
+
+    def _on_condition_result(self, fut, on_done: Optional[Callable[[], None]]) -> None:
+        self._inflight = False
+        exc = fut.exception()
+        if exc is not None:
+            self.log.error(f"[UNIVERSE] condition={self.cfg.universe_condition} failed: {exc}")
+            return
+        codes = fut.result()
+        self.set_symbols(codes)
+        self.log.info(f"[UNIVERSE] condition={self.cfg.universe_condition} size={len(codes)}")
+        if on_done is not None:
+            on_done()
+
+    # ------------------ 실시간 조건검색 ------------------
+    def start_realtime(
+        self,
+        on_change: Optional[Callable[[List[str], List[str]], None]] = None,
+        on_ready: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """search type 1 로 조건검색 등록: 초기 목록 후 OnReceiveRealCondition 편입(I)/이탈(D) 반영
+
+        on_change(added, removed) 는 변경분이 있을 때마다, on_ready() 는 초기 목록 수신 후 1회 호출.
+        """
+        self._on_change = on_change
+        self.broker.on_condition = self._on_condition_event
+        fut = self.broker.request_condition(self.cfg.universe_condition, realtime=True)
+        fut.add_done_callback(lambda f: self._on_realtime_initial(f, on_ready))
+
+    def _on_realtime_initial(self, fut, on_ready: Optional[Callable[[], None]]) -> None:
+        exc = fut.exception()
+        if exc is not None:
+            self.log.error(f"[UNIVERSE] realtime condition={self.cfg.universe_condition} failed: {exc}")
+            return
+        added, removed = self.set_symbols(fut.result())
+        self.streaming = True
+        self.log.info(f"[UNIVERSE] realtime condition={self.cfg.universe_condition} size={len(self.state.all_symbols)}")
+        if self._on_change is not None and (added or removed):
+            self._on_change(added, removed)
+        if on_ready is not None:
+            on_ready()
+
+    def _on_condition_event(self, code: str, inserted: bool, condition_name: str) -> None:
+        if condition_name and condition_name != self.cfg.universe_condition:
+            return
+        cur = self.state.all_symbols
+        if inserted:
+            if code in cur:
+                return
+            cur[code] = None
+            diff: Diff = ([code], [])
+        else:
+            if code not in cur:
+                return
+            del cur[code]
+            diff = ([], [code])
+        if self._on_change is not None:
+            self._on_change(*diff)
+
+    def update_realtime(self, added: List[str], removed: List[str], keep: Iterable[str] = ()) -> Diff:
+        """조건 편입/이탈분만 실시간 등록에 반영 (top_n 여유 안에서 추가, keep 은 이탈해도 유지)"""
+        keep = set(keep)
+        rt = self.state.realtime_symbols
+        gone = set(c for c in removed if c not in keep)
+        if gone:
+            rt[:] = [c for c in rt if c not in gone]
+        n = int(self.cfg.realtime_top_n)
+        have = set(rt)
+        # 새로 편입된 종목 먼저, 이탈로 빈 자리는 기존 유니버스 순서로 채움
+        candidates = list(added)
+        if gone:
+            candidates += list(self.state.all_symbols)
+        for c in candidates:
+            if len(rt) >= n:
+                break
+            if c not in have:
+                rt.append(c)
+                have.add(c)
+        return self.apply_realtime_registry()
 
-    def pick_realtime_top_n(self, scorer: Optional[object] = None) -> List[str]:
+    def pick_realtime_top_n(self, scorer: Optional[object] = None, keep: Iterable[str] = ()) -> List[str]:
+        """점수 기준 상위 top_n 재선정 (keep 은 순위 밖이어도 유지 - 보유 종목 시세가 끊기지 않게)"""
         base = list(self.state.all_symbols)
         if scorer is not None:
             base.sort(key=lambda s: float(scorer.get(s)), reverse=True)
         n = int(self.cfg.realtime_top_n)
-        self.state.realtime_symbols = base[:n]
+        rt = base[:n]
+        have = set(rt)
+        rt += [c for c in dict.fromkeys(keep) if c not in have]
+        self.state.realtime_symbols = rt
         return self.state.realtime_symbols
 
-    def apply_realtime_registry(self) -> None:
-        self.broker.subscribe_realtime(self.state.realtime_symbols)
-        self.log.info(f"[UNIVERSE] realtime registered n={len(self.state.realtime_symbols)}")
+    def apply_realtime_registry(self) -> Diff:
+        # 브로커가 변경분만 등록/해제 -> 집합이 같으면 비용 없음
+        added, removed = self.broker.subscribe_realtime(self.state.realtime_symbols)
+        if added or removed:
+            self.log.info(f"[UNIVERSE] realtime n={len(self.state.realtime_symbols)} +{len(added)} -{len(removed)}")
+        return added, removed
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.clock import UTC_OFFSET_SEC, WALL_CLOCK, Clock
+from core.indicators import StreamingFeatures
+from data.bar_store import BAR_DTYPE, BarStore
+
+# 종목별 준비 상태
+READY = "ready"        # 지표 계산에 필요한 바(MIN_BARS) 확보
+PENDING = "pending"    # opt10080 조회 대기/진행 중
+SHORT = "short"        # 이력을 받았지만 아직 MIN_BARS 미만 (실시간 바가 채움)
+FAILED = "failed"      # 조회 실패
+
+
+class WarmStart:
+    """실시간 종목 바 이력 선적재 (부팅/유니버스 편입 시)
+
+    1) BarStore 에 이미 MIN_BARS 이상 있으면 그대로 준비 완료
+    2) 디스크 보관본(BarSpill) 의 마지막 바가 max_gap_sec 안이면 그걸로 채움
+    3) 아니면 broker.request_minute_bars (opt10080) 를 낮은 우선순위로 넣는다.
+       TR 스케줄러가 조회 제한에 맞춰 차례로 보내므로 여러 종목을 한 번에 넣어도 된다.
+    채운 뒤 ScoreBoard.reseed 로 스트리밍 지표를 시드해 첫 전략 판단부터 점수가 있다.
+    """
+
+    def __init__(
+        self,
+        logger,
+        broker,
+        store: BarStore,
+        scoreboard,
+        spill=None,
+        clock: Optional[Clock] = None,
+        interval_sec: int = 60,
+        max_gap_sec: int = 600,
+        on_ready: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.log = logger
+        self.broker = broker
+        self.store = store
+        self.sb = scoreboard
+        self.spill = spill
+        self.clock = clock or WALL_CLOCK
+        self.interval = int(interval_sec)
+        self.max_gap_sec = int(max_gap_sec)
+        self.on_ready = on_ready
+        self.min_bars = StreamingFeatures.MIN_BARS
+        self.status: Dict[str, str] = {}
+        self.source: Dict[str, str] = {}     # symbol -> "live" | "spill" | "tr"
+
+    def is_ready(self, symbol: str) -> bool:
+        return self.store.count(symbol) >= self.min_bars
+
+    def stats(self) -> Dict[str, int]:
+        out = {READY: 0, PENDING: 0, SHORT: 0, FAILED: 0}
+        for sym, st in self.status.items():
+            if st == SHORT and self.is_ready(sym):
+                st = self.status[sym] = READY    # 실시간 바로 채워짐
+            out[st] += 1
+        return out
+
+    def forget(self, symbol: str) -> None:
+        self.status.pop(symbol, None)
+        self.source.pop(symbol, None)
+
+    def warm(self, symbols: Iterable[str]) -> List[str]:
+        """준비 안 된 종목 이력 채우기 시작. TR 을 요청한 종목 반환 (이미 준비/진행 중이면 건너뜀)"""
+        requested: List[str] = []
+        now = self.clock.time_ms() // 1000
+        for sym in symbols:
+            st = self.status.get(sym)
+            if st == PENDING or (st == READY and self.is_ready(sym)):
+                continue
+            if st == SHORT and self.source.get(sym) == "tr":
+                continue    # TR 이 가진 만큼은 받았음, 나머지는 실시간 바가 채움
+            if self.is_ready(sym):
+                self._mark(sym, READY, "live")
+                continue
+            if self.spill is not None and sym in self.spill:
+                arr = self.spill.load(sym)
+                if arr is not None and len(arr) and now - int(arr["ts"][-1]) <= self.max_gap_sec:
+                    self._seed(sym, arr, "spill")
+                    if self.is_ready(sym):
+                        continue
+            self.status[sym] = PENDING
+            try:
+                fut = self.broker.request_minute_bars(sym)
+            except Exception as e:
+                self.log.warning(f"[WARM] {sym} request failed: {e}")
+                self.status[sym] = FAILED
+                continue
+            fut.add_done_callback(lambda f, s=sym: self._on_tr(s, f))
+            requested.append(sym)
+        if requested:
+            self.log.info(f"[WARM] opt10080 queued n={len(requested)}")
+        return requested
+
+    def _on_tr(self, sym: str, fut: Future) -> None:
+        if self.status.get(sym) != PENDING:
+            return    # 그사이 빠진 종목
+        exc = fut.exception()
+        if exc is not None:
+            self.log.warning(f"[WARM] {sym} opt10080 failed: {exc}")
+            self.status[sym] = FAILED
+            return
+        rows = fut.result() or []
+        arr = np.empty(len(rows), dtype=BAR_DTYPE)
+        for i, r in enumerate(rows):
+            arr[i] = (int(r["ts"]), r["open"], r["high"], r["low"], r["close"], r["volume"])
+        self._seed(sym, arr, "tr")
+
+    def _seed(self, sym: str, hist: np.ndarray, source: str) -> None:
+        # 아직 닫히지 않은 현재 구간 바는 빼고 (실시간 바가 닫아 줌), 이미 받은 실시간 바 앞에만 붙인다
+        now = self.clock.time_ms() // 1000
+        hist = hist[hist["ts"] < now - (now + UTC_OFFSET_SEC) % self.interval]
+        if len(hist) == 0 and self.store.count(sym) == 0:
+            self.status[sym] = SHORT
+            self.source[sym] = source
+            return
+        self.store.prepend(sym, hist)
+        self.sb.reseed(sym, self.store)
+        self._mark(sym, READY if self.is_ready(sym) else SHORT, source)
+
+    def _mark(self, sym: str, status: str, source: str) -> None:
+        self.status[sym] = status
+        self.source[sym] = source
+        if status == READY and source != "live":
+            self.log.info(f"[WARM] {sym} ready from {source} bars={self.store.count(sym)}")
+        if status == READY and self.on_ready is not None:
+            self.on_ready(sym)
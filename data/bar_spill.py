@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.settings import DATA_DIR
+from data.bar_store import BAR_DTYPE
+
+SPILL_DIR = DATA_DIR / "bars"
+
+
+class BarSpill:
+    """퇴출된 종목의 바 이력 디스크 보관소
+
+    종목당 .npy 1개 (BAR_DTYPE 레코드 배열, 보유 바만 = 바당 48바이트).
+    save() 는 임시 파일에 쓰고 교체하므로 중간에 죽어도 이전 파일이 남는다.
+    """
+
+    def __init__(self, root: Path = SPILL_DIR) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        # symbol -> 파일 크기 (시작 시 한 번 스캔)
+        self._index: Dict[str, int] = {p.stem: p.stat().st_size for p in self.root.glob("*.npy")}
+
+    def path(self, symbol: str) -> Path:
+        return self.root / f"{symbol}.npy"
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self._index.values())
+
+    def save(self, symbol: str, bars: np.ndarray) -> int:
+        """바 이력 저장, 쓴 바이트 수 반환 (빈 이력은 저장하지 않음)"""
+        if len(bars) == 0:
+            return 0
+        path = self.path(symbol)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            np.save(f, np.ascontiguousarray(bars, dtype=BAR_DTYPE), allow_pickle=False)
+        os.replace(tmp, path)
+        size = path.stat().st_size
+        self._index[symbol] = size
+        return size
+
+    def load(self, symbol: str) -> Optional[np.ndarray]:
+        if symbol not in self._index:
+            return None
+        try:
+            arr = np.load(self.path(symbol), allow_pickle=False)
+        except (OSError, ValueError):
+            self._index.pop(symbol, None)
+            return None
+        if arr.dtype != BAR_DTYPE:
+            return None
+        return arr
+
+    def discard(self, symbol: str) -> None:
+        if self._index.pop(symbol, None) is not None:
+            try:
+                self.path(symbol).unlink()
+            except FileNotFoundError:
+                pass
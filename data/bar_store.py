@@ -0,0 +1,205 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from data.realtime_bar_builder import Bar
+
+
+FIELDS = ("ts", "open", "high", "low", "close", "volume")
+_DTYPES = {
+    "ts": np.int64,       # epoch seconds (bar 시작 분)
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+}
+# export()/load() 용 레코드 dtype (종목 1개 이력, 보유 바만 - 링버퍼 double-write 없음)
+BAR_DTYPE = np.dtype([(f, _DTYPES[f]) for f in FIELDS])
+
+
+class BarStore:
+    """종목별 고정 용량 컬럼형 링버퍼 (필드별 NumPy 2-D 배열, 행 = 종목)
+
+    각 값은 pos 와 pos+capacity 두 곳에 써 둔다(double-write). 덕분에 최근 N개는
+    항상 buf[row, pos+cap-N : pos+cap] 연속 구간이고, 복사 없는 view 로 읽을 수 있다.
+    종목당 메모리는 bytes_per_symbol 로 고정.
+    """
+
+    def __init__(self, capacity: int = 200, initial_symbols: int = 128) -> None:
+        self.capacity = int(capacity)
+        self._rows = max(1, int(initial_symbols))
+        self._bufs: Dict[str, np.ndarray] = {
+            f: np.zeros((self._rows, 2 * self.capacity), dtype=_DTYPES[f]) for f in FIELDS
+        }
+        self._pos = np.zeros(self._rows, dtype=np.int64)     # 다음 쓰기 위치 [0, cap)
+        self._count = np.zeros(self._rows, dtype=np.int64)   # 누적 바 수 (cap 에서 포화)
+        self.row_of: Dict[str, int] = {}
+        self.symbols: List[Optional[str]] = []
+        self._free_rows: List[int] = []
+
+    # ------------------ sizing ------------------
+    @property
+    def bytes_per_symbol(self) -> int:
+        return sum(np.dtype(_DTYPES[f]).itemsize for f in FIELDS) * 2 * self.capacity + 16
+
+    @property
+    def nbytes(self) -> int:
+        return sum(b.nbytes for b in self._bufs.values()) + self._pos.nbytes + self._count.nbytes
+
+    def _grow(self) -> None:
+        new_rows = self._rows * 2
+        for f, b in self._bufs.items():
+            nb = np.zeros((new_rows, b.shape[1]), dtype=b.dtype)
+            nb[: self._rows] = b
+            self._bufs[f] = nb
+        self._pos = np.concatenate([self._pos, np.zeros(new_rows - self._rows, dtype=np.int64)])
+        self._count = np.concatenate([self._count, np.zeros(new_rows - self._rows, dtype=np.int64)])
+        self._rows = new_rows
+
+    def row(self, symbol: str) -> int:
+        r = self.row_of.get(symbol)
+        if r is not None:
+            return r
+        if self._free_rows:
+            r = self._free_rows.pop()
+            self.symbols[r] = symbol
+        else:
+            r = len(self.symbols)
+            if r >= self._rows:
+                self._grow()
+            self.symbols.append(symbol)
+        self.row_of[symbol] = r
+        return r
+
+    def remove(self, symbol: str) -> bool:
+        r = self.row_of.pop(symbol, None)
+        if r is None:
+            return False
+        self._pos[r] = 0
+        self._count[r] = 0
+        self.symbols[r] = None
+        self._free_rows.append(r)
+        return True
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.row_of
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    # ------------------ append ------------------
+    def append(self, symbol: str, ts: int, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        r = self.row(symbol)
+        p = int(self._pos[r])
+        q = p + self.capacity
+        b = self._bufs
+        for f, v in (("ts", ts), ("open", open_), ("high", high), ("low", low), ("close", close), ("volume", volume)):
+            arr = b[f]
+            arr[r, p] = v
+            arr[r, q] = v
+        self._pos[r] = (p + 1) % self.capacity
+        if self._count[r] < self.capacity:
+            self._count[r] += 1
+
+    def append_bar(self, b: Bar) -> None:
+        self.append(b.symbol, b.ts, b.open, b.high, b.low, b.close, b.volume)
+
+    def load(self, symbol: str, bars: np.ndarray) -> int:
+        """BAR_DTYPE 레코드 배열(오래된 것 -> 최신)로 종목 이력을 통째로 채운다. 채운 바 수 반환"""
+        self.remove(symbol)
+        n = min(len(bars), self.capacity)
+        if n <= 0:
+            return 0
+        bars = bars[-n:]
+        r = self.row(symbol)
+        cap = self.capacity
+        for f in FIELDS:
+            buf = self._bufs[f]
+            buf[r, :n] = bars[f]
+            buf[r, cap:cap + n] = bars[f]
+        self._pos[r] = n % cap
+        self._count[r] = n
+        return n
+
+    def prepend(self, symbol: str, bars: np.ndarray) -> int:
+        """보유 중인 첫 바보다 오래된 이력만 앞에 붙인다 (warm start). 최종 바 수 반환"""
+        live = self.export(symbol)
+        if len(live):
+            bars = np.concatenate([bars[bars["ts"] < live["ts"][0]], live])
+        return self.load(symbol, bars)
+
+    # ------------------ read ------------------
+    def count(self, symbol: str) -> int:
+        r = self.row_of.get(symbol)
+        return 0 if r is None else int(self._count[r])
+
+    def view(self, symbol: str, field: str, n: Optional[int] = None) -> np.ndarray:
+        """최근 n개(기본: 보유 전체)의 zero-copy view, 오래된 것 -> 최신 순"""
+        r = self.row_of.get(symbol)
+        if r is None:
+            return self._bufs[field][0, :0]
+        cnt = int(self._count[r])
+        n = cnt if n is None else min(int(n), cnt)
+        end = int(self._pos[r]) + self.capacity
+        return self._bufs[field][r, end - n:end]
+
+    def closes(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        return self.view(symbol, "close", n)
+
+    def volumes(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        return self.view(symbol, "volume", n)
+
+    def matrix(self, field: str, n: int, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        """유니버스 전체(또는 symbols)를 (종목 수, n) 행렬로 반환
+
+        바가 n개 미만인 종목은 앞쪽이 NaN(ts 는 0). 행 순서는 symbols 순서,
+        생략하면 rows_for() 와 같은 내부 행 순서다.
+        """
+        rows = self.rows_for(symbols)
+        n = min(int(n), self.capacity)
+        buf = self._bufs[field]
+        if len(rows) == 0 or n <= 0:
+            return np.zeros((len(rows), max(0, n)), dtype=buf.dtype)
+        end = self._pos[rows] + self.capacity
+        idx = end[:, None] - n + np.arange(n)[None, :]
+        out = buf[rows[:, None], idx]
+        short = self._count[rows] < n
+        if short.any():
+            mask = np.arange(n)[None, :] < (n - self._count[rows])[:, None]
+            if out.dtype.kind == "f":
+                out[mask] = np.nan
+            else:
+                out[mask] = 0
+        return out
+
+    def rows_for(self, symbols: Optional[Sequence[str]] = None) -> np.ndarray:
+        if symbols is None:
+            return np.fromiter(self.row_of.values(), dtype=np.int64, count=len(self.row_of))
+        return np.fromiter((self.row_of[s] for s in symbols), dtype=np.int64, count=len(symbols))
+
+    def export(self, symbol: str) -> np.ndarray:
+        """보유 바 전체를 BAR_DTYPE 레코드 배열로 복사 (디스크 보관용)"""
+        r = self.row_of.get(symbol)
+        n = 0 if r is None else int(self._count[r])
+        out = np.empty(n, dtype=BAR_DTYPE)
+        for f in FIELDS:
+            out[f] = self.view(symbol, f, n)
+        return out
+
+    def to_dicts(self, symbol: str, n: Optional[int] = None) -> List[dict]:
+        # features_from_bars() 등 기존 dict 기반 코드 호환용
+        cols = {f: self.view(symbol, f, n) for f in FIELDS}
+        size = len(cols["close"])
+        return [
+            {
+                "ts": int(cols["ts"][i]),
+                "open": float(cols["open"][i]),
+                "high": float(cols["high"][i]),
+                "low": float(cols["low"][i]),
+                "close": float(cols["close"][i]),
+                "volume": int(cols["volume"][i]),
+            }
+            for i in range(size)
+        ]
@@ -1,11 +1,14 @@
 from __future__ import annotations
+import heapq
 from dataclasses import dataclass
-from typing import Callable, Dict
+from typing import Callable, Dict, List, Optional
+
+from core.clock import UTC_OFFSET_SEC
 
 
 @dataclass
 class Bar:
-    ts: str          # "YYYY-MM-DD HH:MM"
+    ts: int          # bar 시작 epoch seconds
     symbol: str
     open: float
     high: float
@@ -15,45 +18,93 @@ class Bar:
 
 
 class RealtimeBarBuilder:
-    def __init__(self, on_bar: Callable[[Bar], None]) -> None:
+    """틱 -> interval_sec 바 집계 (시각은 epoch ms 정수)
+
+    바 구간은 로컬 시각 기준 정수 나눗셈으로 정한다 (문자열 파싱/포맷 없음).
+    열린 바는 마감 시각(경계)별 버킷에 담고 경계 시각만 최소힙에 둔다.
+    on_tick/flush 는 힙 맨 앞 경계가 지났는지만 보고, 지난 경계마다 그 버킷의 바를
+    on_bar 로 하나씩 + on_batch 로 한 번에 내보낸다 (경계당 배치 1회, 순서 보장).
+    바가 닫힌 종목은 상태가 남지 않으므로 쉬는 종목은 자동으로 빠진다.
+    """
+
+    def __init__(
+        self,
+        on_bar: Callable[[Bar], None],
+        interval_sec: int = 60,
+        on_batch: Optional[Callable[[List[Bar]], None]] = None,
+        utc_offset_sec: int = UTC_OFFSET_SEC,
+    ) -> None:
+        if interval_sec <= 0 or 86400 % interval_sec:
+            raise ValueError(f"interval_sec must divide a day: {interval_sec}")
         self.on_bar = on_bar
+        self.on_batch = on_batch
+        self.interval = int(interval_sec)
+        self.offset = int(utc_offset_sec)
         self.cur: Dict[str, Bar] = {}
-        self.last_minute: Dict[str, str] = {}
-
-    def _minute_key(self, ts: str) -> str:
-        return ts[:16]
+        self._due: Dict[int, Dict[str, None]] = {}        # 마감 epoch -> 그때 닫힐 종목
+        self._heap: List[int] = []                        # _due 의 키 (최소힙)
+        self._now = 0                                     # 마지막으로 처리한 경계
 
-    def on_tick(self, symbol: str, price: float, volume: int, ts: str) -> None:
-        m = self._minute_key(ts)
-        prev_m = self.last_minute.get(symbol)
+    def __len__(self) -> int:
+        return len(self.cur)
 
-        if prev_m and prev_m != m:
-            b = self.cur.get(symbol)
-            if b:
-                self.on_bar(b)
-            self.cur.pop(symbol, None)
+    def start_of(self, t: int) -> int:
+        """epoch seconds t 가 속한 바의 시작 epoch"""
+        return t - (t + self.offset) % self.interval
 
-        self.last_minute[symbol] = m
+    def on_tick(self, symbol: str, price: float, volume: int, ts_ms: int) -> None:
+        t = ts_ms // 1000
+        heap = self._heap
+        if heap and heap[0] <= t:
+            self._advance(t)
+        if t < self._now:
+            t = self._now     # 이미 닫은 경계보다 늦게 온 틱은 열린 구간에 합산
 
         b = self.cur.get(symbol)
-        if not b:
+        if b is None:
+            start = t - (t + self.offset) % self.interval
+            end = start + self.interval
             self.cur[symbol] = Bar(
-                ts=m, symbol=symbol,
+                ts=start, symbol=symbol,
                 open=price, high=price, low=price, close=price,
                 volume=max(0, int(volume)),
             )
+            due = self._due.get(end)
+            if due is None:
+                due = self._due[end] = {}
+                heapq.heappush(heap, end)
+            due[symbol] = None
         else:
-            b.high = max(b.high, price)
-            b.low = min(b.low, price)
+            if price > b.high:
+                b.high = price
+            elif price < b.low:
+                b.low = price
             b.close = price
-            b.volume += max(0, int(volume))
-
-    def flush(self, now_ts: str) -> None:
-        m = self._minute_key(now_ts)
-        for symbol, last_m in list(self.last_minute.items()):
-            if last_m != m:
-                b = self.cur.get(symbol)
-                if b:
-                    self.on_bar(b)
-                    self.cur.pop(symbol, None)
-                self.last_minute[symbol] = m
+            if volume > 0:
+                b.volume += int(volume)
+
+    def flush(self, now_ms: int) -> int:
+        """now_ms 까지 지난 경계의 바를 닫는다. 닫은 바 수 반환 (경계가 안 지났으면 O(1))"""
+        t = now_ms // 1000
+        if self._heap and self._heap[0] <= t:
+            return self._advance(t)
+        return 0
+
+    def _advance(self, t: int) -> int:
+        n = 0
+        heap = self._heap
+        while heap and heap[0] <= t:
+            end = heapq.heappop(heap)
+            bars = []
+            for s in self._due.pop(end):
+                bars.append(self.cur.pop(s))
+            self._now = end
+            for b in bars:
+                self.on_bar(b)
+            if self.on_batch is not None:
+                self.on_batch(bars)
+            n += len(bars)
+        start = self.start_of(t)
+        if start > self._now:
+            self._now = start
+        return n
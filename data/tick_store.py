@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import struct
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.settings import DATA_DIR
+
+TICK_DIR = DATA_DIR / "ticks"
+
+# 고정폭 36바이트 레코드: symbol id, 거래소 체결시각 epoch-µs, price, volume, 로컬 수신시각 epoch-µs
+# 리플레이는 ts_us (거래소 시각) 로 돌고, recv_us 는 수신 지연/PC 시계 어긋남 분석용
+TICK_DTYPE = np.dtype([("sid", "<u4"), ("ts_us", "<i8"), ("price", "<f8"), ("volume", "<i8"), ("recv_us", "<i8")])
+_REC = struct.Struct("<Iqdqq")
+assert _REC.size == TICK_DTYPE.itemsize
+
+
+def day_paths(day: str, root: Path = TICK_DIR) -> Dict[str, Path]:
+    """YYYYMMDD 하루치 파일 묶음
+
+    ticks  : 도착 순 레코드 (녹화 중 append)
+    symbols: sid -> 종목코드 (줄 번호 = sid, append-only)
+    bysym  : 종목별로 안정 정렬한 레코드 (close/build_index 가 생성)
+    idx    : bysym 안에서 sid 별 시작 오프셋 (len = 종목 수 + 1)
+    """
+    return {
+        "ticks": root / f"{day}.ticks",
+        "symbols": root / f"{day}.symbols",
+        "bysym": root / f"{day}.bysym.ticks",
+        "idx": root / f"{day}.idx.npy",
+    }
+
+
+class TickRecorder:
+    """틱을 일자별 바이너리 파일로 append. record() 는 struct pack + 버퍼드 write 뿐
+
+    일자는 거래소 체결시각 기준으로 나눈다.
+    """
+
+    def __init__(self, root: Path = TICK_DIR, buffer_bytes: int = 1 << 20) -> None:
+        self.root = Path(root)
+        self.buffer_bytes = int(buffer_bytes)
+        self.day: Optional[str] = None
+        self._next_day_us = 0
+        self._f: Optional[BinaryIO] = None
+        self._sym_f = None
+        self._sid: Dict[str, int] = {}
+        self.n_records = 0
+
+    def _open_day(self, ts_us: int) -> None:
+        self.close()
+        dt = datetime.fromtimestamp(ts_us / 1e6)
+        self.day = dt.strftime("%Y%m%d")
+        midnight = datetime(dt.year, dt.month, dt.day) + timedelta(days=1)
+        self._next_day_us = int(midnight.timestamp() * 1e6)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        paths = day_paths(self.day, self.root)
+        # 같은 날 재시작이면 기존 심볼 사전을 이어서 사용
+        self._sid = {}
+        if paths["symbols"].exists():
+            for i, line in enumerate(paths["symbols"].read_text(encoding="utf-8").splitlines()):
+                self._sid[line.strip()] = i
+        self._f = paths["ticks"].open("ab", buffering=self.buffer_bytes)
+        self._sym_f = paths["symbols"].open("a", encoding="utf-8")
+
+    def record(self, code: str, price: float, volume: int, ts_ms: int, recv_us: int = 0) -> None:
+        """ts_ms: 거래소 체결시각 epoch ms (디코더가 준 값), recv_us: 로컬 수신시각 epoch µs"""
+        ts_us = ts_ms * 1000
+        if self._f is None or ts_us >= self._next_day_us:
+            self._open_day(ts_us)
+        sid = self._sid.get(code)
+        if sid is None:
+            sid = self._sid[code] = len(self._sid)
+            self._sym_f.write(code + "\n")
+            self._sym_f.flush()
+        self._f.write(_REC.pack(sid, ts_us, price, volume, recv_us))
+        self.n_records += 1
+
+    def flush(self) -> None:
+        if self._f:
+            self._f.flush()
+
+    def close(self) -> None:
+        if self._f is None:
+            return
+        self._f.close()
+        self._sym_f.close()
+        self._f = None
+        self._sym_f = None
+        build_index(self.day, self.root)
+
+
+def _memmap(path: Path) -> np.ndarray:
+    if not path.exists() or path.stat().st_size < TICK_DTYPE.itemsize:
+        return np.zeros(0, dtype=TICK_DTYPE)
+    n = path.stat().st_size // TICK_DTYPE.itemsize   # 녹화 중 잘린 꼬리 레코드는 무시
+    return np.memmap(path, dtype=TICK_DTYPE, mode="r", shape=(n,))
+
+
+def build_index(day: str, root: Path = TICK_DIR) -> None:
+    """도착 순 파일에서 종목별 정렬 파일 + 오프셋 인덱스 생성 (비정상 종료 후에도 호출 가능)"""
+    paths = day_paths(day, root)
+    recs = _memmap(paths["ticks"])
+    n_syms = len(_read_symbols(paths["symbols"]))
+    order = np.argsort(recs["sid"], kind="stable")
+    recs[order].tofile(paths["bysym"])
+    counts = np.bincount(recs["sid"], minlength=n_syms) if len(recs) else np.zeros(n_syms, dtype=np.int64)
+    offsets = np.zeros(n_syms + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    np.save(paths["idx"], offsets)
+
+
+def _read_symbols(path: Path) -> List[str]:
+    if not path.exists():
+        return []
+    return [x.strip() for x in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TickDay:
+    """하루치 녹화 파일 reader. 파싱 없이 memmap 레코드 배열/종목별 view 를 준다"""
+
+    def __init__(self, day: str, root: Path = TICK_DIR) -> None:
+        self.day = day
+        self.paths = day_paths(day, root)
+        self.symbols = _read_symbols(self.paths["symbols"])
+        self.sid_of = {s: i for i, s in enumerate(self.symbols)}
+        if not self.paths["ticks"].exists():
+            raise FileNotFoundError(self.paths["ticks"])
+        self.records = _memmap(self.paths["ticks"])
+        if not self.paths["idx"].exists() or self.paths["idx"].stat().st_mtime < self.paths["ticks"].stat().st_mtime:
+            build_index(day, root)
+        self.by_symbol = _memmap(self.paths["bysym"])
+        self.offsets = np.load(self.paths["idx"], mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def symbol(self, code: str) -> np.ndarray:
+        """종목 1개의 레코드 (bysym memmap 의 연속 구간 view, 시간순)"""
+        sid = self.sid_of.get(code)
+        if sid is None or sid + 1 >= len(self.offsets):
+            return self.by_symbol[:0]
+        return self.by_symbol[int(self.offsets[sid]):int(self.offsets[sid + 1])]
+
+    def iter_ticks(self, chunk: int = 1 << 16) -> Iterator[Tuple[float, str, float, int]]:
+        """도착 순 (거래소 epoch_sec, code, price, volume) - app_replay 틱 소스"""
+        syms = self.symbols
+        recs = self.records
+        for i in range(0, len(recs), chunk):
+            part = recs[i:i + chunk]
+            for sid, ts_us, price, vol in zip(part["sid"].tolist(), part["ts_us"].tolist(),
+                                              part["price"].tolist(), part["volume"].tolist()):
+                yield (ts_us / 1e6, syms[sid], price, vol)
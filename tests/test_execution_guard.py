@@ -0,0 +1,130 @@
+import pytest
+
+from core.clock import FixedClock
+from core.execution_guard import ExecutionGuard, GuardConfig, SlidingWindow
+from core.types import Order, OrderType, Side
+
+
+def _order(symbol="005930", side=Side.BUY):
+    return Order(symbol=symbol, side=side, qty=1, order_type=OrderType.MARKET, price=None)
+
+
+def _guard(**kw):
+    cfg = dict(
+        max_orders_per_minute=0,
+        min_seconds_between_orders=0,
+        max_orders_per_symbol_per_minute=0,
+        max_orders_per_side_per_minute=0,
+        kiwoom_orders_per_sec=0,
+    )
+    cfg.update(kw)
+    clock = FixedClock(1_000.0)
+    return ExecutionGuard(GuardConfig(**cfg), clock=clock), clock
+
+
+def _send(g, o, strategy=None):
+    g.record_order(o.symbol, o.side, strategy)
+
+
+def test_sliding_window_wait_and_expiry():
+    w = SlidingWindow(2, 1.0)
+    assert w.wait_ns(0) == 0
+    w.record(0)
+    w.record(300_000_000)
+    assert w.wait_ns(500_000_000) == 500_000_000
+    assert w.wait_ns(1_000_000_000) == 0      # 0s 기록이 창 밖으로
+    assert len(w) == 1
+    w.record(1_000_000_000)
+    assert w.wait_ns(1_100_000_000) == 200_000_000
+    assert w.wait_ns(1_300_000_000) == 0
+
+
+def test_unlimited_guard_always_allows():
+    g, _ = _guard()
+    for _ in range(100):
+        assert g.check(_order()) == (0.0, "ok")
+        _send(g, _order())
+
+
+def test_min_interval():
+    g, clock = _guard(min_seconds_between_orders=2)
+    _send(g, _order())
+    assert g.check(_order("000660")) == (pytest.approx(2.0), "min_seconds_between_orders")
+    clock.set(1_001.5)
+    assert g.check(_order("000660")) == (pytest.approx(0.5), "min_seconds_between_orders")
+    clock.set(1_002.0)
+    assert g.check(_order("000660")) == (0.0, "ok")
+
+
+def test_global_per_minute_slides():
+    g, clock = _guard(max_orders_per_minute=3)
+    for i in range(3):
+        clock.set(1_000.0 + 10 * i)
+        _send(g, _order(f"00000{i}"))
+    clock.set(1_030.0)
+    # 가장 오래된 기록(1000s)이 60초 뒤 빠질 때까지
+    assert g.check(_order("999999")) == (pytest.approx(30.0), "rate_limit_per_minute")
+    clock.set(1_060.0)
+    assert g.allow_order(_order("999999")) == (True, "ok")
+    # 10s 에 기록된 두 번째는 아직 창 안 -> 한 건만 비었다
+    _send(g, _order("999999"))
+    assert g.allow_order(_order("888888")) == (False, "rate_limit_per_minute")
+
+
+def test_kiwoom_per_second():
+    g, clock = _guard(kiwoom_orders_per_sec=5)
+    for i in range(5):
+        clock.set(1_000.0 + 0.1 * i)
+        _send(g, _order(f"00000{i}"))
+    wait, why = g.check(_order("999999"))
+    assert why == "kiwoom_rate_per_sec" and wait == pytest.approx(0.6)
+    clock.set(1_001.0)
+    assert g.check(_order("999999")) == (0.0, "ok")
+
+
+def test_per_symbol_window_is_independent():
+    g, clock = _guard(max_orders_per_symbol_per_minute=2)
+    _send(g, _order("A"))
+    clock.set(1_005.0)
+    _send(g, _order("A"))
+    assert g.check(_order("A")) == (pytest.approx(55.0), "symbol_rate_per_minute")
+    assert g.check(_order("B")) == (0.0, "ok")
+    clock.set(1_060.0)
+    assert g.check(_order("A")) == (0.0, "ok")
+    g.forget("A")
+    assert "A" not in g._by_symbol
+
+
+def test_per_side_window():
+    g, clock = _guard(max_orders_per_side_per_minute=1)
+    _send(g, _order("A", Side.BUY))
+    assert g.check(_order("B", Side.BUY)) == (pytest.approx(60.0), "side_rate_per_minute")
+    assert g.check(_order("B", Side.SELL)) == (0.0, "ok")
+    clock.set(1_060.0)
+    assert g.check(_order("B", Side.BUY)) == (0.0, "ok")
+
+
+def test_per_strategy_quota():
+    g, clock = _guard(max_orders_per_minute=10)
+    g.set_quota("tight", 2)
+    _send(g, _order("A"), "tight")
+    clock.set(1_010.0)
+    _send(g, _order("B"), "tight")
+    assert g.check(_order("C"), "tight") == (pytest.approx(50.0), "strategy_quota_per_minute")
+    # 다른 전략/전략 없음은 전역 예산만
+    assert g.check(_order("C"), "wide") == (0.0, "ok")
+    assert g.check(_order("C")) == (0.0, "ok")
+    clock.set(1_060.0)
+    assert g.check(_order("C"), "tight") == (0.0, "ok")
+    g.set_quota("tight", 0)
+    for _ in range(3):
+        _send(g, _order("D"), "tight")
+    assert g.check(_order("E"), "tight") == (0.0, "ok")
+
+
+def test_latest_freeing_budget_wins():
+    g, clock = _guard(min_seconds_between_orders=1, max_orders_per_symbol_per_minute=1)
+    _send(g, _order("A"))
+    clock.set(1_000.5)
+    assert g.check(_order("A")) == (pytest.approx(59.5), "symbol_rate_per_minute")
+    assert g.check(_order("B")) == (pytest.approx(0.5), "min_seconds_between_orders")
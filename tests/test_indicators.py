@@ -0,0 +1,129 @@
+import math
+import random
+
+import pytest
+
+from core.indicators import StreamingFeatures, features_from_bars
+from core.scoring import ScoreBoard, batch_scores, score_from_features
+from data.bar_store import BarStore
+
+KEYS = ("ret_1", "ret_5", "ema_5", "ema_20", "rsi_14", "vol_ratio")
+
+
+def _bars(n, seed=0):
+    rnd = random.Random(seed)
+    px = 10_000.0
+    out = []
+    for _ in range(n):
+        px *= 1 + rnd.gauss(0, 0.004)
+        out.append({"close": round(px, 1), "volume": rnd.randint(0, 5_000)})
+    return out
+
+
+def _close(a, b):
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_streaming_matches_features_from_bars(seed):
+    bars = _bars(120, seed)
+    sf = StreamingFeatures()
+    for i, b in enumerate(bars, 1):
+        got = sf.update(b["close"], b["volume"])
+        want = features_from_bars(bars[:i])
+        assert bool(got) == bool(want)
+        for k in want:
+            assert _close(got[k], want[k]), (i, k, got[k], want[k])
+
+
+def test_streaming_rsi_all_gains():
+    # 하락 없는 구간: rsi() 의 losses == 0 분기 (100) 와 같아야 함
+    bars = [{"close": 100.0 + i, "volume": 10} for i in range(30)]
+    sf = StreamingFeatures()
+    for b in bars:
+        got = sf.update(b["close"], b["volume"])
+    assert got["rsi_14"] == features_from_bars(bars)["rsi_14"] == 100.0
+
+
+def test_scoreboard_on_bar_matches_score_from_features():
+    bars = _bars(80, seed=3)
+    sb = ScoreBoard()
+    for i, b in enumerate(bars, 1):
+        sb.on_bar("A", b["close"], b["volume"])
+        want = features_from_bars(bars[:i])
+        if want:
+            assert _close(sb.get("A"), score_from_features(want))
+        else:
+            assert sb.get("A") == -1e9
+
+
+def test_batch_scores_match_streaming():
+    store = BarStore(capacity=200)
+    hist = {}
+    for j, sym in enumerate(["A", "B", "C", "D"]):
+        n = (25, 40, 60, 19)[j]
+        hist[sym] = _bars(n, seed=10 + j)
+        for t, b in enumerate(hist[sym]):
+            store.append(sym, t * 60_000, b["close"], b["close"], b["close"], b["close"], b["volume"])
+    syms = list(hist)
+    scores, ranked = batch_scores(store.matrix("close", 40, syms), store.matrix("volume", 40, syms))
+    for sym, sc in zip(syms, scores.tolist()):
+        f = features_from_bars(hist[sym])
+        if f:
+            assert _close(sc, score_from_features(f))
+        else:
+            assert math.isnan(sc)
+    valid = [i for i, sc in enumerate(scores.tolist()) if not math.isnan(sc)]
+    assert ranked.tolist() == sorted(valid, key=lambda i: -scores[i])
+
+
+def test_batch_keeps_streaming_state():
+    store = BarStore(capacity=200)
+    sb = ScoreBoard(batch_min=2)
+    hist = {s: _bars(70, seed=20 + i) for i, s in enumerate(["A", "B", "C"])}
+    for t in range(70):
+        for s, bars in hist.items():
+            b = bars[t]
+            store.append(s, t * 60_000, b["close"], b["close"], b["close"], b["close"], b["volume"])
+        if t == 30:
+            for s in hist:
+                sb.update_from_store(s, store)
+        sb.score_closed(store, list(hist))
+    for s, bars in hist.items():
+        got = sb.features[s].features()
+        want = features_from_bars(bars)
+        for k in KEYS:
+            assert _close(got[k], want[k])
+
+
+def test_alternating_batch_and_single_closes_match_reference():
+    # 분마다 전 종목이 닫히면 벡터화 경로, 한 종목만 닫히면 O(1) 스트리밍 경로.
+    # 점수는 매번 features_from_bars 기준과 같아야 하고, 배치 경로를 지나도 스트리밍 상태가
+    # 유지돼야 한다 (버리면 다음 단일 종목 바에서 store 로 다시 시드 = 새 StreamingFeatures).
+    store = BarStore(capacity=400)
+    sb = ScoreBoard(batch_min=3)
+    syms = ["A", "B", "C", "D"]
+    src = {s: _bars(200, seed=40 + i) for i, s in enumerate(syms)}
+    hist = {s: [] for s in syms}
+    state = {}
+    for t in range(150):
+        closed = syms if t % 3 == 0 else [syms[t % 4]]
+        for s in closed:
+            b = src[s][len(hist[s])]
+            hist[s].append(b)
+            store.append(s, t * 60_000, b["close"], b["close"], b["close"], b["close"], b["volume"])
+        sb.score_closed(store, closed)
+        for s in syms:
+            f = features_from_bars(hist[s])
+            if not f:
+                continue
+            assert _close(sb.get(s), score_from_features(f)), (t, s)
+            sf = sb.features.get(s)
+            if sf is None:
+                continue
+            assert state.setdefault(s, sf) is sf, (t, s)
+            if s in closed:
+                got = sf.features()
+                for k in KEYS:
+                    assert _close(got[k], f[k]), (t, s, k)
+    assert set(state) == set(syms)
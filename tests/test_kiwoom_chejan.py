@@ -0,0 +1,61 @@
+from broker.kiwoom_chejan import GUBUN_BALANCE, GUBUN_ORDER, decode_chejan
+from core.types import Side
+
+
+def _reader(values):
+    reads = []
+
+    def get(fid):
+        reads.append(fid)
+        return values.get(fid, "")
+
+    return get, reads
+
+
+def test_accept_reads_no_fill_fields():
+    get, reads = _reader({9001: "A005930", 9203: "0012345", 913: "접수", 905: "+매수",
+                          900: "10", 901: "71200", 902: "10"})
+    ev = decode_chejan(GUBUN_ORDER, get)
+    assert (ev.code, ev.order_no, ev.side, ev.order_qty, ev.order_price, ev.unfilled) == \
+        ("005930", "0012345", Side.BUY, 10, 71200, 10)
+    assert not ev.is_fill
+    assert sorted(reads) == sorted([9001, 9203, 913, 905, 900, 902, 901])
+
+
+def test_fill_reads_unit_fill_and_skips_order_price():
+    get, reads = _reader({9001: "005930", 9203: "0012345", 913: "체결", 905: "-매도",
+                          900: "10", 902: "4", 914: "-71300", 915: "6"})
+    ev = decode_chejan(GUBUN_ORDER, get)
+    assert ev.side == Side.SELL and ev.is_fill
+    assert (ev.fill_qty, ev.fill_price, ev.unfilled) == (6, 71300, 4)
+    assert 901 not in reads and 907 not in reads
+    assert len(reads) == 8
+
+
+def test_cancel_confirm_reads_only_orig_order():
+    get, reads = _reader({9001: "005930", 9203: "0012399", 913: "확인", 905: "매수취소", 904: "0012345"})
+    ev = decode_chejan(GUBUN_ORDER, get)
+    assert ev.orig_order_no == "0012345" and ev.side == Side.BUY
+    assert sorted(reads) == sorted([9001, 9203, 913, 905, 904])
+
+
+def test_modify_reads_orig_order():
+    get, reads = _reader({9001: "005930", 9203: "0012400", 913: "접수", 905: "매도정정", 904: "0012345",
+                          900: "5", 902: "5"})
+    ev = decode_chejan(GUBUN_ORDER, get)
+    assert ev.orig_order_no == "0012345" and ev.side == Side.SELL
+    assert 904 in reads and 914 not in reads
+
+
+def test_side_falls_back_to_sell_buy_fid():
+    get, reads = _reader({9001: "005930", 9203: "1", 913: "접수", 905: "보통", 907: "2"})
+    assert decode_chejan(GUBUN_ORDER, get).side == Side.BUY
+    assert 907 in reads
+
+
+def test_balance_and_missing_code():
+    get, _ = _reader({9001: "A000660", 10: "-182000", 930: "7", 931: "181500", 946: "2"})
+    ev = decode_chejan(GUBUN_BALANCE, get)
+    assert (ev.code, ev.cur_price, ev.holding_qty, ev.avg_price) == ("000660", 182000, 7, 181500)
+    get, reads = _reader({})
+    assert decode_chejan(GUBUN_ORDER, get) is None and reads == [9001]
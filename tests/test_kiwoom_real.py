@@ -0,0 +1,82 @@
+import pytest
+
+from broker.fake_ocx import FakeKiwoomOcx
+from broker.kiwoom_real import REAL_LAYOUTS, RealDataDecoder, encode_real_data
+from core.clock import UTC_OFFSET_SEC, FixedClock
+
+# 주식체결 한 건: 현재가/호가는 등락 부호가 붙어 오고, 거래량 부호는 매수(+)/매도(-) 체결
+TRADE = {20: "093005", 10: "-71200", 11: "-300", 12: "-0.42", 27: "-71300", 28: "-71200",
+         15: "-25", 13: "+1523400", 228: "87.53"}
+
+
+def _midnight_ms(t: float) -> int:
+    s = int(t)
+    return (s - (s + UTC_OFFSET_SEC) % 86400) * 1000
+
+
+def test_decode_strips_price_sign_keeps_volume_sign():
+    rec = RealDataDecoder().decode("005930", "주식체결", encode_real_data("주식체결", TRADE))
+    assert rec.price == 71200
+    assert rec.best_ask == 71300 and rec.best_bid == 71200
+    assert rec.volume == -25
+    assert rec.cum_volume == 1523400
+    assert rec.exch_time == 93005
+    assert rec.strength == pytest.approx(87.53)
+
+
+def test_decode_orderbook_uses_its_own_fids():
+    vals = {21: "093010", 41: "-71300", 51: "-71200"}
+    rec = RealDataDecoder().decode("005930", "주식호가잔량", encode_real_data("주식호가잔량", vals))
+    assert (rec.exch_time, rec.best_ask, rec.best_bid, rec.price) == (93010, 71300, 71200, 0)
+
+
+def test_decode_short_payload_or_unknown_type_returns_none():
+    dec = RealDataDecoder()
+    short = "\t".join(["093005", "-71200"])
+    assert dec.decode("005930", "주식체결", short) is None
+    assert dec.decode("005930", "장시작시간", "") is None
+    assert not dec.knows("장시작시간")
+
+
+@pytest.fixture
+def broker():
+    from broker.kiwoom import KiwoomBroker
+
+    clock = FixedClock(1_791_000_000.0)
+    ocx = FakeKiwoomOcx()
+    b = KiwoomBroker(ocx=ocx, schedule=lambda delay, fn: None, clock=clock)
+    ticks, prices = [], []
+    b.on_tick = lambda *a: ticks.append(a)
+    b.on_price = lambda *a: prices.append(a)
+    return b, ocx, clock, ticks, prices
+
+
+def test_broker_real_data_to_tick(broker):
+    b, ocx, clock, ticks, prices = broker
+    ocx.push_real("005930", "주식체결", TRADE)
+    ts = _midnight_ms(clock.t) + (9 * 3600 + 30 * 60 + 5) * 1000
+    assert ticks == [("005930", 71200.0, 25, ts)]
+    assert prices == [("005930", 71200.0, ts)]
+    assert b.get_positions()["005930"].last_price == 71200.0
+
+
+def test_broker_skips_non_trade_events(broker):
+    b, ocx, clock, ticks, prices = broker
+    ocx.push_real("005930", "주식호가잔량", {21: "093010", 41: "-71300", 51: "-71200"})
+    b._on_receive_real_data("005930", "장시작시간", "090000")
+    assert ticks == [] and prices == []
+
+
+def test_broker_falls_back_to_get_comm_real_data(broker):
+    # 필드가 모자란 페이로드 -> GetCommRealData(10/15) 로 다시 읽고 시각은 시계 기준
+    b, ocx, clock, ticks, prices = broker
+    ocx._real["000660"] = {10: "+182000", 15: "+3"}
+    b._on_receive_real_data("000660", "주식체결", "093005")
+    sod = (int(clock.t) + UTC_OFFSET_SEC) % 86400
+    assert ticks == [("000660", 182000.0, 3, _midnight_ms(clock.t) + sod * 1000)]
+
+
+def test_layouts_are_consistent_with_encoder():
+    for real_type, fids in REAL_LAYOUTS.items():
+        assert len(set(fids)) == len(fids), real_type
+        assert encode_real_data(real_type, {}).count("\t") == len(fids) - 1
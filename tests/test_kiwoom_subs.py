@@ -0,0 +1,63 @@
+import pytest
+
+from broker.kiwoom_subs import SubscriptionManager
+
+
+class Ocx:
+    def __init__(self):
+        self.calls = []
+        self.fail_screens = set()
+        self.raise_remove = False
+
+    def register(self, screen, codes, fids, opt):
+        self.calls.append(("reg", screen, codes))
+        return -200 if screen in self.fail_screens else 0
+
+    def remove(self, screen, code):
+        self.calls.append(("rm", screen, code))
+        if self.raise_remove:
+            raise RuntimeError("SetRealRemove")
+
+
+def _subs(ocx, per_screen=2):
+    return SubscriptionManager(ocx.register, ocx.remove, per_screen=per_screen, max_screens=3)
+
+
+def test_sync_diff_and_screen_fill():
+    ocx = Ocx()
+    s = _subs(ocx)
+    assert s.sync(["A", "B", "C"]) == (["A", "B", "C"], [])
+    assert ocx.calls == [("reg", "0202", "A;B"), ("reg", "0203", "C")]
+    ocx.calls.clear()
+    assert s.sync(["A", "B", "C"]) == ([], [])
+    assert ocx.calls == []
+    assert s.sync(["B", "C", "D"]) == (["D"], ["A"])
+    assert s.screen_of("D") == "0202"
+
+
+def test_failed_register_is_retried_on_next_sync():
+    ocx = Ocx()
+    s = _subs(ocx)
+    ocx.fail_screens = {"0203"}
+    assert s.sync(["A", "B", "C"]) == (["A", "B"], [])
+    assert "C" not in s and s.occupancy() == {"0202": 2}
+
+    ocx.fail_screens = set()
+    ocx.calls.clear()
+    assert s.sync(["A", "B", "C"]) == (["C"], [])
+    assert ocx.calls == [("reg", "0203", "C")]
+    assert s.screen_of("C") == "0203"
+
+
+def test_failed_remove_keeps_code_registered():
+    ocx = Ocx()
+    s = _subs(ocx)
+    s.sync(["A", "B"])
+    ocx.raise_remove = True
+    with pytest.raises(RuntimeError):
+        s.sync(["A"])
+    assert "B" in s and s.screen_of("B") == "0202"
+
+    ocx.raise_remove = False
+    assert s.sync(["A"]) == ([], ["B"])
+    assert s.codes() == ["A"]
@@ -0,0 +1,26 @@
+import time
+
+from core.logger import JsonlSink
+
+
+def test_flush_writes_immediately_despite_flush_sec(tmp_path):
+    sink = JsonlSink(flush_sec=30.0, flush_bytes=1 << 20)
+    path = tmp_path / "a.jsonl"
+    try:
+        sink.write(path, {"i": 1})
+        t0 = time.monotonic()
+        assert sink.flush(timeout=5.0)
+        assert time.monotonic() - t0 < 1.0
+        assert path.read_text(encoding="utf-8") == '{"i": 1}\n'
+
+        # 이미 써 두고 flush_sec 대기 중인 바이트도 바로 내려간다
+        sink.write(path, {"i": 2})
+        time.sleep(0.05)
+        t0 = time.monotonic()
+        assert sink.flush(timeout=5.0)
+        assert time.monotonic() - t0 < 1.0
+        assert path.read_text(encoding="utf-8").splitlines() == ['{"i": 1}', '{"i": 2}']
+    finally:
+        sink.close()
+    assert sink.flush(timeout=0.1)
+    assert sink.stats()["written"] == 2
@@ -0,0 +1,116 @@
+from broker.kiwoom_chejan import ChejanEvent
+from core.clock import FixedClock
+from core.order_book import OrderBook, OrderState
+from core.types import Side
+
+
+def _ev(order_no, code="005930", side=Side.BUY, status="접수", kind="+매수", qty=10, unfilled=10,
+        price=71000, orig=""):
+    ev = ChejanEvent("0", code)
+    ev.order_no = order_no
+    ev.status = status
+    ev.kind = kind
+    ev.side = side
+    ev.order_qty = qty
+    ev.unfilled = unfilled
+    ev.order_price = price
+    ev.orig_order_no = orig
+    return ev
+
+
+def _book(**kw):
+    clock = FixedClock(1_000.0)
+    return OrderBook(clock=clock, **kw), clock
+
+
+def _check_open_qty(book):
+    # 카운터가 미체결 주문에서 다시 계산한 값과 같아야 한다
+    want = {}
+    for o in book.working():
+        want[(o.symbol, o.side)] = want.get((o.symbol, o.side), 0) + o.qty - o.filled
+    for sym in {o.symbol for o in book.snapshot().orders.values()} | {s for s, _ in want}:
+        for side in (Side.BUY, Side.SELL):
+            assert book.open_qty(sym, side) == want.get((sym, side), 0), (sym, side)
+
+
+def test_pending_accept_partial_fill():
+    book, clock = _book()
+    key = book.add_pending("005930", Side.BUY, 10, 71000)
+    assert book.get(key).state == OrderState.PENDING
+    assert book.open_qty("005930", Side.BUY) == 10
+    _check_open_qty(book)
+
+    clock.set(1_001.0)
+    o = book.apply_chejan(_ev("0001"))
+    assert o.order_no == "0001" and o.state == OrderState.ACCEPTED
+    assert book.get(key) is None
+    assert book.open_qty("005930") == 10
+    _check_open_qty(book)
+
+    o = book.apply_chejan(_ev("0001", status="체결", unfilled=6, price=0))
+    assert (o.state, o.filled, o.price) == (OrderState.PARTIAL, 4, 71000.0)
+    assert book.open_qty("005930", Side.BUY) == 6
+    _check_open_qty(book)
+
+    o = book.apply_chejan(_ev("0001", status="체결", unfilled=0, price=0))
+    assert (o.state, o.filled) == (OrderState.FILLED, 10)
+    assert book.open_qty("005930") == 0
+    assert book.working() == []
+    _check_open_qty(book)
+
+    # 종료 상태에서는 더 바뀌지 않는다
+    assert book.apply_chejan(_ev("0001")) is None
+    assert book.get("0001").state == OrderState.FILLED
+
+
+def test_reject_local_and_chejan():
+    book, _ = _book()
+    k1 = book.add_pending("005930", Side.BUY, 10)
+    k2 = book.add_pending("000660", Side.SELL, 3)
+    book.reject(k1)
+    assert book.get(k1).state == OrderState.REJECTED
+    assert book.open_qty("005930") == 0
+
+    o = book.apply_chejan(_ev("0002", code="000660", side=Side.SELL, status="거부", kind="-매도", qty=3, unfilled=3))
+    assert o.order_no == "0002" and o.state == OrderState.REJECTED
+    assert book.get(k2) is None
+    assert book.n_open() == 0
+    _check_open_qty(book)
+
+
+def test_merge_tr_expires_stuck_pending():
+    book, clock = _book(tr_grace_sec=5.0, pending_grace_sec=60.0)
+    stuck = book.add_pending("005930", Side.SELL, 5)
+    clock.set(1_030.0)
+    fresh = book.add_pending("000660", Side.BUY, 2)
+
+    clock.set(1_059.0)
+    assert book.merge_tr([]) == 0
+    assert book.get(stuck).state == OrderState.PENDING
+
+    clock.set(1_060.0)
+    assert book.merge_tr([]) == 1
+    assert book.get(stuck).state == OrderState.REJECTED
+    assert book.get(stuck).src == "TR"
+    assert book.get(fresh).state == OrderState.PENDING
+    assert book.open_qty("005930", Side.SELL) == 0
+    assert book.open_qty("000660", Side.BUY) == 2
+    _check_open_qty(book)
+
+
+def test_merge_tr_updates_and_cancels_missing():
+    book, clock = _book(tr_grace_sec=5.0)
+    book.apply_chejan(_ev("0001", qty=10, unfilled=10))
+    book.apply_chejan(_ev("0002", code="000660", qty=4, unfilled=4))
+    clock.set(1_010.0)
+    rows = [
+        {"order_no": "0001", "code": "005930", "side": Side.BUY, "order_qty": 10, "unfilled": 7},
+        {"order_no": "0003", "code": "035720", "side": Side.SELL, "order_qty": 5, "unfilled": 5},
+    ]
+    assert book.merge_tr(rows) == 3
+    assert (book.get("0001").state, book.get("0001").filled) == (OrderState.PARTIAL, 3)
+    assert book.get("0002").state == OrderState.CANCELLED
+    assert book.get("0003").state == OrderState.ACCEPTED and book.get("0003").src == "TR"
+    assert book.open_qty("005930", Side.BUY) == 7
+    assert book.open_qty("035720", Side.SELL) == 5
+    _check_open_qty(book)
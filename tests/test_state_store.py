@@ -0,0 +1,120 @@
+import json
+
+from core.state_store import StateJournal
+
+
+def _journal(tmp_path, **kw):
+    return StateJournal(tmp_path / "state.snap.json", tmp_path / "state.journal.jsonl", fsync=False, **kw)
+
+
+def _lines(tmp_path):
+    return (tmp_path / "state.journal.jsonl").read_bytes().splitlines()
+
+
+def test_put_delete_sync_replay(tmp_path):
+    j = _journal(tmp_path)
+    j.load()
+    assert j.put("pos", "005930", {"qty": 10, "avg": 71000.0})
+    assert not j.put("pos", "005930", {"qty": 10, "avg": 71000.0})   # 같은 값은 기록 안 함
+    j.put("pos", "000660", {"qty": 3, "avg": 182000.0})
+    j.put("meta", "day", "20261016")
+    assert j.delete("pos", "005930")
+    assert not j.delete("pos", "005930")
+    assert j.sync("univ", {"005930": 1, "035720": 1}) == 2
+    assert j.flush() == 6
+    j.close()
+
+    r = _journal(tmp_path)
+    state = r.load()
+    assert state == {
+        "pos": {"000660": {"qty": 3, "avg": 182000.0}},
+        "meta": {"day": "20261016"},
+        "univ": {"005930": 1, "035720": 1},
+    }
+    assert r.seq == 6
+
+
+def test_sync_records_only_changed_keys(tmp_path):
+    j = _journal(tmp_path)
+    j.load()
+    assert j.sync("pos", {"A": 1, "B": 2}) == 2
+    assert j.sync("pos", {"A": 1, "B": 2}) == 0
+    assert j.sync("pos", {"A": 1, "B": 3, "C": 4}) == 2
+    assert j.sync("pos", {"A": 1, "C": 4}) == 1
+    j.flush()
+    assert [json.loads(x)[2:] for x in _lines(tmp_path)] == [
+        ["A", 1], ["B", 2], ["B", 3], ["C", 4], ["B", None],
+    ]
+
+
+def test_crash_loses_at_most_unflushed_batch(tmp_path):
+    j = _journal(tmp_path)
+    j.load()
+    j.put("order", "0001", "ACCEPTED")
+    j.flush()
+    j.put("order", "0002", "PENDING")    # flush 전 크래시
+
+    r = _journal(tmp_path)
+    assert r.load() == {"order": {"0001": "ACCEPTED"}}
+    assert r.seq == 1
+
+
+def test_torn_last_line_truncated_then_append(tmp_path):
+    j = _journal(tmp_path)
+    j.load()
+    j.put("pos", "A", 1)
+    j.put("pos", "B", 2)
+    j.close()
+    path = tmp_path / "state.journal.jsonl"
+    good = path.read_bytes()
+    path.write_bytes(good + b'[3,"pos","C",')    # 쓰다 죽은 줄
+
+    r = _journal(tmp_path)
+    assert r.load() == {"pos": {"A": 1, "B": 2}}
+    assert path.read_bytes() == good
+    r.put("pos", "D", 4)
+    r.close()
+
+    r2 = _journal(tmp_path)
+    assert r2.load() == {"pos": {"A": 1, "B": 2, "D": 4}}
+    assert r2.seq == 3
+
+
+def test_stale_journal_after_compaction_is_skipped(tmp_path):
+    j = _journal(tmp_path)
+    j.load()
+    j.put("pos", "A", "old")
+    j.flush()
+    stale = _lines(tmp_path)
+    j.put("pos", "A", "new")
+    j.compact()
+    j.close()
+    assert _lines(tmp_path) == []
+
+    # 스냅샷 교체 직후, journal 을 비우기 전에 죽은 상황: snap seq 이하 줄만 남아 있다
+    (tmp_path / "state.journal.jsonl").write_bytes(b"\n".join(stale) + b"\n")
+    r = _journal(tmp_path)
+    assert r.load() == {"pos": {"A": "new"}}    # seq 1 "old" 를 다시 적용하지 않음
+    assert r.seq == 2
+    r.put("pos", "B", 1)
+    r.close()
+
+    r2 = _journal(tmp_path)
+    assert r2.load() == {"pos": {"A": "new", "B": 1}}
+    assert r2.seq == 3
+
+
+def test_compact_every_rolls_journal_into_snapshot(tmp_path):
+    j = _journal(tmp_path, compact_every=3)
+    j.load()
+    for i in range(4):
+        j.put("univ", f"{i:06d}", 1)
+    j.flush()
+    assert (tmp_path / "state.snap.json").exists()
+    assert (tmp_path / "state.journal.jsonl").stat().st_size == 0
+    j.put("univ", "000001", 2)
+    j.close()
+
+    r = _journal(tmp_path)
+    assert r.load() == {"univ": {"000000": 1, "000002": 1, "000003": 1, "000001": 2}}
+    assert r.seq == 5
@@ -0,0 +1,22 @@
+from data.tick_store import TickDay, TickRecorder
+
+T0_MS = 1_792_140_000_000   # 2026-10-16 장중
+
+
+def test_records_exchange_ts_and_arrival_separately(tmp_path):
+    rec = TickRecorder(root=tmp_path)
+    rec.record("005930", 71000.0, 10, T0_MS, T0_MS * 1000 + 350_000)
+    rec.record("000660", 182000.0, -3, T0_MS + 1000, T0_MS * 1000 + 1_420_000)
+    rec.record("005930", 71100.0, 5, T0_MS + 1000, T0_MS * 1000 + 1_430_000)
+    day = rec.day
+    rec.close()
+
+    td = TickDay(day, tmp_path)
+    assert list(td.iter_ticks()) == [
+        (T0_MS / 1e3, "005930", 71000.0, 10),
+        ((T0_MS + 1000) / 1e3, "000660", 182000.0, -3),
+        ((T0_MS + 1000) / 1e3, "005930", 71100.0, 5),
+    ]
+    assert td.records["recv_us"].tolist() == [T0_MS * 1000 + 350_000, T0_MS * 1000 + 1_420_000, T0_MS * 1000 + 1_430_000]
+    assert td.symbol("005930")["price"].tolist() == [71000.0, 71100.0]
+
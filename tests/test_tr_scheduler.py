@@ -0,0 +1,160 @@
+import heapq
+
+import pytest
+
+from broker.fake_ocx import FakeKiwoomOcx
+from broker.tr_scheduler import PRIO_HIGH, PRIO_LOW, PRIO_NORMAL, TokenBucket, TrScheduler
+from core.clock import VirtualClock
+
+
+class Timers:
+    """QTimer.singleShot 대역: 가상 시계 기준 일회성 콜백"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self._heap = []
+        self._seq = 0
+
+    def schedule(self, delay, fn):
+        self._seq += 1
+        heapq.heappush(self._heap, (self.clock.time() + delay, self._seq, fn))
+
+    def run_until(self, t):
+        while self._heap and self._heap[0][0] <= t:
+            at, _, fn = heapq.heappop(self._heap)
+            self.clock.set(at)
+            fn()
+        self.clock.set(t)
+
+
+class Rig:
+    """FakeKiwoomOcx 의 CommRqData/OnReceiveTrData 를 TrScheduler 에 연결 (KiwoomBroker 의 TR 경로와 같은 모양)"""
+
+    def __init__(self, auto_respond=True, **kw):
+        self.clock = VirtualClock(1_000.0)
+        self.timers = Timers(self.clock)
+        self.ocx = FakeKiwoomOcx()
+        self.ocx.auto_respond = auto_respond
+        self.sched = TrScheduler(self.timers.schedule, clock=self.clock, **kw)
+        self.sent_at = []
+        self.ocx.OnReceiveTrData.connect(self._on_tr)
+
+    def _on_tr(self, screen, rqname, trcode, _rec, more, *_):
+        n = self.ocx.dynamicCall("GetRepeatCnt(QString, QString)", trcode, rqname)
+        rows = [self.ocx.dynamicCall("GetCommData(QString, QString, int, QString)", trcode, rqname, i, "code")
+                for i in range(n)]
+        self.sched.on_response(rqname, screen, rows, has_next=more == "2")
+
+    def submit(self, rqname, trcode="opt10001", screen="0301", **kw):
+        def send(prev_next):
+            self.sent_at.append((self.clock.time(), rqname, prev_next))
+            self.ocx.dynamicCall("CommRqData(QString, QString, int, QString)", rqname, trcode, prev_next, screen)
+        return self.sched.submit(rqname, screen, send, **kw)
+
+
+def _max_in_window(times, window):
+    times = sorted(times)
+    best = j = 0
+    for i, t in enumerate(times):
+        while times[j] <= t - window:
+            j += 1
+        best = max(best, i - j + 1)
+    return best
+
+
+def test_token_bucket_burst_then_rate():
+    clock = VirtualClock(0.0)
+    b = TokenBucket(5, 1.0, burst=1, clock=clock)
+    assert b.take() and not b.take()
+    assert b.wait_time() == pytest.approx(0.25)
+    clock.advance(0.25)
+    assert b.take()
+    with pytest.raises(ValueError):
+        TokenBucket(5, 1.0, burst=5)
+
+
+def test_paces_five_per_second():
+    rig = Rig()
+    futs = [rig.submit(f"rq{i}", screen=f"{i:04d}") for i in range(30)]
+    rig.timers.run_until(rig.clock.time() + 10)
+    assert all(f.done() for f in futs)
+    times = [t for t, _, _ in rig.sent_at]
+    assert len(times) == 30
+    assert _max_in_window(times, 1.0) <= 5
+
+
+def test_paces_thousand_per_hour():
+    rig = Rig()
+    t0 = rig.clock.time()
+    futs = [rig.submit(f"rq{i}", screen=f"{i:04d}") for i in range(1_050)]
+    rig.timers.run_until(t0 + 3_599)
+    assert len(rig.sent_at) <= 1_000
+    rig.timers.run_until(t0 + 2 * 3_600)
+    assert all(f.done() for f in futs)
+    assert _max_in_window([t for t, _, _ in rig.sent_at], 3_600.0) <= 1_000
+
+
+def test_priority_order():
+    rig = Rig()
+    rig.submit("first")       # 토큰 1개를 바로 씀 -> 나머지는 큐에서 대기
+    rig.submit("low", screen="0302", priority=PRIO_LOW)
+    rig.submit("normal", screen="0303", priority=PRIO_NORMAL)
+    rig.submit("high", screen="0304", priority=PRIO_HIGH)
+    rig.submit("normal2", screen="0305", priority=PRIO_NORMAL)
+    rig.timers.run_until(rig.clock.time() + 5)
+    assert [rq for _, rq, _ in rig.sent_at] == ["first", "high", "normal", "normal2", "low"]
+
+
+def test_duplicate_requests_coalesce():
+    rig = Rig(auto_respond=False)
+    f1 = rig.submit("dup")
+    f2 = rig.submit("dup")
+    assert f1 is f2
+    assert rig.sched.pending() == 1
+    rig.ocx.deliver()
+    assert f1.done() and len(rig.sent_at) == 1
+    # 끝난 뒤에는 새 요청
+    f3 = rig.submit("dup")
+    assert f3 is not f1
+
+
+def test_continuation_pages_chain():
+    rig = Rig()
+    rig.ocx.tr_pages["opt10075"] = [[{"code": "A"}], [{"code": "B"}], [{"code": "C"}]]
+    fut = rig.submit("oo", trcode="opt10075", max_pages=5)
+    rig.timers.run_until(rig.clock.time() + 5)
+    assert fut.result(timeout=0) == ["A", "B", "C"]
+    assert [pn for _, _, pn in rig.sent_at] == [0, 2, 2]
+
+
+def test_continuation_stops_at_max_pages():
+    rig = Rig()
+    rig.ocx.tr_pages["opt10075"] = [[{"code": "A"}], [{"code": "B"}], [{"code": "C"}]]
+    fut = rig.submit("oo", trcode="opt10075", max_pages=2)
+    rig.timers.run_until(rig.clock.time() + 5)
+    assert fut.result(timeout=0) == ["A", "B"]
+
+
+def test_timeout_fails_future_and_ignores_late_response():
+    rig = Rig(auto_respond=False)
+    fut = rig.submit("slow", timeout_sec=3.0)
+    rig.timers.run_until(rig.clock.time() + 2.9)
+    assert not fut.done()
+    rig.timers.run_until(rig.clock.time() + 0.2)
+    with pytest.raises(TimeoutError):
+        fut.result(timeout=0)
+    assert rig.sched.pending() == 0
+    rig.ocx.deliver()    # 늦게 온 응답은 무시
+    assert fut.exception(timeout=0) is not None
+
+
+def test_send_error_fails_future():
+    rig = Rig()
+
+    def boom(prev_next):
+        raise RuntimeError("CommRqData -200")
+
+    fut = rig.sched.submit("bad", "0301", boom)
+    with pytest.raises(RuntimeError):
+        fut.result(timeout=0)
+    assert rig.sched.pending() == 0
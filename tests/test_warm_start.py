@@ -0,0 +1,85 @@
+import logging
+import math
+
+import numpy as np
+
+from broker.simulated import SimulatedBroker
+from core.clock import UTC_OFFSET_SEC, FixedClock
+from core.scoring import ScoreBoard
+from core.warm_start import FAILED, READY, SHORT, WarmStart
+from data.bar_spill import BarSpill
+from data.bar_store import BAR_DTYPE, BarStore
+
+LOG = logging.getLogger("test.warm")
+# 2026-10-16 10:00:30 (로컬)
+NOW = 1_792_108_800 - UTC_OFFSET_SEC + 10 * 3600 + 30
+
+
+def _minute_bars(n, end_sec, seed=0):
+    rnd = np.random.default_rng(seed)
+    px = 10_000.0
+    out = []
+    start = end_sec - (end_sec + UTC_OFFSET_SEC) % 60 - n * 60
+    for i in range(n):
+        px *= 1 + rnd.normal(0, 0.004)
+        out.append({"ts": start + i * 60, "open": px, "high": px, "low": px, "close": px, "volume": int(rnd.integers(1, 5000))})
+    return out
+
+
+class FlakyBroker(SimulatedBroker):
+    def request_minute_bars(self, code, *a, **kw):
+        if code == "000660":
+            raise RuntimeError("TR -200")
+        return super().request_minute_bars(code, *a, **kw)
+
+
+def _rig(tmp_path, broker_cls=SimulatedBroker, **kw):
+    clock = FixedClock(NOW)
+    broker = broker_cls(clock=clock)
+    store = BarStore(capacity=200)
+    sb = ScoreBoard()
+    ready = []
+    warm = WarmStart(LOG, broker, store, sb, spill=BarSpill(tmp_path), clock=clock, on_ready=ready.append, **kw)
+    return clock, broker, store, sb, warm, ready
+
+
+def test_scores_before_first_live_bar(tmp_path):
+    clock, broker, store, sb, warm, ready = _rig(tmp_path)
+    broker.minute_bars = {"005930": _minute_bars(40, NOW, 1), "000660": _minute_bars(25, NOW, 2)}
+    assert warm.warm(["005930", "000660"]) == ["005930", "000660"]
+    for sym in ("005930", "000660"):
+        assert math.isfinite(sb.get(sym)) and sb.get(sym) > -1e9
+        assert warm.status[sym] == READY
+    assert ready == ["005930", "000660"]
+    assert sb.top(2) == sorted(["005930", "000660"], key=sb.get, reverse=True)
+
+
+def test_open_interval_bar_is_dropped(tmp_path):
+    clock, broker, store, sb, warm, ready = _rig(tmp_path)
+    bars = _minute_bars(30, NOW, 3)
+    # 아직 닫히지 않은 10:00 구간 바 (실시간 바 빌더가 닫는다)
+    bars.append(dict(bars[-1], ts=bars[-1]["ts"] + 60))
+    broker.minute_bars = {"005930": bars}
+    warm.warm(["005930"])
+    assert store.count("005930") == 30
+    assert int(store.view("005930", "ts", 1)[0]) == bars[-2]["ts"]
+
+
+def test_short_history_and_failure(tmp_path):
+    clock, broker, store, sb, warm, ready = _rig(tmp_path, broker_cls=FlakyBroker)
+    broker.minute_bars = {"005930": _minute_bars(5, NOW, 4)}
+    warm.warm(["005930", "000660"])
+    assert warm.status == {"005930": SHORT, "000660": FAILED}
+    assert sb.get("005930") == -1e9
+    # TR 이 가진 만큼 받은 SHORT 는 다시 요청하지 않는다
+    assert warm.warm(["005930"]) == []
+
+
+def test_recent_spill_skips_tr(tmp_path):
+    clock, broker, store, sb, warm, ready = _rig(tmp_path)
+    rows = _minute_bars(40, NOW, 5)
+    arr = np.array([(r["ts"], r["open"], r["high"], r["low"], r["close"], r["volume"]) for r in rows], dtype=BAR_DTYPE)
+    warm.spill.save("005930", arr)
+    assert warm.warm(["005930"]) == []
+    assert warm.source["005930"] == "spill"
+    assert math.isfinite(sb.get("005930")) and sb.get("005930") > -1e9